@@ -10,7 +10,7 @@ import json
 
 from backend.agent.agent.toolcall import ToolCallAgent
 from backend.agent.tool import ToolCollection, Terminate, CreateChatCompletion
-from backend.agent.utils.json_path import parse_path, get_by_path, set_by_path, delete_by_path, exists_path
+from backend.json_path import parse_path, get_by_path, set_by_path, delete_by_path, exists_path
 
 PATH_ALIASES = {
     "opensource": "openSource",
@@ -1,6 +1,6 @@
 from typing import Dict, Optional
 
-from backend.agent.utils.json_path import exists_path
+from backend.json_path import exists_path
 
 
 class PathGenerator:
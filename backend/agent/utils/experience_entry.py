@@ -333,7 +333,7 @@ def build_indexed_patch_after(path: str, value: Any) -> Dict[str, Any]:
     构造 resume_patch 的 after，避免 set_by_path 产生 [null, null, item]。
     前端 getByPath(after, 'experience[2]') 能取到 value。
     """
-    from backend.agent.utils.json_path import parse_path, set_by_path
+    from backend.json_path import parse_path, set_by_path
 
     parts = parse_path(path)
     if len(parts) == 2 and isinstance(parts[1], int):
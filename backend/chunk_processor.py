@@ -4,6 +4,7 @@
 """
 
 from typing import List, Dict, Any
+import os
 import re
 import sys
 
@@ -28,6 +29,39 @@ ORPHAN_INTERNSHIP_TITLE_PREFIXES = (
     "架构优化",
 )
 
+# 段落关键词
+SECTION_KEYWORDS = ('实习经历', '项目经验', '项目经历', '开源经历', '专业技能', '教育经历')
+# 句末标点，用于无空行时按句子边界切分
+SENTENCE_END_PUNCTUATION = frozenset('。！？.!?')
+
+# 设置 RESUME_CHUNK_DEBUG=1 时把分块摘要同时打印到 stderr（默认只走 logger）
+CHUNK_DEBUG_STDERR = os.getenv("RESUME_CHUNK_DEBUG", "").lower() in {"1", "true", "yes", "on"}
+
+
+def _find_current_project_end(content_lines: List[str], title_index: int) -> int:
+    """找到从 title_index 开始的项目的结束位置（下一个 ### 项目标题或末尾）"""
+    # 跳过标题行
+    i = title_index + 1
+    n = len(content_lines)
+
+    # 跳过空行
+    while i < n and not content_lines[i].strip():
+        i += 1
+
+    # 检查接下来的内容：
+    # - 项目描述段落（非空行，不以 ###、-、*、• 开头）
+    # - 技术栈行
+    # - 亮点列表（以 -、*、• 开头）
+    # 遇到下一个 ### 项目标题时结束
+    while i < n:
+        line = content_lines[i].strip()
+        if line.startswith('###'):
+            # 下一个项目标题，当前项目结束
+            return i
+        i += 1
+
+    return n  # 到了末尾
+
 
 def split_resume_text(text: str, max_chunk_size: int = 400) -> List[Dict[str, str]]:
     """
@@ -48,61 +82,14 @@ def split_resume_text(text: str, max_chunk_size: int = 400) -> List[Dict[str, st
         text = text.split('```json')[0]
     text = normalize_pasted_resume_text(text.strip())
 
-    """段落关键词"""
-    section_keywords = ['实习经历', '项目经验', '项目经历', '开源经历', '专业技能', '教育经历']
-
     lines = text.split('\n')
     current_section = '基本信息'
     current_content = []
 
-    # 辅助函数：查找从 start_index 开始的下一个项目标题位置
-    def find_next_project_title(content_lines, start_index=0):
-        """查找下一个项目标题（### 开头）的位置"""
-        for i in range(start_index, len(content_lines)):
-            if content_lines[i].strip().startswith('###'):
-                return i
-        return -1
-
-    # 辅助函数：检查是否在某个项目的描述/亮点内容中
-    def is_inside_project(content_lines, check_index):
-        """检查 check_index 是否在某个项目的内容中（而非标题行）"""
-        # 找到 check_index 之前最近的项目标题
-        last_title_idx = -1
-        for i in range(check_index - 1, -1, -1):
-            if content_lines[i].strip().startswith('###'):
-                last_title_idx = i
-                break
-        return last_title_idx >= 0
-
-    # 辅助函数：找到一个项目的结束位置（下一个项目标题或空行后接其他内容）
-    def find_current_project_end(content_lines, title_index):
-        """找到从 title_index 开始的项目的结束位置"""
-        # 跳过标题行
-        i = title_index + 1
-        n = len(content_lines)
-
-        # 跳过空行
-        while i < n and not content_lines[i].strip():
-            i += 1
-
-        # 检查接下来的内容：
-        # - 项目描述段落（非空行，不以 ###、-、*、• 开头）
-        # - 技术栈行
-        # - 亮点列表（以 -、*、• 开头）
-        # 遇到下一个 ### 项目标题时结束
-        while i < n:
-            line = content_lines[i].strip()
-            if line.startswith('###'):
-                # 下一个项目标题，当前项目结束
-                return i
-            i += 1
-
-        return n  # 到了末尾
-
     for line in lines:
         """检查是否是新段落"""
         is_new_section = False
-        for keyword in section_keywords:
+        for keyword in SECTION_KEYWORDS:
             if keyword in line and len(line.strip()) < 20:
                 """找到新段落"""
                 if current_content:
@@ -176,7 +163,7 @@ def split_resume_text(text: str, max_chunk_size: int = 400) -> List[Dict[str, st
                     else:
                         # 项目标题在开头，需要检查是否有完整项目
                         # 计算这个项目的完整内容
-                        project_end = find_current_project_end(current_content, title_idx)
+                        project_end = _find_current_project_end(current_content, title_idx)
 
                         # 如果项目结束位置在合理范围内，可以切分
                         if project_end < len(current_content):
@@ -239,7 +226,7 @@ def split_resume_text(text: str, max_chunk_size: int = 400) -> List[Dict[str, st
                     if split_index == len(current_content):
                         for i in range(len(current_content) - 1, max(0, len(current_content) - 20), -1):
                             line_text = current_content[i].strip()
-                            if line_text and line_text[-1] in ['。', '！', '？', '.', '!', '?']:
+                            if line_text and line_text[-1] in SENTENCE_END_PUNCTUATION:
                                 split_index = i + 1
                                 break
 
@@ -302,18 +289,23 @@ def split_resume_text(text: str, max_chunk_size: int = 400) -> List[Dict[str, st
             # 正常大小的块，直接添加
             optimized_chunks.append(chunk)
     
-    # 使用 print 和 logger 双重记录
-    print(f"[分块优化] 原始分块数: {len(chunks)}, 优化后: {len(optimized_chunks)}", file=sys.stderr, flush=True)
-    for i, chunk in enumerate(optimized_chunks, 1):
-        print(f"[分块优化] 块 {i}: {len(chunk['content'])} 字符, 段落: {chunk['section']}", file=sys.stderr, flush=True)
+    # 分块摘要记录到 logger，调试时再镜像到 stderr
+    log_lines = [f"[分块优化] 原始分块数: {len(chunks)}, 优化后: {len(optimized_chunks)}"]
+    log_lines.extend(
+        f"[分块优化] 块 {i}: {len(chunk['content'])} 字符, 段落: {chunk['section']}"
+        for i, chunk in enumerate(optimized_chunks, 1)
+    )
+    # 整块拼好后一次写入，避免每行一次 flush
+    if CHUNK_DEBUG_STDERR:
+        sys.stderr.write("\n".join(log_lines) + "\n")
+        sys.stderr.flush()
     try:
         from backend.core.logger import get_logger
     except ImportError:
         from core.logger import get_logger
     logger = get_logger(__name__)
-    logger.info(f"[分块优化] 原始分块数: {len(chunks)}, 优化后: {len(optimized_chunks)}")
-    for i, chunk in enumerate(optimized_chunks, 1):
-        logger.info(f"[分块优化] 块 {i}: {len(chunk['content'])} 字符, 段落: {chunk['section']}")
+    for log_line in log_lines:
+        logger.info(log_line)
     
     return optimized_chunks
 
@@ -3,12 +3,21 @@
 优先从腾讯云 COS 的 company_logo/ 目录读取公司 Logo；若 COS 不可用或未命中，再回退本地 images/logo/
 新增 Logo：上传到 COS 的 company_logo/，并同步到本地 images/logo/
 """
+import hashlib
+import json
 import os
+import re
 import shutil
+import tempfile
+import threading
 import time
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+import httpx
+
 # 仓库根目录下的 images/logo（与 .gitignore 中的 images/ 对应）
 _REPO_ROOT = Path(__file__).resolve().parent.parent
 LOCAL_LOGO_DIR = _REPO_ROOT / "images" / "logo"
@@ -17,8 +26,33 @@ LOCAL_LOGO_EXTS = {".png", ".jpg", ".jpeg", ".webp", ".svg"}
 COS_BASE_URL = 'https://resumecos-1327706280.cos.ap-guangzhou.myqcloud.com'
 COMPANY_LOGO_PREFIX = "company_logo/"
 
+# ── Logo 下载客户端：所有 Logo 都在同一个 COS 域名下，HTTP/2 让并发下载复用一条 TLS 连接 ──
+# trust_env=False：不走系统代理（与 cos_client 保持一致）
+_LOGO_DOWNLOAD_WORKERS = 8
+# 流式下载的分块大小，与常见 logo 体积（10-200KB）相当
+_LOGO_STREAM_CHUNK = 64 * 1024
+_LOGO_HTTP = httpx.Client(
+    http2=True,
+    trust_env=False,
+    timeout=httpx.Timeout(15.0, connect=5.0),
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(max_connections=_LOGO_DOWNLOAD_WORKERS, max_keepalive_connections=_LOGO_DOWNLOAD_WORKERS),
+    ),
+    headers={"User-Agent": "Resume-Agent/1.0"},
+)
+_logo_download_executor: ThreadPoolExecutor | None = None
+_logo_download_executor_lock = threading.Lock()
+
+# ── Logo 字节的持久化磁盘缓存：按 (URL, ETag) 命名，COS 上文件不变时免去 GET ──
+LOGO_CACHE_DIR = Path(os.getenv("LOGO_CACHE_DIR", str(Path.home() / ".cache" / "resume-agent" / "logos")))
+_LOGO_CACHE_MAX_BYTES = 200 * 1024 * 1024
+_logo_cache_pruned = False
+_logo_cache_lock = threading.Lock()
+
 # ── 非 Logo 文件排除列表（COS 中的截图、UI 素材等） ──
-EXCLUDED_FILES = {
+EXCLUDED_FILES = frozenset({
     'AI对话生成简历.png',
     'classic.png',
     'html.png',
@@ -26,7 +60,10 @@ EXCLUDED_FILES = {
     '工作区.png',
     '我的简历.png',
     '首页.png',
-}
+})
+
+# 图片后缀判断（忽略大小写），不必为每个对象生成小写副本
+_LOGO_SUFFIX_RE = re.compile(r'\.(?:png|jpe?g|webp|svg)\Z', re.IGNORECASE)
 
 # ── 已知 Logo 的丰富元数据（可选，用于关键词匹配和英文 key） ──
 # 如果 COS 上的某个 Logo 文件不在此表中，会自动生成基础信息
@@ -113,6 +150,9 @@ KNOWN_LOGO_META = {
     },
 }
 
+# logo key -> 元数据，供本地扫描按 key 直接查关键词
+_META_BY_KEY = {meta['key']: meta for meta in KNOWN_LOGO_META.values()}
+
 # key -> 中文显示名（本地模式用英文文件名时，仍返回中文名给前端展示）
 LOGO_KEY_TO_DISPLAY_NAME = {
     meta['key']: filename.rsplit('.', 1)[0]
@@ -127,19 +167,35 @@ DISPLAY_NAME_TO_KEY.setdefault('哔哩哔哩', 'bilibili')
 _cos_cache: list[dict] | None = None
 _cos_cache_time: float = 0
 _COS_CACHE_TTL = 300
+# COS 不可用（无凭证/列举失败）时降级列表也缓存一小段时间，避免故障期间每个请求都排队重试 COS
+_COS_FAILURE_CACHE_TTL = 60
+_cos_cache_ttl: float = _COS_CACHE_TTL
 _using_local = False  # True 表示当前列表来源为本地 images/logo
+_local_cache: list[dict] | None = None
+_local_cache_time: float = 0
+# 缓存刷新的 single-flight 锁（快路径不加锁）
+_cos_scan_lock = threading.Lock()
+_local_scan_lock = threading.Lock()
 
 # key -> 文件名 / object key 查找表（在扫描后更新）
 _key_to_file: dict[str, str] = {}
 _cos_key_to_file: dict[str, str] = {}
 _local_key_to_file: dict[str, str] = {}
 
+# /api/logos 响应体缓存：(生成它的 logo 列表, 序列化后的 JSON bytes)
+_logos_json_cache: tuple[list[dict], bytes] | None = None
+
 
 def clear_cache():
     """清除扫描缓存，下次调用会重新扫描（本地或 COS）"""
-    global _cos_cache, _cos_cache_time, _using_local, _key_to_file, _cos_key_to_file, _local_key_to_file
+    global _cos_cache, _cos_cache_time, _cos_cache_ttl, _using_local, _key_to_file, _cos_key_to_file, _local_key_to_file
+    global _logos_json_cache, _local_cache, _local_cache_time
+    _logos_json_cache = None
+    _local_cache = None
+    _local_cache_time = 0
     _cos_cache = None
     _cos_cache_time = 0
+    _cos_cache_ttl = _COS_CACHE_TTL
     _using_local = False
     _key_to_file = {}
     _cos_key_to_file = {}
@@ -157,95 +213,161 @@ def _list_cos_logo_keys() -> list[str]:
     keys: list[str] = []
     marker = ""
     while True:
-        resp = client.list_objects(Bucket=bucket, Prefix=COMPANY_LOGO_PREFIX, MaxKeys=1000, Marker=marker)
-        for obj in resp.get('Contents', []):
+        # Delimiter='/' 让服务端只返回 company_logo/ 下一层对象，子目录折叠为 CommonPrefixes
+        resp = client.list_objects(
+            Bucket=bucket,
+            Prefix=COMPANY_LOGO_PREFIX,
+            Delimiter='/',
+            MaxKeys=1000,
+            Marker=marker,
+        )
+        contents = resp.get('Contents', [])
+        for obj in contents:
             key = obj['Key']
-            lower = key.lower()
             rel = key[len(COMPANY_LOGO_PREFIX):] if key.startswith(COMPANY_LOGO_PREFIX) else key
-            if not rel or rel.endswith('/'):
-                continue
-            if '/' in rel:
+            # rel 不含 '/' 时即为文件名
+            if not rel or '/' in rel:
                 continue
-            if not lower.endswith(('.png', '.jpg', '.jpeg', '.webp', '.svg')):
+            if not _LOGO_SUFFIX_RE.search(rel):
                 continue
-            if Path(rel).name in EXCLUDED_FILES:
+            if rel in EXCLUDED_FILES:
                 continue
             keys.append(key)
-        if resp.get('IsTruncated') == 'true':
-            marker = resp.get('NextMarker', '')
-            if not marker:
-                break
-        else:
+        if resp.get('IsTruncated') != 'true':
+            break
+        # 未返回 NextMarker 时以本页最后一个 key 续翻，避免超过一页时被截断
+        marker = resp.get('NextMarker') or (contents[-1]['Key'] if contents else '')
+        if not marker:
             break
     return sorted(set(keys))
 
 
-def sync_local_logos_from_cos(force: bool = False) -> int:
+def _local_logo_files() -> list[Path]:
+    return [
+        p for p in LOCAL_LOGO_DIR.iterdir()
+        if p.is_file() and p.suffix.lower() in LOCAL_LOGO_EXTS
+    ]
+
+
+def _download_logo_to_local(client, bucket: str, key: str) -> str:
+    """下载单个 Logo：先写临时文件再原子替换，失败时不会留下半截文件或覆盖旧文件。"""
+    name = Path(key).name
+    # .part 后缀不在 LOCAL_LOGO_EXTS 中，扫描不会把未完成的文件当作 Logo
+    fd, tmp_path = tempfile.mkstemp(dir=LOCAL_LOGO_DIR, prefix='.sync-', suffix='.part')
+    os.close(fd)
+    try:
+        body = client.get_object(Bucket=bucket, Key=key)['Body']
+        # 不能用 read() 默认值（1024 bytes），必须流式落盘
+        body.get_stream_to_file(tmp_path)
+        os.replace(tmp_path, LOCAL_LOGO_DIR / name)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return name
+
+
+def run_logo_sync(force: bool = False) -> tuple[int, list[str]]:
     """
-    从 COS 同步 Logo 到本地 images/logo。
+    从 COS 同步 Logo 到本地 images/logo，返回 (同步后本地 logo 文件数, 下载失败的 key)。
     - force=False：本地已有图片则跳过
-    - 返回同步后本地 logo 文件数
+    - 列举 COS 失败时降级为 KNOWN_LOGO_META 中的已知文件
+    - 单个文件失败不影响其余文件；全部成功且 force=True 时才清理 COS 上已不存在的本地文件
+    - 无法创建 COS 客户端时抛出 RuntimeError
     """
-    try:
-        LOCAL_LOGO_DIR.mkdir(parents=True, exist_ok=True)
-        existing = [
-            p for p in LOCAL_LOGO_DIR.iterdir()
-            if p.is_file() and p.suffix.lower() in LOCAL_LOGO_EXTS
-        ]
-        if existing and not force:
-            return len(existing)
+    LOCAL_LOGO_DIR.mkdir(parents=True, exist_ok=True)
+    existing = _local_logo_files()
+    if existing and not force:
+        return len(existing), []
 
-        from backend.core.cos_client import build_cos_s3_client
+    from backend.core.cos_client import build_cos_s3_client
 
-        client, bucket = build_cos_s3_client()
-        if client is None:
-            return len(existing)
+    client, bucket = build_cos_s3_client()
+    if client is None:
+        raise RuntimeError("COS 客户端不可用")
 
+    try:
         keys = _list_cos_logo_keys()
-        if not keys:
-            return len(existing)
-
-        if force:
-            for p in LOCAL_LOGO_DIR.iterdir():
-                if p.is_file() and p.suffix.lower() in LOCAL_LOGO_EXTS:
-                    p.unlink(missing_ok=True)
-
-        for key in keys:
-            out = LOCAL_LOGO_DIR / Path(key).name
-            body = client.get_object(Bucket=bucket, Key=key)['Body']
-            # 不能用 read() 默认值（1024 bytes），必须流式落盘
-            body.get_stream_to_file(str(out))
-
-        clear_cache()
-        final_count = len([p for p in LOCAL_LOGO_DIR.iterdir() if p.is_file() and p.suffix.lower() in LOCAL_LOGO_EXTS])
-        print(f"[Logo] 已从 COS 同步到本地，数量: {final_count}")
-        return final_count
+    except Exception as e:
+        print(f"[Logo] 列举 COS 失败，降级已知列表: {e}")
+        # 与 _fallback_logos 一致，使用 bucket 根目录下的已知文件名
+        keys = list(KNOWN_LOGO_META)
+    if not keys:
+        return len(existing), []
+
+    synced: set[str] = set()
+    failed: list[str] = []
+    for idx, key in enumerate(keys, start=1):
+        try:
+            synced.add(_download_logo_to_local(client, bucket, key))
+            print(f"  [{idx}/{len(keys)}] {key}", flush=True)
+        except Exception as e:
+            print(f"  下载失败 {key}: {e}", flush=True)
+            failed.append(key)
+
+    if force and not failed:
+        for p in _local_logo_files():
+            if p.name not in synced:
+                p.unlink(missing_ok=True)
+
+    clear_cache()
+    final_count = len(_local_logo_files())
+    print(f"[Logo] 已从 COS 同步到本地，数量: {final_count}，失败: {len(failed)}")
+    return final_count, failed
+
+
+def sync_local_logos_from_cos(force: bool = False) -> int:
+    """
+    从 COS 同步 Logo 到本地 images/logo（启动钩子用，不抛异常）。
+    - force=False：本地已有图片则跳过
+    - 返回同步后本地 logo 文件数
+    """
+    try:
+        count, _ = run_logo_sync(force)
+        return count
     except Exception as e:
         print(f"[Logo] 同步本地 logo 失败: {e}")
-        return 0
+        try:
+            return len(_local_logo_files())
+        except OSError:
+            return 0
 
 
 def _scan_local_logos() -> list[dict] | None:
     """若存在 images/logo/ 且含图片文件，则返回本地 Logo 列表，否则返回 None。异常时返回 None 以便降级 COS。"""
-    global _local_key_to_file
+    # 使用缓存（与 COS 扫描同一 TTL；上传/删除会 clear_cache）
+    if _local_cache is not None and (time.time() - _local_cache_time) < _COS_CACHE_TTL:
+        return _local_cache
+
+    with _local_scan_lock:
+        if _local_cache is not None and (time.time() - _local_cache_time) < _COS_CACHE_TTL:
+            return _local_cache
+        return _refresh_local_logos()
+
+
+def _refresh_local_logos() -> list[dict] | None:
+    """实际扫描 images/logo 并重建缓存；调用方需持有 _local_scan_lock。"""
+    global _local_key_to_file, _local_cache, _local_cache_time
+
     try:
         if not LOCAL_LOGO_DIR.is_dir():
             return None
-        files = sorted(
-            p for p in LOCAL_LOGO_DIR.iterdir()
-            if p.is_file() and p.suffix.lower() in LOCAL_LOGO_EXTS
-        )
-        if not files:
+        # scandir 的 DirEntry 自带文件类型，不必逐个构造 Path 再 stat
+        with os.scandir(LOCAL_LOGO_DIR) as entries:
+            filenames = sorted(
+                entry.name for entry in entries
+                if entry.is_file() and os.path.splitext(entry.name)[1].lower() in LOCAL_LOGO_EXTS
+            )
+        if not filenames:
             return None
         logos = []
         key_map = {}
-        for f in files:
-            stem = f.stem  # 中文文件名去掉后缀，如 阿里巴巴
+        for filename in filenames:
+            stem = os.path.splitext(filename)[0]  # 中文文件名去掉后缀，如 阿里巴巴
             api_key = DISPLAY_NAME_TO_KEY.get(stem, stem)
-            key_map[api_key] = f.name
+            key_map[api_key] = filename
             if stem != api_key:
-                key_map[stem] = f.name
-            meta = next((m for fn, m in KNOWN_LOGO_META.items() if m.get('key') == api_key), {})
+                key_map[stem] = filename
+            meta = _META_BY_KEY.get(api_key, {})
             keywords = [str(k) for k in meta.get('keywords', [stem])]
             logos.append({
                 "key": str(api_key),
@@ -254,6 +376,8 @@ def _scan_local_logos() -> list[dict] | None:
                 "keywords": keywords,
             })
         _local_key_to_file = key_map
+        _local_cache = logos
+        _local_cache_time = time.time()
         print(f"[Logo] 本地 images/logo 扫描完成，发现 {len(logos)} 个 Logo")
         return logos
     except Exception as e:
@@ -263,16 +387,25 @@ def _scan_local_logos() -> list[dict] | None:
 
 def _scan_cos_logos() -> list[dict]:
     """扫描 COS 获取所有 Logo 文件，排除非 Logo 文件"""
-    global _cos_cache, _cos_cache_time, _key_to_file, _cos_key_to_file
-
     # 使用缓存
-    if _cos_cache is not None and (time.time() - _cos_cache_time) < _COS_CACHE_TTL:
+    if _cos_cache is not None and (time.time() - _cos_cache_time) < _cos_cache_ttl:
         return _cos_cache
 
+    # 缓存过期时只让一个线程去 COS 列举，其余线程等待后直接复用新结果
+    with _cos_scan_lock:
+        if _cos_cache is not None and (time.time() - _cos_cache_time) < _cos_cache_ttl:
+            return _cos_cache
+        return _refresh_cos_logos()
+
+
+def _refresh_cos_logos() -> list[dict]:
+    """实际列举 COS 并重建缓存；调用方需持有 _cos_scan_lock。"""
+    global _cos_cache, _cos_cache_time, _cos_cache_ttl, _key_to_file, _cos_key_to_file
+
     try:
         if not os.getenv('COS_SECRET_ID', '') or not os.getenv('COS_SECRET_KEY', ''):
             print("[Logo] COS 凭证未配置，使用已知 Logo 列表")
-            return _fallback_logos()
+            return _cache_fallback_logos()
 
         logos = []
         key_map = {}
@@ -290,7 +423,7 @@ def _scan_cos_logos() -> list[dict]:
             logo_entry = {
                 'key': logo_key,
                 'name': name,
-                'url': f"{COS_BASE_URL}/{urllib.request.quote(object_key, safe='/')}",
+                'url': _cos_object_url(object_key),
                 'keywords': keywords,
             }
             logos.append(logo_entry)
@@ -302,6 +435,7 @@ def _scan_cos_logos() -> list[dict]:
 
         _cos_cache = logos
         _cos_cache_time = time.time()
+        _cos_cache_ttl = _COS_CACHE_TTL
         _cos_key_to_file = key_map
         _key_to_file = key_map
         print(f"[Logo] COS 扫描完成，发现 {len(logos)} 个 Logo")
@@ -309,27 +443,44 @@ def _scan_cos_logos() -> list[dict]:
 
     except Exception as e:
         print(f"[Logo] COS 扫描失败: {e}，使用已知 Logo 列表")
-        return _fallback_logos()
+        return _cache_fallback_logos()
+
+
+def _cache_fallback_logos() -> list[dict]:
+    """降级列表按短 TTL 写入 COS 缓存（负缓存）；调用方需持有 _cos_scan_lock。"""
+    global _cos_cache, _cos_cache_time, _cos_cache_ttl
+    logos = _fallback_logos()
+    _cos_cache = logos
+    _cos_cache_time = time.time()
+    _cos_cache_ttl = _COS_FAILURE_CACHE_TTL
+    return logos
+
+
+@lru_cache(maxsize=1024)
+def _cos_object_url(object_key: str) -> str:
+    """object key -> COS 公网 URL（百分号编码结果按 key 缓存）。"""
+    return f"{COS_BASE_URL}/{urllib.request.quote(object_key, safe='/')}"
+
+
+# 降级列表只依赖静态的 KNOWN_LOGO_META，导入时构建一次
+_FALLBACK_LOGOS: tuple[dict, ...] = tuple(
+    {
+        'key': meta['key'],
+        'name': filename.rsplit('.', 1)[0],
+        'url': _cos_object_url(filename),
+        'keywords': meta['keywords'],
+    }
+    for filename, meta in KNOWN_LOGO_META.items()
+)
+_FALLBACK_KEY_TO_FILE: dict[str, str] = {meta['key']: filename for filename, meta in KNOWN_LOGO_META.items()}
 
 
 def _fallback_logos() -> list[dict]:
     """COS 不可用时的降级方案：使用已知 Logo 列表"""
     global _key_to_file, _cos_key_to_file
-    logos = []
-    key_map = {}
-    for filename, meta in KNOWN_LOGO_META.items():
-        logo_key = meta['key']
-        name = filename.rsplit('.', 1)[0]
-        logos.append({
-            'key': logo_key,
-            'name': name,
-            'url': f"{COS_BASE_URL}/{urllib.request.quote(filename)}",
-            'keywords': meta['keywords'],
-        })
-        key_map[logo_key] = filename
-    _key_to_file = key_map
-    _cos_key_to_file = key_map
-    return logos
+    _key_to_file = dict(_FALLBACK_KEY_TO_FILE)
+    _cos_key_to_file = dict(_FALLBACK_KEY_TO_FILE)
+    return list(_FALLBACK_LOGOS)
 
 
 def get_all_logos_with_urls() -> list[dict]:
@@ -362,13 +513,25 @@ def get_all_logos_with_urls() -> list[dict]:
         return _fallback_logos()
 
 
+def get_all_logos_json_bytes() -> bytes:
+    """返回 /api/logos 的 JSON 响应体；Logo 列表未变化时复用上次序列化结果。"""
+    global _logos_json_cache
+    logos = get_all_logos_with_urls()
+    cached = _logos_json_cache
+    if cached is not None and (cached[0] is logos or cached[0] == logos):
+        return cached[1]
+    body = json.dumps({"logos": logos}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    _logos_json_cache = (logos, body)
+    return body
+
+
 def get_logo_cos_url(key: str) -> str | None:
     """根据 key 获取 COS Logo URL；若仅本地存在，则返回 None。"""
     _scan_cos_logos()
     filename = _cos_key_to_file.get(key)
     if not filename:
         return None
-    return f"{COS_BASE_URL}/{urllib.request.quote(filename)}"
+    return _cos_object_url(filename)
 
 
 def get_logo_local_path(key: str) -> Path | None:
@@ -385,18 +548,112 @@ def get_logo_local_path(key: str) -> Path | None:
     return None
 
 
+def _stream_url_to_path(url: str, local_path: Path, timeout: float) -> None:
+    """边收边写到 local_path；退出 stream 上下文时连接归还连接池而非关闭。"""
+    with _LOGO_HTTP.stream("GET", url, timeout=httpx.Timeout(timeout, connect=5.0)) as resp:
+        if resp.status_code >= 400:
+            raise RuntimeError(f"HTTP {resp.status_code}")
+        # PNG/SVG 一般不带 Content-Encoding，直接写原始分块，省去解码与重新切块的拷贝
+        chunks = resp.iter_bytes(_LOGO_STREAM_CHUNK) if resp.headers.get("Content-Encoding") else resp.iter_raw(_LOGO_STREAM_CHUNK)
+        with open(local_path, "wb") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+
+
+def _head_etag(url: str, timeout: float) -> str | None:
+    """HEAD 取 ETag；失败或无 ETag 时返回 None（直接走下载）。"""
+    try:
+        resp = _LOGO_HTTP.head(url, timeout=httpx.Timeout(timeout, connect=5.0))
+    except Exception:
+        return None
+    if resp.status_code >= 400:
+        return None
+    etag = resp.headers.get("ETag")
+    return etag.strip('"') if etag else None
+
+
+def _prune_logo_cache() -> None:
+    """每个进程首次使用缓存时按 mtime 淘汰最旧文件，使缓存总量不超过上限。"""
+    global _logo_cache_pruned
+    with _logo_cache_lock:
+        if _logo_cache_pruned:
+            return
+        _logo_cache_pruned = True
+        try:
+            entries = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in os.scandir(LOGO_CACHE_DIR) if e.is_file()]
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= _LOGO_CACHE_MAX_BYTES:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
 def _download_url_to_path(url: str, local_path: Path, timeout: float = 15.0) -> None:
-    """带超时的 HTTP 下载，避免 PDF 编译阶段 urlretrieve 无限挂起。"""
-    opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
-    req = urllib.request.Request(url, headers={"User-Agent": "Resume-Agent/1.0"})
-    with opener.open(req, timeout=timeout) as resp:
-        local_path.write_bytes(resp.read())
+    """带超时的 HTTP 下载，避免 PDF 编译阶段无限挂起；连接来自共享连接池，命中 ETag 缓存时直接本地复制。"""
+    etag = _head_etag(url, timeout)
+    if not etag:
+        _stream_url_to_path(url, local_path, timeout)
+        return
+
+    try:
+        LOGO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        _stream_url_to_path(url, local_path, timeout)
+        return
+    _prune_logo_cache()
+
+    digest = hashlib.sha1(f"{url}\n{etag}".encode("utf-8")).hexdigest()
+    cached = LOGO_CACHE_DIR / f"{digest}{Path(url).suffix or '.png'}"
+    if cached.is_file():
+        shutil.copy2(cached, local_path)
+        return
+
+    # 先写临时文件再原子替换，避免并发构建读到半截文件
+    fd, tmp_name = tempfile.mkstemp(dir=LOGO_CACHE_DIR, suffix=".part")
+    os.close(fd)
+    try:
+        _stream_url_to_path(url, Path(tmp_name), timeout)
+        os.replace(tmp_name, cached)
+    except Exception:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    shutil.copy2(cached, local_path)
+
+
+def _get_logo_download_executor() -> ThreadPoolExecutor:
+    """进程内共享的下载线程池：并发的多次 PDF 构建共用同一组 worker 与 _LOGO_HTTP 连接。"""
+    global _logo_download_executor
+    if _logo_download_executor is None:
+        with _logo_download_executor_lock:
+            if _logo_download_executor is None:
+                _logo_download_executor = ThreadPoolExecutor(
+                    max_workers=_LOGO_DOWNLOAD_WORKERS,
+                    thread_name_prefix="logo-download",
+                )
+    return _logo_download_executor
+
+
+def _fan_out_logo(src: Path, dst: Path) -> None:
+    """同一 Logo 被多段实习引用时，硬链接（失败则复制）到各自的 logo_{idx}.png。"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
 
 
 def download_logos_to_dir(internships: list, target_dir: str) -> dict[int, str]:
     """
     将 internships 中用到的 Logo 写入目标目录：优先从 COS 下载，失败时回退本地复制
 
+    同一 logo key 只下载一次，再分发给引用它的每段实习；
+    COS 下载在线程池中并发执行，logo_map 只在主线程写入。
+
     返回: { index: local_filename } 映射，如 { 0: 'logo_0.png', 2: 'logo_2.png' }
     """
     get_all_logos_with_urls()
@@ -404,35 +661,73 @@ def download_logos_to_dir(internships: list, target_dir: str) -> dict[int, str]:
     logos_dir = Path(target_dir) / 'logos'
     logo_map = {}
 
+    # logo_key -> 引用它的实习下标（保持首次出现顺序）
+    by_key: dict[str, list[int]] = {}
     for idx, it in enumerate(internships):
         logo_key = it.get('logo')
         if not logo_key:
             continue
-
-        logos_dir.mkdir(parents=True, exist_ok=True)
-        local_filename = f'logo_{idx}.png'
-        local_path = logos_dir / local_filename
-
-        cos_url = get_logo_cos_url(logo_key)
+        by_key.setdefault(logo_key, []).append(idx)
+
+    if not by_key:
+        return logo_map
+    logos_dir.mkdir(parents=True, exist_ok=True)
+
+    # (logo_key, cos_url, primary_path)：每个 key 先落到首个下标的文件
+    jobs: list[tuple[str, str | None, Path]] = [
+        (logo_key, get_logo_cos_url(logo_key), logos_dir / f'logo_{indices[0]}.png')
+        for logo_key, indices in by_key.items()
+    ]
+
+    def _fetch(job: tuple[str, str | None, Path]) -> Exception | None:
+        _, cos_url, local_path = job
+        try:
+            print(f"[Logo] 下载: {cos_url} -> {local_path}")
+            _download_url_to_path(cos_url, local_path)
+            return None
+        except Exception as e:
+            return e
+
+    remote_jobs = [job for job in jobs if job[1]]
+    errors: dict[str, Exception | None] = {}
+    if remote_jobs:
+        executor = _get_logo_download_executor()
+        for job, err in zip(remote_jobs, executor.map(_fetch, remote_jobs)):
+            errors[job[0]] = err
+
+    for logo_key, cos_url, local_path in jobs:
+        local_filename = local_path.name
+        ready = False
         if cos_url:
-            try:
-                print(f"[Logo] 下载: {cos_url} -> {local_path}")
-                _download_url_to_path(cos_url, local_path)
-                logo_map[idx] = local_filename
+            err = errors.get(logo_key)
+            if err is None:
+                ready = True
                 print(f"[Logo] 下载成功: {local_filename} ({local_path.stat().st_size} bytes)")
-                continue
-            except Exception as e:
-                print(f"[Logo] 下载失败 ({logo_key})，回退本地: {e}")
-
-        src = get_logo_local_path(logo_key)
-        if src:
+            else:
+                print(f"[Logo] 下载失败 ({logo_key})，回退本地: {err}")
+
+        if not ready:
+            src = get_logo_local_path(logo_key)
+            if src:
+                try:
+                    shutil.copy2(src, local_path)
+                    ready = True
+                    print(f"[Logo] 本地兜底复制: {src.name} -> {local_filename}")
+                except Exception as e:
+                    print(f"[Logo] 本地复制失败 ({logo_key}): {e}")
+            else:
+                print(f"[Logo] COS 与本地均未找到 Logo key: {logo_key}")
+
+        if not ready:
+            continue
+        first_idx, *other_indices = by_key[logo_key]
+        logo_map[first_idx] = local_filename
+        for idx in other_indices:
+            target_filename = f'logo_{idx}.png'
             try:
-                shutil.copy2(src, local_path)
-                logo_map[idx] = local_filename
-                print(f"[Logo] 本地兜底复制: {src.name} -> {local_filename}")
+                _fan_out_logo(local_path, logos_dir / target_filename)
+                logo_map[idx] = target_filename
             except Exception as e:
-                print(f"[Logo] 本地复制失败 ({logo_key}): {e}")
-        else:
-            print(f"[Logo] COS 与本地均未找到 Logo key: {logo_key}")
+                print(f"[Logo] 分发失败 ({logo_key} -> {target_filename}): {e}")
 
     return logo_map
@@ -2,8 +2,11 @@
 并行处理配置
 """
 
-# 并行分块处理的默认配置
-DEFAULT_PARALLEL_CONFIG = {
+from types import MappingProxyType
+from typing import Mapping
+
+# 并行分块处理的默认配置（只读）
+DEFAULT_PARALLEL_CONFIG = MappingProxyType({
     # 最大并发数
     # 建议：3-6，太多可能触发API限流
     "max_concurrent": 6,
@@ -26,7 +29,7 @@ DEFAULT_PARALLEL_CONFIG = {
 
     # 是否启用并行处理
     "enabled": True,
-}
+})
 
 # 不同AI提供商的特定配置
 PROVIDER_CONFIG = {
@@ -49,7 +52,14 @@ PROVIDER_CONFIG = {
     },
 }
 
-def get_parallel_config(provider: str = None) -> dict:
+# 各提供商合并后的配置在导入时算好，调用方拿到的是只读视图，无需每次复制
+_MERGED_PROVIDER_CONFIG = {
+    provider: MappingProxyType({**DEFAULT_PARALLEL_CONFIG, **overrides})
+    for provider, overrides in PROVIDER_CONFIG.items()
+}
+
+
+def get_parallel_config(provider: str = None) -> Mapping:
     """
     获取并行处理配置
 
@@ -57,12 +67,10 @@ def get_parallel_config(provider: str = None) -> dict:
         provider: AI提供商，如果不提供则返回默认配置
 
     Returns:
-        配置字典
+        只读配置映射（需要修改时请先 dict(...) 复制）
     """
-    config = DEFAULT_PARALLEL_CONFIG.copy()
-
-    if provider and provider in PROVIDER_CONFIG:
-        # 合并提供商特定配置
-        config.update(PROVIDER_CONFIG[provider])
-
-    return config
\ No newline at end of file
+    if provider:
+        merged = _MERGED_PROVIDER_CONFIG.get(provider)
+        if merged is not None:
+            return merged
+    return DEFAULT_PARALLEL_CONFIG
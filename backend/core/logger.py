@@ -1,10 +1,14 @@
+import atexit
 import os
 import re
 import sys
+import threading
+import time
 from contextvars import ContextVar
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, TextIO
 
 from loguru import logger as _base_logger
 
@@ -24,10 +28,13 @@ _SENSITIVE_EXTRA_KEYS = {
     "author",
     "author_name",
 }
-_SENSITIVE_PATTERNS = [
-    re.compile(r"(user(?:name)?|author(?:_name)?|reddit_username)=([^\s,]+)", re.IGNORECASE),
-    re.compile(r"(body|body_text|comment_body)=([^,]+)"),
-]
+# 两类敏感字段合并为一个正则，一次扫描完成脱敏：
+# - 用户名类（忽略大小写），值截止到空白或逗号
+# - 正文类（区分大小写），值截止到逗号
+_SENSITIVE_PATTERN = re.compile(
+    r"(?i:(user(?:name)?|author(?:_name)?|reddit_username)=([^\s,]+))"
+    r"|(body|body_text|comment_body)=([^,]+)"
+)
 _LOG_RECORD_RESERVED_KEYS = {
     "name",
     "msg",
@@ -51,17 +58,39 @@ _LOG_RECORD_RESERVED_KEYS = {
     "process",
 }
 
+# 开发模式控制台格式：静态格式串由 loguru 预解析，字段值在标记解析之后代入，
+# 因此 message / name / function 中的 {} 与 <> 无需手动转义
+_CONSOLE_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | "
+    "<yellow>[{extra[request_id]}|{extra[flow_id]}]</yellow> | "
+    "<cyan>{name}:{function}</cyan>:<cyan>{line}</cyan> | <level>{message}</level>"
+)
+
 _logging_config: Optional["LoggingConfig"] = None
 _log_dir: Optional[Path] = None
 
 
+def _redact_match(match: "re.Match[str]") -> str:
+    return f"{match.group(1) or match.group(3)}=[REDACTED]"
+
+
 def _sanitize_text_payload(message: str) -> str:
-    sanitized = message
-    for pattern in _SENSITIVE_PATTERNS:
-        sanitized = pattern.sub(lambda match: f"{match.group(1)}=[REDACTED]", sanitized)
-    return sanitized
+    # 所有敏感模式都形如 key=value，不含 '=' 的消息（绝大多数）直接返回
+    if "=" not in message:
+        return message
+    return _SENSITIVE_PATTERN.sub(_redact_match, message)
+
 
+@lru_cache(maxsize=256)
+def _sensitive_extra_keys(keys: frozenset) -> tuple:
+    """给定 extra 的键集合，返回需脱敏的键（大小写不敏感）。
 
+    记录的 extra 键集合只有少数几种组合，按集合缓存后每条记录只需一次 C 层面的哈希查找。
+    """
+    return tuple(key for key in keys if isinstance(key, str) and key.lower() in _SENSITIVE_EXTRA_KEYS)
+
+
+@lru_cache(maxsize=512)
 def _infer_category(name: Optional[str]) -> str:
     if not name:
         return "backend"
@@ -73,6 +102,15 @@ def _infer_category(name: Optional[str]) -> str:
     return "backend"
 
 
+def _record_category(record) -> str:
+    """读取 patch 阶段缓存的类别；未经 patch 的记录（如直接使用 _base_logger）现算。"""
+    extras = record["extra"]
+    category = extras.get("_category")
+    if category is None:
+        category = _infer_category(extras.get("name"))
+    return category
+
+
 def _ensure_log_dirs() -> None:
     if _log_dir is None:
         return
@@ -80,12 +118,27 @@ def _ensure_log_dirs() -> None:
         (_log_dir / category).mkdir(parents=True, exist_ok=True)
 
 
+_day_stamp = ""
+_day_stamp_expires_at = 0.0
+
+
+def _today() -> str:
+    """当天日期串 YYYY-MM-DD，按本地午夜刷新，避免每次写日志都 strftime。"""
+    global _day_stamp, _day_stamp_expires_at
+    if time.time() >= _day_stamp_expires_at:
+        now = datetime.now()
+        next_midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        _day_stamp = now.strftime("%Y-%m-%d")
+        _day_stamp_expires_at = next_midnight.timestamp()
+    return _day_stamp
+
+
 def _get_log_path(category: str, filename: Optional[str] = None) -> Path:
     if _log_dir is None:
         raise RuntimeError("Log directory not configured")
     _ensure_log_dirs()
     if filename is None:
-        filename = f"{datetime.now().strftime('%Y-%m-%d')}.log"
+        filename = f"{_today()}.log"
     return _log_dir / category / filename
 
 
@@ -103,23 +156,25 @@ class LoggingConfig:
         global logger, _log_dir
 
         _base_logger.remove()
+        # 未经 patch 的 logger（如导入期拿到的 _base_logger）也要能渲染 extra[request_id]
+        _base_logger.configure(extra={"request_id": "N/A", "flow_id": "N/A"})
         _log_dir = self.log_dir
 
-        def add_request_and_flow_id(record):
-            record.setdefault("extra", {})
-            record["extra"]["request_id"] = request_id_var.get() or "N/A"
-            record["extra"]["flow_id"] = flow_id_var.get() or "N/A"
-
-        logger_with_request = _base_logger.patch(add_request_and_flow_id)
+        # 开发模式按类别写文件时，类别在 patch 里每条记录只算一次，供各文件 sink 的 filter 直接比较
+        route_to_files = not self.is_production and _log_dir is not None
 
-        def scrub_sensitive_fields(record):
-            record["message"] = _sanitize_text_payload(str(record.get("message", "")))
+        # 单个 patch 完成上下文注入与脱敏（低于 sink 最低级别的记录 loguru 不会走到 patch）
+        def enrich_record(record):
             extras = record.setdefault("extra", {})
-            for key in list(extras.keys()):
-                if key and key.lower() in _SENSITIVE_EXTRA_KEYS:
-                    extras[key] = "[REDACTED]"
+            extras["request_id"] = request_id_var.get() or "N/A"
+            extras["flow_id"] = flow_id_var.get() or "N/A"
+            if route_to_files:
+                extras["_category"] = _infer_category(extras.get("name"))
+            record["message"] = _sanitize_text_payload(str(record.get("message", "")))
+            for key in _sensitive_extra_keys(frozenset(extras)):
+                extras[key] = "[REDACTED]"
 
-        logger = logger_with_request.patch(scrub_sensitive_fields)
+        logger = _base_logger.patch(enrich_record)
 
         if self.is_production:
             logger.add(
@@ -129,38 +184,18 @@ class LoggingConfig:
                 enqueue=True,
             )
         else:
-            def safe_format(record):
-                request_id = record.get("extra", {}).get("request_id", "N/A")
-                flow_id = record.get("extra", {}).get("flow_id", "N/A")
-                safe_function = str(record["function"]).replace("<", "\\<").replace(">", "\\>")
-                safe_name = str(record["name"]).replace("<", "\\<").replace(">", "\\>")
-                message = str(record["message"]).replace("{", "{{").replace("}", "}}")
-                base_msg = "<green>{}</green> | <level>{:<8}</level> | <yellow>[{}|{}]</yellow> | <cyan>{}:{}</cyan>:<cyan>{}</cyan> | <level>{}</level>".format(
-                    record["time"].strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
-                    record["level"].name,
-                    request_id,
-                    flow_id,
-                    safe_name,
-                    safe_function,
-                    record["line"],
-                    message,
-                )
-                if record["exception"] is not None:
-                    base_msg += "\n{exception}"
-                return base_msg + "\n"
-
             logger.add(
                 sys.stdout,
                 level=self.log_level,
                 colorize=False,
-                format=safe_format,
+                format=_CONSOLE_FORMAT,
                 filter=lambda record: record["level"].name not in ["ERROR", "CRITICAL"],
             )
             logger.add(
                 sys.stderr,
                 level="ERROR",
                 colorize=False,
-                format=safe_format,
+                format=_CONSOLE_FORMAT,
             )
 
             if _log_dir is not None:
@@ -175,7 +210,7 @@ class LoggingConfig:
                         compression="zip",
                         encoding="utf-8",
                         enqueue=True,
-                        filter=lambda record, c=category: _infer_category(record.get("extra", {}).get("name")) == c,
+                        filter=lambda record, c=category: _record_category(record) == c,
                     )
 
         self._configured = True
@@ -222,30 +257,63 @@ def bridge_std_logging_to_loguru(level: str = "INFO") -> None:
     logging.basicConfig(handlers=[InterceptHandler()], level=level, force=True)
 
 
-def write_debug_log(category: str, content: str, filename: Optional[str] = None) -> None:
+def _require_log_dir() -> None:
     if _log_dir is None:
         raise RuntimeError("Log directory not configured")
+
+
+# 调试转储文件句柄缓存：按路径复用，打开新文件时顺带关闭文件名不含当天日期的旧句柄
+_debug_handles: Dict[Path, TextIO] = {}
+_debug_handles_lock = threading.Lock()
+
+
+def _get_debug_handle(log_path: Path) -> TextIO:
+    handle = _debug_handles.get(log_path)
+    if handle is None or handle.closed:
+        today = _today()
+        for stale_path in [p for p in _debug_handles if today not in p.name]:
+            _debug_handles.pop(stale_path).close()
+        handle = open(log_path, "a", encoding="utf-8", buffering=64 * 1024)
+        _debug_handles[log_path] = handle
+    return handle
+
+
+@atexit.register
+def _close_debug_handles() -> None:
+    with _debug_handles_lock:
+        for handle in _debug_handles.values():
+            handle.close()
+        _debug_handles.clear()
+
+
+def write_debug_log(category: str, content: str, filename: Optional[str] = None) -> None:
+    _require_log_dir()
     log_path = _get_log_path(category, filename)
-    with open(log_path, "a", encoding="utf-8") as handle:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        handle.write(f"\n{'=' * 60}\n")
-        handle.write(f"[{timestamp}]\n")
-        handle.write(f"{'=' * 60}\n")
-        handle.write(content)
-        handle.write("\n")
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    separator = "=" * 60
+    entry = f"\n{separator}\n[{timestamp}]\n{separator}\n{content}\n"
+    with _debug_handles_lock:
+        handle = _get_debug_handle(log_path)
+        handle.write(entry)
+        # 调试转储多在出错路径上写入，立即落盘以免进程退出时丢失
+        handle.flush()
 
 
 def write_latex_debug(latex_content: str, error_msg: str = "") -> None:
-    content = ""
+    # 先确认可写再拼接，避免为注定失败的调用构造大段 LaTeX 文本
+    _require_log_dir()
+    parts = []
     if error_msg:
-        content += f"Error:\n{error_msg}\n\n"
-    content += f"LaTeX Source:\n{latex_content}"
-    write_debug_log("latex", content, f"latex_debug_{datetime.now().strftime('%Y-%m-%d')}.log")
+        parts.append(f"Error:\n{error_msg}\n\n")
+    parts.append("LaTeX Source:\n")
+    parts.append(latex_content)
+    write_debug_log("latex", "".join(parts), f"latex_debug_{_today()}.log")
 
 
 def write_llm_debug(raw_response: str, cleaned_response: str = "") -> None:
-    content = f"Raw Response:\n{raw_response}"
+    _require_log_dir()
     if cleaned_response:
-        content += f"\n\nCleaned Response:\n{cleaned_response}"
-    write_debug_log("backend", content, f"llm_debug_{datetime.now().strftime('%Y-%m-%d')}.log")
-
+        content = f"Raw Response:\n{raw_response}\n\nCleaned Response:\n{cleaned_response}"
+    else:
+        content = f"Raw Response:\n{raw_response}"
+    write_debug_log("backend", content, f"llm_debug_{_today()}.log")
@@ -6,7 +6,7 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from backend.database import init_db, DATABASE_URL
+from backend.database import init_db, make_engine, DATABASE_URL
 # 必须先导入 models 让全部 ORM 表注册进 Base.metadata——否则 create_all 无表可建、
 # 脚本静默 no-op（2026-07-17 身份统一 bootstrap 演练时发现的既有缺陷）。
 import backend.models  # noqa: F401
@@ -15,7 +15,8 @@ print(f"当前数据库: {DATABASE_URL}")
 print("正在创建表...")
 
 try:
-    init_db()
+    # 一次性脚本不需要连接池；force=True 总是执行 create_all，补建任何缺失的表
+    init_db(bind=make_engine(pool=False), force=True)
     print("[成功] 表创建完成")
 except Exception as e:
     print(f"[错误] 创建表失败: {e}")
@@ -1,11 +1,15 @@
 """
 数据库配置和会话管理
 """
+import hashlib
 import os
 import sys
-from sqlalchemy import create_engine
+from dataclasses import dataclass
+from functools import lru_cache
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -22,7 +26,25 @@ if env_path.exists():
     load_dotenv(dotenv_path=str(env_path), override=True)
 load_dotenv(override=True)
 
-# 从环境变量获取数据库 URL
+def _prefer_mysqlclient(url: str) -> str:
+    """
+    DB_USE_MYSQLCLIENT=1 时把 mysql+pymysql 换成 C 实现的 mysqlclient（mysql+mysqldb），
+    结果集解码不再走纯 Python。需要系统库 libmysqlclient-dev（Debian/Ubuntu）或
+    mysql-devel（RHEL）才能 pip install mysqlclient；驱动导入失败时保持 pymysql。
+    """
+    if not url.startswith("mysql+pymysql://"):
+        return url
+    if os.getenv("DB_USE_MYSQLCLIENT", "").lower() not in {"1", "true", "yes", "on"}:
+        return url
+    try:
+        import MySQLdb  # noqa: F401
+    except ImportError:
+        return url
+    return url.replace("mysql+pymysql://", "mysql+mysqldb://", 1)
+
+
+# 从环境变量获取数据库 URL（进程内只解析一次）
+@lru_cache(maxsize=1)
 def get_database_url():
     # 1. 检查是否使用 PostgreSQL
     use_postgresql = os.getenv("USE_POSTGRESQL", "").lower() in {"1", "true", "yes", "on"}
@@ -45,7 +67,7 @@ def get_database_url():
         # Railway 的 MYSQL_URL 格式可能是 mysql://，需要转换为 mysql+pymysql://
         if database_url.startswith("mysql://") and not database_url.startswith("mysql+pymysql://"):
             database_url = database_url.replace("mysql://", "mysql+pymysql://", 1)
-        return database_url
+        return _prefer_mysqlclient(database_url)
 
     # 3. 尝试从 Railway MySQL 环境变量构建（如果存在）
     mysql_host = os.getenv("MYSQLHOST")
@@ -57,9 +79,9 @@ def get_database_url():
     if mysql_host:
         # 构建连接字符串
         if mysql_password:
-            return f"mysql+pymysql://{mysql_user}:{mysql_password}@{mysql_host}:{mysql_port}/{mysql_database}"
+            return _prefer_mysqlclient(f"mysql+pymysql://{mysql_user}:{mysql_password}@{mysql_host}:{mysql_port}/{mysql_database}")
         else:
-            return f"mysql+pymysql://{mysql_user}@{mysql_host}:{mysql_port}/{mysql_database}"
+            return _prefer_mysqlclient(f"mysql+pymysql://{mysql_user}@{mysql_host}:{mysql_port}/{mysql_database}")
 
     # 4. 默认使用 SQLite（开发环境）
     # 使用绝对路径，确保数据库文件位置固定
@@ -76,40 +98,151 @@ def _env_bool(name: str, default: bool) -> bool:
     return raw.strip().lower() in {"1", "true", "yes", "on"}
 
 
-IS_MYSQL = "mysql" in DATABASE_URL.lower()
-IS_POSTGRESQL = "postgresql" in DATABASE_URL.lower()
-DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", IS_POSTGRESQL)
-DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
-DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
-DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
-DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "3"))
-
-# PostgreSQL 连接超时（秒），启动时若连不上可快速回退到文件存储，避免长时间卡住
-PG_CONNECT_TIMEOUT = int(os.getenv("PG_CONNECT_TIMEOUT", "5"))
-
-# 创建数据库引擎
-engine = create_engine(
-    DATABASE_URL,
-    # 远程数据库高延迟场景下，pre_ping 会在每次取连接时增加额外往返，默认关闭。
-    pool_pre_ping=DB_POOL_PRE_PING,
-    pool_recycle=DB_POOL_RECYCLE,
-    pool_size=DB_POOL_SIZE,
-    max_overflow=DB_MAX_OVERFLOW,
-    pool_timeout=DB_POOL_TIMEOUT,
-    pool_use_lifo=True,   # 优先复用最近连接，减少命中陈旧连接
-    pool_reset_on_return="rollback",  # 连接归还时重置事务状态，减少脏连接影响
-    echo=False,           # 设置为 True 可以看到 SQL 日志
-    connect_args=(
-        {
+_URL_LOWER = DATABASE_URL.lower()
+IS_MYSQL = "mysql" in _URL_LOWER
+IS_POSTGRESQL = "postgresql" in _URL_LOWER
+IS_SQLITE = _URL_LOWER.startswith("sqlite")
+
+
+def _pool_recycle_seconds() -> int:
+    """
+    连接回收周期：必须短于服务端空闲断开时间（MySQL wait_timeout / 代理空闲超时），
+    这样 LIFO 复用 + 定期回收即可避开陈旧连接，MySQL 无需 pre_ping 每次取连接多一次往返。
+    DB_SERVER_WAIT_TIMEOUT 未设置时 MySQL 按 3600 秒估计，其余数据库不设上限。
+    """
+    recycle = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    wait_timeout = os.getenv("DB_SERVER_WAIT_TIMEOUT") or ("3600" if IS_MYSQL else "")
+    if wait_timeout:
+        recycle = min(recycle, max(int(wait_timeout) - 60, 30))
+    return recycle
+
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    """连接池等数据库参数，导入时从环境变量读取一次"""
+    pool_pre_ping: bool
+    pool_recycle: int
+    pool_size: int
+    max_overflow: int
+    pool_timeout: int
+    # PostgreSQL 连接超时（秒），启动时若连不上可快速回退到文件存储，避免长时间卡住
+    pg_connect_timeout: int
+
+    @classmethod
+    def from_env(cls) -> "DatabaseSettings":
+        # 连接池容量：单进程内预计同时持有会话的线程数（DB_TARGET_CONCURRENCY）
+        # 决定 pool_size，DB_POOL_SIZE 作为上限；溢出连接默认 2 倍 pool_size 吸收突发。
+        # 部署时保证 (pool_size + max_overflow) × 进程数 × 实例数 ≤ 数据库 max_connections。
+        pool_cap = int(os.getenv("DB_POOL_SIZE", "20"))
+        target = int(os.getenv("DB_TARGET_CONCURRENCY", str(pool_cap)))
+        pool_size = max(5, min(pool_cap, target))
+        return cls(
+            pool_pre_ping=_env_bool("DB_POOL_PRE_PING", IS_POSTGRESQL),
+            pool_recycle=_pool_recycle_seconds(),
+            pool_size=pool_size,
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", str(2 * pool_size))),
+            # 等待空闲连接的超时：给短时突发留出恢复时间，而不是立刻 QueuePool timeout
+            pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "10")),
+            pg_connect_timeout=int(os.getenv("PG_CONNECT_TIMEOUT", "5")),
+        )
+
+
+DB_SETTINGS = DatabaseSettings.from_env()
+DB_POOL_PRE_PING = DB_SETTINGS.pool_pre_ping
+DB_POOL_RECYCLE = DB_SETTINGS.pool_recycle
+DB_POOL_SIZE = DB_SETTINGS.pool_size
+DB_MAX_OVERFLOW = DB_SETTINGS.max_overflow
+DB_POOL_TIMEOUT = DB_SETTINGS.pool_timeout
+PG_CONNECT_TIMEOUT = DB_SETTINGS.pg_connect_timeout
+
+# PostgreSQL 服务端语句超时（毫秒），0 表示不设置
+PG_STATEMENT_TIMEOUT_MS = int(os.getenv("PG_STATEMENT_TIMEOUT_MS", "15000"))
+
+
+def _connect_args() -> dict:
+    # Railway / NAT 链路会静默丢弃空闲 TCP 会话：MySQL 延长会话空闲断开时间，
+    # PostgreSQL 打开 libpq TCP keepalive，并设置语句超时防止慢查询长期占用连接。
+    if IS_MYSQL:
+        return {
             "charset": "utf8mb4",
             "connect_timeout": 8,
             "read_timeout": 15,
             "write_timeout": 10,
+            "init_command": "SET SESSION wait_timeout=28800, net_read_timeout=30",
         }
-        if IS_MYSQL
-        else ({"connect_timeout": PG_CONNECT_TIMEOUT} if IS_POSTGRESQL else {})
-    ),
-)
+    if IS_POSTGRESQL:
+        args = {
+            "connect_timeout": PG_CONNECT_TIMEOUT,
+            "keepalives": 1,
+            "keepalives_idle": 30,
+            "keepalives_interval": 10,
+            "keepalives_count": 3,
+        }
+        if PG_STATEMENT_TIMEOUT_MS > 0:
+            args["options"] = f"-c statement_timeout={PG_STATEMENT_TIMEOUT_MS}"
+        return args
+    if IS_SQLITE:
+        # 连接池里的连接会被不同工作线程取用
+        return {"check_same_thread": False}
+    return {}
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL：读写互不阻塞（开发环境多 worker 并发读）；其余为本地开发可接受的性能取舍
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+    finally:
+        cursor.close()
+
+
+def _make_pooled_engine():
+    return create_engine(
+        DATABASE_URL,
+        # 远程数据库高延迟场景下，pre_ping 会在每次取连接时增加额外往返，默认关闭。
+        pool_pre_ping=DB_POOL_PRE_PING,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_use_lifo=True,   # 优先复用最近连接，减少命中陈旧连接
+        pool_reset_on_return="rollback",  # 连接归还时重置事务状态，减少脏连接影响
+        echo=False,           # 设置为 True 可以看到 SQL 日志
+        connect_args=_connect_args(),
+    )
+
+
+def make_engine(pool: bool = True):
+    """
+    创建数据库引擎
+
+    Args:
+        pool: False 时使用 NullPool（建表等一次性脚本用，不维护连接池）
+    """
+    if not pool:
+        new_engine = create_engine(DATABASE_URL, poolclass=NullPool, echo=False, connect_args=_connect_args())
+    else:
+        new_engine = _make_pooled_engine()
+    if IS_SQLITE:
+        event.listen(new_engine, "connect", _set_sqlite_pragmas)
+    return new_engine
+
+
+# 创建数据库引擎（create_engine 不建立连接，导入时创建开销很小）
+engine = make_engine()
+
+
+def _dispose_engine_after_fork():
+    # 预加载应用后 fork 出的 worker 会继承父进程连接池里的 socket；
+    # close=False 只丢弃池内引用不关闭父进程连接，子进程随后按需重建自己的连接池。
+    engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_engine_after_fork)
 
 # 创建会话工厂
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -130,8 +263,40 @@ def get_db():
         db.close()
 
 
-def init_db():
+# 上次成功建表时的 schema 指纹（按数据库 URL + 表名计算），匹配时跳过 create_all 的逐表探测
+SCHEMA_HASH_FILE = Path(__file__).resolve().parent / ".schema.hash"
+
+
+def _schema_hash(bind) -> str:
+    url = bind.url.render_as_string(hide_password=True)
+    return hashlib.sha1(repr((url, sorted(Base.metadata.tables.keys()))).encode("utf-8")).hexdigest()
+
+
+def init_db(bind=None, force: bool = False):
     """
     初始化数据库（创建所有表）
+
+    Args:
+        bind: 可选引擎，默认使用全局连接池引擎
+        force: True 时忽略 schema 指纹，总是执行 create_all
     """
-    Base.metadata.create_all(bind=engine)
+    bind = bind or engine
+    tables = sorted(Base.metadata.tables.keys())
+    schema_hash = _schema_hash(bind)
+
+    if not force and tables:
+        try:
+            cached = SCHEMA_HASH_FILE.read_text(encoding="utf-8").strip()
+        except OSError:
+            cached = ""
+        # 指纹一致时只探测一张表确认库没被重建，省去每张表一次的存在性查询
+        if cached == schema_hash and inspect(bind).has_table(tables[0]):
+            return
+
+    with bind.begin() as conn:
+        Base.metadata.create_all(bind=conn, checkfirst=True)
+
+    try:
+        SCHEMA_HASH_FILE.write_text(schema_hash, encoding="utf-8")
+    except OSError:
+        pass
@@ -6,7 +6,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 # 确保导入所有模型
 from backend import models  # 这会加载所有模型
-from backend.database import Base, engine, DATABASE_URL
+from backend.database import Base, make_engine, DATABASE_URL
 
 print(f"数据库URL: {DATABASE_URL}")
 print(f"表元数据: {len(Base.metadata.tables)} 个表")
@@ -17,7 +17,8 @@ for table_name in Base.metadata.tables.keys():
 
 print("\n正在创建表...")
 try:
-    Base.metadata.create_all(bind=engine)
+    # 一次性脚本不需要连接池
+    Base.metadata.create_all(bind=make_engine(pool=False))
     print("表创建完成")
     
     # 验证
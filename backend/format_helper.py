@@ -14,7 +14,9 @@
 - 2025-12-07: 模块化重构，提升可维护性和解析速度
 """
 
-from typing import Dict, Any, Optional, Tuple
+import re
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Tuple
 
 """导入各个解析器"""
 from backend.parsers import (
@@ -29,6 +31,45 @@ from backend.parsers import (
     parse_opensource,
 )
 
+"""段落标题 → (结果字段, 解析器)，按优先级排列（同一行命中多个标题时取靠前者）"""
+_SECTION_PARSERS = (
+    (('实习经历',), 'internships', parse_internships),
+    (('项目经验', '项目经历'), 'projects', parse_projects),
+    (('开源经历', '开源贡献'), 'openSource', parse_opensource),
+    (('专业技能',), 'skills', parse_skills),
+    (('教育经历', '教育背景'), 'education', parse_education),
+)
+_SECTION_KEYWORD_RE = re.compile('|'.join(
+    re.escape(keyword) for keywords, _, _ in _SECTION_PARSERS for keyword in keywords
+))
+"""“实习经历一/二…”是条目内编号而非段落标题"""
+_INTERNSHIP_ORDINALS = frozenset('一二三四五')
+
+
+def _match_section(line: str):
+    """一次正则扫描过滤掉绝大多数非标题行，命中时再按优先级确定段落"""
+    if not _SECTION_KEYWORD_RE.search(line):
+        return None
+    for keywords, key, parser in _SECTION_PARSERS:
+        if any(keyword in line for keyword in keywords):
+            if key == 'internships' and not _INTERNSHIP_ORDINALS.isdisjoint(line):
+                continue
+            return key, parser
+    return None
+
+
+def _header_line_indices(text: str) -> List[int]:
+    """对全文做一次关键词扫描，返回可能是段落标题的行号（升序去重）"""
+    indices: List[int] = []
+    line_no = 0
+    last = 0
+    for match in _SECTION_KEYWORD_RE.finditer(text):
+        line_no += text.count('\n', last, match.start())
+        last = match.start()
+        if not indices or indices[-1] != line_no:
+            indices.append(line_no)
+    return indices
+
 
 def try_smart_parse(text: str) -> Tuple[Optional[Dict], Optional[str]]:
     """
@@ -40,8 +81,10 @@ def try_smart_parse(text: str) -> Tuple[Optional[Dict], Optional[str]]:
     """
     try:
         result = {}
-        lines = text.split('\n')
-        clean_lines = [line.strip() for line in lines]
+        """原地 strip，避免同时持有两份行列表（按 \n 切分，与标题扫描的行号保持一致）"""
+        clean_lines = text.split('\n')
+        for idx, line in enumerate(clean_lines):
+            clean_lines[idx] = line.strip()
         
         if not any(clean_lines):
             return None, "文本为空"
@@ -56,44 +99,21 @@ def try_smart_parse(text: str) -> Tuple[Optional[Dict], Optional[str]]:
         if contact:
             result['contact'] = contact
         
-        """3. 按段落解析"""
+        """3. 按段落解析：只在候选标题行之间跳转，不逐行扫描"""
+        candidates = _header_line_indices(text)
         i = 0
-        while i < len(clean_lines):
-            line = clean_lines[i]
-            
-            """实习经历"""
-            if '实习经历' in line and not any(c in line for c in ['一', '二', '三', '四', '五']):
-                internships, i = parse_internships(clean_lines, i + 1)
-                if internships:
-                    result['internships'] = internships
-                continue
+        while True:
+            k = bisect_left(candidates, i)
+            if k == len(candidates):
+                break
+            i = candidates[k]
             
-            """项目经验"""
-            if '项目经验' in line or '项目经历' in line:
-                projects, i = parse_projects(clean_lines, i + 1)
-                if projects:
-                    result['projects'] = projects
-                continue
-            
-            """开源经历"""
-            if '开源经历' in line or '开源贡献' in line:
-                opensource, i = parse_opensource(clean_lines, i + 1)
-                if opensource:
-                    result['openSource'] = opensource
-                continue
-            
-            """专业技能"""
-            if '专业技能' in line:
-                skills, i = parse_skills(clean_lines, i + 1)
-                if skills:
-                    result['skills'] = skills
-                continue
-            
-            """教育经历"""
-            if '教育经历' in line or '教育背景' in line:
-                education, i = parse_education(clean_lines, i + 1)
-                if education:
-                    result['education'] = education
+            section = _match_section(clean_lines[i])
+            if section:
+                key, parser = section
+                parsed, i = parser(clean_lines, i + 1)
+                if parsed:
+                    result[key] = parsed
                 continue
             
             i += 1
@@ -129,15 +149,17 @@ def format_resume_text(text: str, use_ai: bool = True, ai_callback=None) -> Dict
     4. ai: 调用 AI 解析（慢，最后手段）
     """
     
-    """第1层：json-repair"""
-    data, error = try_json_repair(text)
-    if data:
-        return {"success": True, "data": data, "method": "json-repair", "error": None}
-    
-    """第2层：正则提取"""
-    data, error = try_regex_extract(text)
-    if data:
-        return {"success": True, "data": data, "method": "regex", "error": None}
+    """纯文本简历（没有 { / [）不可能走通 JSON 两层，直接进入智能解析"""
+    if '{' in text or '[' in text:
+        """第1层：json-repair"""
+        data, error = try_json_repair(text)
+        if data:
+            return {"success": True, "data": data, "method": "json-repair", "error": None}
+        
+        """第2层：正则提取"""
+        data, error = try_regex_extract(text)
+        if data:
+            return {"success": True, "data": data, "method": "regex", "error": None}
     
     """第3层：智能解析（快速路径）"""
     smart_data, error = try_smart_parse(text)
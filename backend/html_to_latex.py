@@ -12,15 +12,34 @@ HTML to LaTeX 转换模块
 - 换行 <br> -> newline
 """
 
+import io
 import re
 from html.parser import HTMLParser
-from typing import List, Tuple
+from typing import ClassVar, Dict, List, Optional, Tuple, Union
+
+try:
+    from lxml import etree as _lxml_etree
+except ImportError:  # lxml 未安装时退回标准库 html.parser
+    _lxml_etree = None
 
 try:
     from backend.ats_normalize import normalize_ats_text
 except ImportError:  # 兼容以 backend 为 cwd 的脚本场景
     from ats_normalize import normalize_ats_text
 
+# 预编译正则（每次格式化请求都会调用多次）
+_MD_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+_MD_ITALIC_RE = re.compile(r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)')
+_MD_CODE_RE = re.compile(r'`(.+?)`')
+_MD_OL_PREFIX_RE = re.compile(r'^\d+\.[ \t]')
+_HTML_TAG_START_RE = re.compile(r'<[a-zA-Z]')
+_EMPTY_P_RE = re.compile(r'<p[^>]*>\s*</p>')
+_TAG_RE = re.compile(r'<[^>]+>')
+_MULTI_NL_RE = re.compile(r'\n{3,}')
+_EMPTY_ITEM_NESTED_LIST_RE = re.compile(r'\\item(?:\s*\n\s*|\s+)(\\begin\{(?:itemize|enumerate)\}(?:\[[^\]]*\])?)')
+_LI_RE = re.compile(r'<li[^>]*>(.*?)</li>', re.DOTALL | re.IGNORECASE)
+_P_RE = re.compile(r'<p[^>]*>(.*?)</p>', re.DOTALL | re.IGNORECASE)
+
 
 def _markdown_to_html(text: str) -> str:
     """Convert basic Markdown to HTML so html_to_latex can process it.
@@ -31,7 +50,7 @@ def _markdown_to_html(text: str) -> str:
     in_ul = False
     in_ol = False
 
-    def close_lists():
+    def close_lists() -> None:
         nonlocal in_ul, in_ol
         if in_ul:
             html_lines.append('</ul>')
@@ -42,11 +61,11 @@ def _markdown_to_html(text: str) -> str:
 
     def inline(s: str) -> str:
         # **bold**
-        s = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', s)
+        s = _MD_BOLD_RE.sub(r'<strong>\1</strong>', s)
         # *italic* (single star, not part of **)
-        s = re.sub(r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)', r'<em>\1</em>', s)
+        s = _MD_ITALIC_RE.sub(r'<em>\1</em>', s)
         # `code`
-        s = re.sub(r'`(.+?)`', r'\1', s)
+        s = _MD_CODE_RE.sub(r'\1', s)
         return s
 
     for line in lines:
@@ -68,14 +87,14 @@ def _markdown_to_html(text: str) -> str:
             content = stripped[2:].strip() if len(stripped) > 2 else stripped[1:].strip()
             html_lines.append(f'<li><p>{inline(content)}</p></li>')
         # Ordered list
-        elif re.match(r'^\d+\.[ \t]', stripped):
+        elif _MD_OL_PREFIX_RE.match(stripped):
             if in_ul:
                 html_lines.append('</ul>')
                 in_ul = False
             if not in_ol:
                 html_lines.append('<ol>')
                 in_ol = True
-            content = re.sub(r'^\d+\.[ \t]', '', stripped)
+            content = _MD_OL_PREFIX_RE.sub('', stripped)
             html_lines.append(f'<li><p>{inline(content)}</p></li>')
         # Blank line
         elif stripped == '':
@@ -89,91 +108,197 @@ def _markdown_to_html(text: str) -> str:
     return '\n'.join(html_lines)
 
 
-class HTMLToLatexConverter(HTMLParser):
-    """HTML 到 LaTeX 转换器"""
-    
-    def __init__(self):
-        super().__init__()
-        self.result: List[str] = []
+class _LatexEmitter:
+    """标签事件 → LaTeX 片段，start/end/data/close 即 lxml 的 parser target 接口"""
+
+    def __init__(self, collect_items: bool = False) -> None:
+        self.out: io.StringIO = io.StringIO()
+        self._pending_text: List[str] = []  # 相邻文本片段攒到下一个标签事件再统一转义
         self.tag_stack: List[str] = []
-        self.in_list = False
-        self.list_type = None  # 'ul' or 'ol'
+        self.in_list: bool = False
+        self.list_type: Optional[str] = None  # 'ul' or 'ol'
         self._anchor_hrefs: List[str] = []  # <a> 的 href 栈，支持嵌套 / 无 href 情况
-        
-    def handle_starttag(self, tag: str, attrs: List[Tuple[str, str]]):
+        # 条目收集模式（html_to_latex_items）：一次解析中按最外层 <li> / <p> 切分
+        self._collect_items: bool = collect_items
+        self.items: List[str] = []
+        self.paragraphs: List[str] = []
+        self._item_tag: Optional[str] = None  # 当前正在收集的最外层条目标签：'li' / 'p'
+        self._item_depth: int = 0
+        self._outer_out: Optional[io.StringIO] = None
+
+    def _begin_item(self, tag: str) -> bool:
+        """进入条目收集；仅最外层 li / p（且不在 li 内的 p）开启新条目"""
+        if not self._collect_items:
+            return False
+        if self._item_tag == tag:
+            self._item_depth += 1
+            return False
+        if self._item_tag is not None:
+            return False
+        self._item_tag = tag
+        self._item_depth = 1
+        self._outer_out, self.out = self.out, io.StringIO()
+        return True
+
+    def _end_item(self, tag: str) -> bool:
+        if self._item_tag != tag:
+            return False
+        self._item_depth -= 1
+        if self._item_depth:
+            return False
+        (self.items if tag == 'li' else self.paragraphs).append(self.out.getvalue())
+        if self._outer_out is not None:
+            self.out, self._outer_out = self._outer_out, None
+        self._item_tag = None
+        return True
+
+    # 只输出固定片段的标签走字典分派；列表、段落、链接需要维护状态，单独处理
+    _START: ClassVar[Dict[str, str]] = {
+        'strong': r'\textbf{',
+        'b': r'\textbf{',
+        'em': r'\textit{',
+        'i': r'\textit{',
+        'u': r'\underline{',
+        'br': r' \\' + '\n',
+        'h1': r'\section*{',
+        'h2': r'\subsection*{',
+        'h3': r'\subsubsection*{',
+    }
+    _END: ClassVar[Dict[str, str]] = {
+        'strong': '}',
+        'b': '}',
+        'em': '}',
+        'i': '}',
+        'u': '}',
+        'h1': '}\n',
+        'h2': '}\n',
+        'h3': '}\n',
+    }
+
+    def _flush_text(self) -> None:
+        if self._pending_text:
+            # 转义 LaTeX 特殊字符
+            self.out.write(escape_latex(''.join(self._pending_text)))
+            self._pending_text.clear()
+
+    def start(self, tag: str, attrs: Union[List[Tuple[str, Optional[str]]], Dict[str, str]]) -> None:
+        self._flush_text()
         tag = tag.lower()
         self.tag_stack.append(tag)
         
-        if tag in ('strong', 'b'):
-            self.result.append(r'\textbf{')
-        elif tag in ('em', 'i'):
-            self.result.append(r'\textit{')
-        elif tag == 'u':
-            self.result.append(r'\underline{')
+        fragment = self._START.get(tag)
+        if fragment is not None:
+            self.out.write(fragment)
         elif tag == 'ul':
             self.in_list = True
             self.list_type = 'ul'
             # 使用圆点符号，并设置对齐参数：leftmargin=* 自动计算，labelsep 控制标签和文本间距
-            self.result.append(r'\begin{itemize}[label=\footnotesize$\bullet$,parsep=0.2ex,leftmargin=*,labelsep=0.5em,itemindent=0em]' + '\n')
+            self.out.write(r'\begin{itemize}[label=\footnotesize$\bullet$,parsep=0.2ex,leftmargin=*,labelsep=0.5em,itemindent=0em]' + '\n')
         elif tag == 'ol':
             self.in_list = True
             self.list_type = 'ol'
-            self.result.append(r'\begin{enumerate}' + '\n')
+            self.out.write(r'\begin{enumerate}' + '\n')
         elif tag == 'li':
-            self.result.append(r'  \item ')
-        elif tag == 'br':
-            self.result.append(r' \\' + '\n')
+            if not self._begin_item('li'):
+                self.out.write(r'  \item ')
         elif tag == 'p':
-            # 段落开始，不需要特殊处理
-            pass
-        elif tag == 'h1':
-            self.result.append(r'\section*{')
-        elif tag == 'h2':
-            self.result.append(r'\subsection*{')
-        elif tag == 'h3':
-            self.result.append(r'\subsubsection*{')
+            # 段落开始，不需要特殊处理（收集模式下可能开启新条目）
+            self._begin_item('p')
         elif tag == 'a':
             # 富文本里的链接 → 可点击 \href（hyperref 已在 resume.cls 启用）
             # 链接文字默认斜体 + 下划线，便于区分（不依赖颜色，配合 hidelinks）
-            href = dict(attrs).get('href', '').strip()
+            href = (dict(attrs).get('href') or '').strip()
             self._anchor_hrefs.append(href)
             if href:
-                self.result.append(r'\href{' + escape_href(href) + r'}{\textit{\uline{')
+                self.out.write(r'\href{' + escape_href(href) + r'}{\textit{\uline{')
 
-    def handle_endtag(self, tag: str):
+    def end(self, tag: str) -> None:
+        self._flush_text()
         tag = tag.lower()
         if self.tag_stack and self.tag_stack[-1] == tag:
             self.tag_stack.pop()
             
-        if tag in ('strong', 'b', 'em', 'i', 'u'):
-            self.result.append('}')
+        fragment = self._END.get(tag)
+        if fragment is not None:
+            self.out.write(fragment)
         elif tag == 'ul':
-            self.result.append(r'\end{itemize}' + '\n')
+            self.out.write(r'\end{itemize}' + '\n')
             self.in_list = False
             self.list_type = None
         elif tag == 'ol':
-            self.result.append(r'\end{enumerate}' + '\n')
+            self.out.write(r'\end{enumerate}' + '\n')
             self.in_list = False
             self.list_type = None
         elif tag == 'li':
-            self.result.append('\n')
+            if not self._end_item('li'):
+                self.out.write('\n')
         elif tag == 'p':
             # 段落结束，添加换行
-            self.result.append('\n\n')
-        elif tag in ('h1', 'h2', 'h3'):
-            self.result.append('}\n')
+            if not self._end_item('p'):
+                self.out.write('\n\n')
         elif tag == 'a':
             href = self._anchor_hrefs.pop() if self._anchor_hrefs else ''
             if href:
-                self.result.append('}}}')
+                self.out.write('}}}')
+
+    def data(self, data: str) -> None:
+        self._pending_text.append(data)
+
+    def comment(self, text: str) -> None:
+        pass
+
+    def close(self) -> str:
+        return self.get_latex()
 
-    def handle_data(self, data: str):
-        # 转义 LaTeX 特殊字符
-        escaped = escape_latex(data)
-        self.result.append(escaped)
-        
     def get_latex(self) -> str:
-        return ''.join(self.result).strip()
+        self._flush_text()
+        return self.out.getvalue().strip()
+
+
+class HTMLToLatexConverter(_LatexEmitter, HTMLParser):
+    """HTML 到 LaTeX 转换器（纯 Python html.parser 实现，lxml 不可用时使用）"""
+
+    def __init__(self, collect_items: bool = False) -> None:
+        HTMLParser.__init__(self)
+        _LatexEmitter.__init__(self, collect_items)
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self.start(tag, attrs)
+
+    def handle_endtag(self, tag: str) -> None:
+        self.end(tag)
+
+    def handle_data(self, data: str) -> None:
+        self.data(data)
+
+    def close(self) -> None:  # type: ignore[override]
+        HTMLParser.close(self)
+
+
+def _parse_html(html: str, collect_items: bool = False) -> _LatexEmitter:
+    """优先用 lxml（libxml2 C 实现）驱动转换，未安装时退回 html.parser"""
+    if _lxml_etree is not None:
+        emitter = _LatexEmitter(collect_items)
+        parser = _lxml_etree.HTMLParser(target=emitter)
+        parser.feed(html)
+        parser.close()
+        return emitter
+    converter = HTMLToLatexConverter(collect_items)
+    converter.feed(html)
+    return converter
+
+
+def _convert_html(html: str) -> str:
+    return _parse_html(html).get_latex()
+
+
+def _tidy_latex(result: str) -> str:
+    """转换结果后处理：折叠多余换行，修正“空父级列表项 + 嵌套列表”"""
+    result = _MULTI_NL_RE.sub('\n\n', result)
+
+    # 目标：既满足 LaTeX 语法（必须有 \item），又不渲染出父级黑点。
+    # 做法：把 `\item <nested-list>` 替换为 `\item[]\n<nested-list>`（空标签，不显示圆点）。
+    return _EMPTY_ITEM_NESTED_LIST_RE.sub(r'\\item[]\n\1', result)
 
 
 def escape_href(url: str) -> str:
@@ -185,34 +310,26 @@ def escape_href(url: str) -> str:
     return url
 
 
+# LaTeX 特殊字符转义表：str.translate 单遍完成，避免逐字符多次 replace
+_LATEX_ESCAPE = str.maketrans({
+    '\\': r'\textbackslash{}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+})
+
+
 def escape_latex(text: str) -> str:
     """转义 LaTeX 特殊字符"""
     if not text:
         return ''
-    
-    # LaTeX 特殊字符转义映射
-    replacements = [
-        ('\\', r'\textbackslash{}'),
-        ('&', r'\&'),
-        ('%', r'\%'),
-        ('$', r'\$'),
-        ('#', r'\#'),
-        ('_', r'\_'),
-        ('{', r'\{'),
-        ('}', r'\}'),
-        ('~', r'\textasciitilde{}'),
-        ('^', r'\textasciicircum{}'),
-    ]
-    
-    result = text
-    for old, new in replacements:
-        # 避免重复转义
-        if old == '\\':
-            result = result.replace(old, new)
-        else:
-            result = result.replace(old, new)
-    
-    return result
+    return text.translate(_LATEX_ESCAPE)
 
 
 def html_to_latex(html: str) -> str:
@@ -236,37 +353,24 @@ def html_to_latex(html: str) -> str:
 
     # If the content looks like Markdown (no <tag> patterns), convert it to HTML first.
     # This handles cases where the agent writes Markdown into HTML fields.
-    if not re.search(r'<[a-zA-Z]', html):
+    if not _HTML_TAG_START_RE.search(html):
         html = _markdown_to_html(html)
 
     # 处理空段落（包括带属性的空段落）
-    html = re.sub(r'<p[^>]*>\s*</p>', '', html)
+    html = _EMPTY_P_RE.sub('', html)
     # 注意：不要在 HTML 阶段“删除空 li”，否则会导致 LaTeX 生成时出现
     # itemize/enumerate 环境内直接嵌套 begin{itemize} 而缺少 \item，从而编译报错。
     
     # 使用解析器转换
-    converter = HTMLToLatexConverter()
     try:
-        converter.feed(html)
-        result = converter.get_latex()
+        result = _convert_html(html)
     except Exception as e:
         # 解析失败时返回纯文本
-        result = re.sub(r'<[^>]+>', '', html)
+        result = _TAG_RE.sub('', html)
         result = escape_latex(result)
     
-    # 后处理：清理多余换行
-    result = re.sub(r'\n{3,}', '\n\n', result)
-
-    # 后处理：处理“空父级列表项 + 嵌套列表”的场景
-    # 目标：既满足 LaTeX 语法（必须有 \item），又不渲染出父级黑点。
-    # 做法：把 `\item <nested-list>` 替换为 `\item[]\n<nested-list>`（空标签，不显示圆点）。
-    result = re.sub(
-        r'\\item(?:\s*\n\s*|\s+)(\\begin\{(?:itemize|enumerate)\}(?:\[[^\]]*\])?)',
-        r'\\item[]\n\1',
-        result
-    )
-    
-    return result
+    # 后处理：清理多余换行、修正空父级列表项
+    return _tidy_latex(result)
 
 
 def html_to_latex_items(html: str) -> List[str]:
@@ -285,35 +389,18 @@ def html_to_latex_items(html: str) -> List[str]:
 
     html = normalize_ats_text(html)
 
-    # 提取列表项
+    # 一次解析同时收集最外层 <li> 与 <p> 条目；有列表项时取列表项，否则按段落分割
+    try:
+        emitter = _parse_html(html, collect_items=True)
+    except Exception:
+        return []
+    chunks = emitter.items if emitter.items else (emitter.paragraphs if _P_RE.search(html) else [])
+
     items = []
-    
-    # 匹配 <li> 标签内容
-    li_pattern = r'<li[^>]*>(.*?)</li>'
-    matches = re.findall(li_pattern, html, re.DOTALL | re.IGNORECASE)
-    
-    if matches:
-        for match in matches:
-            # 转换每个列表项内容
-            item_html = match.strip()
-            # 移除内部标签，保留格式
-            item_latex = html_to_latex(f'<p>{item_html}</p>')
-            item_latex = item_latex.strip()
-            if item_latex:
-                items.append(item_latex)
-    else:
-        # 如果没有列表，按段落分割
-        p_pattern = r'<p[^>]*>(.*?)</p>'
-        p_matches = re.findall(p_pattern, html, re.DOTALL | re.IGNORECASE)
-        
-        for match in p_matches:
-            item_html = match.strip()
-            if item_html:
-                item_latex = html_to_latex(f'<p>{item_html}</p>')
-                item_latex = item_latex.strip()
-                if item_latex:
-                    items.append(item_latex)
-    
+    for chunk in chunks:
+        item_latex = _tidy_latex(chunk.strip()).strip()
+        if item_latex:
+            items.append(item_latex)
     return items
 
 
@@ -12,19 +12,21 @@
 import os
 import socket
 import asyncio
-from typing import Optional, Dict, Any, Generator
-from functools import lru_cache
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Generator, List, Tuple
+from email.utils import parsedate_to_datetime
+from functools import lru_cache, wraps
+from urllib.parse import urlsplit
 
-"""尝试导入 httpx (支持 HTTP/2)"""
+"""所有 API 调用统一走 httpx (支持 HTTP/2)"""
 try:
     import httpx
-    HTTPX_AVAILABLE = True
-except ImportError:
-    HTTPX_AVAILABLE = False
-    print("[http_client] httpx 未安装，使用 requests 降级方案")
-    print("[http_client] 安装命令: uv pip install httpx[http2]")
+except ImportError as exc:
+    raise ImportError("[http_client] 需要 httpx，安装命令: uv pip install httpx[http2]") from exc
 
-"""降级方案：使用 requests"""
+"""requests Session 仅供 simple.py 中尚未迁移的旧调用使用"""
 import requests
 from requests.adapters import HTTPAdapter
 try:
@@ -36,44 +38,138 @@ except ImportError:
 """
 ========== DNS 预解析 ==========
 """
-_dns_cache: Dict[str, str] = {}
+"""
+(host, port, family, type, proto, flags) -> (getaddrinfo 的完整结果列表, 过期时间 monotonic)；
+结果为 None 表示解析失败的负缓存。保存完整地址列表，建连时仍能在多条 A/AAAA 记录间故障转移。
+getaddrinfo 拿不到记录 TTL，成功结果统一按 _DNS_TTL 过期，避免服务商切换 IP 后长期钉在旧地址；
+失败结果短时间内不再重复阻塞解析。
+"""
+_DNS_TTL = 300.0
+_DNS_NEGATIVE_TTL = 30.0
+"""安装钩子前的系统解析函数；缓存未命中时都经它实际解析"""
+_original_getaddrinfo = socket.getaddrinfo
+_dns_cache: Dict[Tuple[Any, ...], Tuple[Optional[List[Any]], float]] = {}
+
+
+def _prefetch_key(host: str) -> Tuple[Any, ...]:
+    """预解析与 socket.create_connection 建连时的参数一致，预解析结果可被建连直接命中"""
+    return (host, 443, 0, socket.SOCK_STREAM, 0, 0)
+
+
+def _cached_dns_entry(key: Tuple[Any, ...]) -> Optional[Tuple[Optional[List[Any]], float]]:
+    cached = _dns_cache.get(key)
+    if cached is not None and cached[1] > time.monotonic():
+        return cached
+    return None
+
+
+def _store_dns_result(key: Tuple[Any, ...], result) -> Optional[str]:
+    if result:
+        infos = list(result)
+        _dns_cache[key] = (infos, time.monotonic() + _DNS_TTL)
+        ip = infos[0][4][0]
+        print(f"[DNS预解析] {key[0]} -> {ip}")
+        return ip
+    _dns_cache[key] = (None, time.monotonic() + _DNS_NEGATIVE_TTL)
+    return None
+
 
 def dns_prefetch(host: str) -> Optional[str]:
     """
-    DNS 预解析，缓存 IP 地址
+    DNS 预解析，缓存解析结果（返回首个地址）
     减少首次请求的 DNS 查询延迟 (约 50-100ms)
     """
-    if host in _dns_cache:
-        return _dns_cache[host]
+    key = _prefetch_key(host)
+    cached = _cached_dns_entry(key)
+    if cached is not None:
+        return cached[0][0][4][0] if cached[0] else None
     
     try:
         """解析 DNS"""
-        result = socket.getaddrinfo(host, 443, socket.AF_INET, socket.SOCK_STREAM)
-        if result:
-            ip = result[0][4][0]
-            _dns_cache[host] = ip
-            print(f"[DNS预解析] {host} -> {ip}")
-            return ip
+        result = _original_getaddrinfo(*key)
     except Exception as e:
         print(f"[DNS预解析] 失败: {host} - {e}")
-    return None
+        result = None
+    return _store_dns_result(key, result)
+
+
+"""常用 API 域名：豆包/火山引擎、智谱"""
+API_HOSTS = (
+    "ark.cn-beijing.volces.com",
+    "open.bigmodel.cn",
+)
 
 
 def prefetch_api_hosts():
-    """预解析常用 API 域名"""
-    """豆包/火山引擎、智谱"""
-    hosts = [
-        "ark.cn-beijing.volces.com",
-        "open.bigmodel.cn",
-    ]
-    for host in hosts:
-        dns_prefetch(host)
+    """预解析常用 API 域名（并发解析，总耗时取决于最慢的一个而非总和）"""
+    with ThreadPoolExecutor(max_workers=len(API_HOSTS)) as executor:
+        list(executor.map(dns_prefetch, API_HOSTS))
+
+
+"""
+让 httpx/requests 建连时复用 DNS 缓存：只接管 API_HOSTS 的查询，其余一律交给原始 getaddrinfo。
+未命中或过期时用原始 getaddrinfo 解析并按 _DNS_TTL 写回缓存，缓存在进程整个生命周期内持续有效；
+返回完整结果列表，URL 里的主机名不变，TLS SNI/证书校验不受影响。
+"""
+_API_HOST_SET = frozenset(API_HOSTS)
+
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    name = host.decode("ascii", "ignore") if isinstance(host, bytes) else host
+    if name not in _API_HOST_SET:
+        return _original_getaddrinfo(host, port, family, type, proto, flags)
+
+    key = (name, port, family, type, proto, flags)
+    cached = _cached_dns_entry(key)
+    if cached is not None and cached[0]:
+        return list(cached[0])
+    # 失败不写负缓存：建连路径上把解析异常原样抛给调用方
+    result = _original_getaddrinfo(host, port, family, type, proto, flags)
+    _dns_cache[key] = (list(result), time.monotonic() + _DNS_TTL)
+    return result
+
+
+def install_dns_cache_resolver():
+    """安装 getaddrinfo 钩子（幂等）"""
+    if socket.getaddrinfo is not _cached_getaddrinfo:
+        socket.getaddrinfo = _cached_getaddrinfo
+
+
+def uninstall_dns_cache_resolver():
+    if socket.getaddrinfo is _cached_getaddrinfo:
+        socket.getaddrinfo = _original_getaddrinfo
 
 
 """
 ========== HTTP/2 客户端 (httpx) ==========
 """
 _httpx_client: Optional["httpx.Client"] = None
+"""按主机划分的客户端：httpx 的 Limits 只有全局上限，每个主机单独一个连接池，热点主机不会挤占其他主机"""
+_host_clients: Dict[str, "httpx.Client"] = {}
+"""全局客户端懒加载锁：多个线程首次调用时只创建一个客户端/Session，避免泄漏多余连接池"""
+_client_lock = threading.Lock()
+
+"""连接池上限，可通过环境变量调整"""
+HTTPX_MAX_KEEPALIVE = int(os.getenv("HTTPX_MAX_KEEPALIVE", "20"))
+HTTPX_MAX_CONNECTIONS = int(os.getenv("HTTPX_MAX_CONNECTIONS", "50"))
+HTTPX_KEEPALIVE_EXPIRY = float(os.getenv("HTTPX_KEEPALIVE_EXPIRY", "30"))
+
+
+def _httpx_client_kwargs() -> Dict[str, Any]:
+    return dict(
+        http2=True,
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        limits=httpx.Limits(
+            max_keepalive_connections=HTTPX_MAX_KEEPALIVE,
+            max_connections=HTTPX_MAX_CONNECTIONS,
+            keepalive_expiry=HTTPX_KEEPALIVE_EXPIRY,
+        ),
+        headers={
+            "Accept-Encoding": "br, gzip, deflate",
+            "Connection": "keep-alive",
+        },
+    )
+
 
 def get_httpx_client() -> "httpx.Client":
     """
@@ -82,24 +178,26 @@ def get_httpx_client() -> "httpx.Client":
     """
     global _httpx_client
     
-    if not HTTPX_AVAILABLE:
-        raise RuntimeError("httpx 未安装")
-    
-    if _httpx_client is None:
-        _httpx_client = httpx.Client(
-            http2=True,
-            timeout=httpx.Timeout(30.0, connect=5.0),
-            limits=httpx.Limits(
-                max_keepalive_connections=20,
-                max_connections=50,
-                keepalive_expiry=30.0
-            ),
-            headers={
-                "Accept-Encoding": "br, gzip, deflate",
-                "Connection": "keep-alive",
-            }
-        )
-    return _httpx_client
+    if _httpx_client is not None:
+        return _httpx_client
+    with _client_lock:
+        if _httpx_client is None:
+            _httpx_client = httpx.Client(**_httpx_client_kwargs())
+        return _httpx_client
+
+
+def get_host_client(url: str) -> "httpx.Client":
+    """获取目标主机专属的 HTTP/2 客户端（连接池按主机隔离）"""
+    netloc = urlsplit(url).netloc
+    client = _host_clients.get(netloc)
+    if client is not None:
+        return client
+    with _client_lock:
+        client = _host_clients.get(netloc)
+        if client is None:
+            client = httpx.Client(**_httpx_client_kwargs())
+            _host_clients[netloc] = client
+        return client
 
 
 """
@@ -111,99 +209,158 @@ async def get_async_client() -> "httpx.AsyncClient":
     """获取异步 HTTP/2 客户端"""
     global _async_client
     
-    if not HTTPX_AVAILABLE:
-        raise RuntimeError("httpx 未安装")
-    
-    if _async_client is None:
-        _async_client = httpx.AsyncClient(
-            http2=True,
-            timeout=httpx.Timeout(30.0, connect=5.0),
-            limits=httpx.Limits(
-                max_keepalive_connections=20,
-                max_connections=50,
-            ),
-            headers={
-                "Accept-Encoding": "br, gzip, deflate",
-                "Connection": "keep-alive",
-            }
-        )
-    return _async_client
+    if _async_client is not None:
+        return _async_client
+    with _client_lock:
+        if _async_client is None:
+            _async_client = httpx.AsyncClient(**_httpx_client_kwargs())
+        return _async_client
 
 
 """
-========== 降级方案：requests ==========
+========== requests Session（兼容 simple.py 旧调用） ==========
 """
 _requests_session: Optional[requests.Session] = None
+"""
+连接池按主机划分：我们只访问少数几个 LLM 域名，主机数给小、单主机连接数给大，
+避免并发请求同一主机时 urllib3 "Connection pool is full, discarding connection" 反复握手
+"""
+_REQUESTS_POOL_HOSTS = 4
+_REQUESTS_POOL_MAXSIZE = max(50, (os.cpu_count() or 1) * 5)
 
 def get_requests_session() -> requests.Session:
-    """获取 requests Session (降级方案)"""
+    """获取 requests Session（仅兼容旧调用，新代码请使用 call_api / call_api_stream）"""
     global _requests_session
     
-    if _requests_session is None:
-        _requests_session = requests.Session()
-        adapter = HTTPAdapter(
-            pool_connections=20,
-            pool_maxsize=50,
-            max_retries=Retry(total=1, backoff_factor=0.05) if Retry else 1
-        )
-        _requests_session.mount('http://', adapter)
-        _requests_session.mount('https://', adapter)
-        _requests_session.headers.update({
-            'Connection': 'keep-alive',
-            'Accept-Encoding': 'gzip, deflate',  # 不使用 br (Brotli)，requests 不支持自动解压
-        })
-    return _requests_session
+    if _requests_session is not None:
+        return _requests_session
+    with _client_lock:
+        if _requests_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=_REQUESTS_POOL_HOSTS,
+                pool_maxsize=_REQUESTS_POOL_MAXSIZE,
+                pool_block=False,
+                max_retries=Retry(total=1, backoff_factor=0.05) if Retry else 1
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update({
+                'Connection': 'keep-alive',
+                'Accept-Encoding': 'gzip, deflate',  # 不使用 br (Brotli)，requests 不支持自动解压
+            })
+            # 配置完成后再发布，其他线程不会拿到未挂载 adapter 的 Session
+            _requests_session = session
+        return _requests_session
+
+
+"""
+========== 重试（限流/过载） ==========
+"""
+"""
+只重试服务端明确没有处理请求的情况：429 限流、503 过载拒绝，以及连接失败（请求未发出）。
+500/502/504 时上游可能已经执行（并计费）了非幂等的 LLM 调用，不自动重试。
+优先按 Retry-After 等待，缺省时指数退避；同步调用会阻塞当前线程，
+所以单次等待上限 _RETRY_MAX_DELAY 较短，服务端要求等待更久时直接放弃重试
+"""
+_RETRY_STATUS = frozenset({429, 503})
+_MAX_RETRIES = int(os.getenv("HTTP_CLIENT_MAX_RETRIES", "2"))
+_RETRY_BASE_DELAY = 1.0
+_RETRY_MAX_DELAY = 10.0
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After：秒数或 HTTP 日期"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _retry_delay(exc: Exception, attempt: int) -> Optional[float]:
+    """可重试时返回等待秒数，否则返回 None"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        if exc.response.status_code not in _RETRY_STATUS:
+            return None
+        delay = _retry_after_seconds(exc.response.headers.get("retry-after"))
+        if delay is not None and delay > _RETRY_MAX_DELAY:
+            return None
+    elif isinstance(exc, httpx.ConnectError):
+        delay = None
+    else:
+        return None
+    if delay is None:
+        delay = _RETRY_BASE_DELAY * (2 ** attempt)
+    return min(delay, _RETRY_MAX_DELAY)
+
+
+def _with_retries(func):
+    """为 call_api / call_api_async 加上限流感知的重试（同步/异步通用）"""
+    if asyncio.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            for attempt in range(_MAX_RETRIES + 1):
+                try:
+                    return await func(*args, **kwargs)
+                except (httpx.HTTPStatusError, httpx.ConnectError) as exc:
+                    delay = _retry_delay(exc, attempt)
+                    if delay is None or attempt == _MAX_RETRIES:
+                        raise
+                    await asyncio.sleep(delay)
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        for attempt in range(_MAX_RETRIES + 1):
+            try:
+                return func(*args, **kwargs)
+            except (httpx.HTTPStatusError, httpx.ConnectError) as exc:
+                delay = _retry_delay(exc, attempt)
+                if delay is None or attempt == _MAX_RETRIES:
+                    raise
+                time.sleep(delay)
+    return wrapper
 
 
 """
 ========== 统一 API 调用接口 ==========
 """
+@_with_retries
 def call_api(
     url: str,
     payload: Dict[str, Any],
     headers: Dict[str, str],
-    timeout: float = 30.0,
-    stream: bool = False
+    timeout: float = 30.0
 ) -> Any:
     """
-    统一 API 调用接口
-    优先使用 HTTP/2 (httpx)，降级使用 HTTP/1.1 (requests)
+    统一 API 调用接口 (HTTP/2，按主机隔离的连接池)
+    流式调用请使用 call_api_stream
     
     Args:
         url: API 地址
         payload: 请求体
         headers: 请求头
         timeout: 超时时间
-        stream: 是否流式
     
     Returns:
-        响应对象或 JSON
+        响应 JSON
     """
-    if HTTPX_AVAILABLE and not stream:
-        """使用 HTTP/2"""
-        client = get_httpx_client()
-        response = client.post(
-            url,
-            json=payload,
-            headers=headers,
-            timeout=timeout
-        )
-        response.raise_for_status()
-        return response.json()
-    else:
-        """降级使用 requests"""
-        session = get_requests_session()
-        response = session.post(
-            url,
-            json=payload,
-            headers=headers,
-            timeout=timeout,
-            stream=stream
-        )
-        response.raise_for_status()
-        if stream:
-            return response
-        return response.json()
+    client = get_host_client(url)
+    response = client.post(
+        url,
+        json=payload,
+        headers=headers,
+        timeout=timeout
+    )
+    response.raise_for_status()
+    return response.json()
 
 
 def call_api_stream(
@@ -213,26 +370,48 @@ def call_api_stream(
     timeout: float = 90.0
 ) -> Generator[str, None, None]:
     """
-    流式 API 调用
+    流式 API 调用（与 call_api 共用同一主机的 HTTP/2 连接池）
     
     Yields:
         SSE 数据块
     """
-    session = get_requests_session()
-    response = session.post(
+    client = get_host_client(url)
+    with client.stream(
+        "POST",
         url,
         json=payload,
         headers=headers,
-        timeout=timeout,
-        stream=True
-    )
-    response.raise_for_status()
-    
-    for line in response.iter_lines():
-        if line:
-            yield line.decode('utf-8')
+        timeout=timeout
+    ) as response:
+        response.raise_for_status()
+        yield from _iter_sse_lines(response.iter_bytes(_STREAM_CHUNK_SIZE))
+
+
+"""流式读取块大小：攒够一块再切行，减少小块循环次数"""
+_STREAM_CHUNK_SIZE = 8192
+
+def _iter_sse_lines(chunks) -> Generator[str, None, None]:
+    """
+    按行切分字节流：每块只做一次 split，不完整的尾行留到下一块拼接。
+    整行凑齐后再解码，多字节 UTF-8 字符跨块也不会被截断
+    """
+    pending = b""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if line.endswith(b"\r"):
+                line = line[:-1]
+            if line:
+                yield line.decode('utf-8')
+    pending = pending.rstrip(b"\r")
+    if pending:
+        yield pending.decode('utf-8')
 
 
+@_with_retries
 async def call_api_async(
     url: str,
     payload: Dict[str, Any],
@@ -244,9 +423,6 @@ async def call_api_async(
     
     用于并发请求多个 API
     """
-    if not HTTPX_AVAILABLE:
-        raise RuntimeError("httpx 未安装，无法使用异步调用")
-    
     client = await get_async_client()
     response = await client.post(
         url,
@@ -258,29 +434,73 @@ async def call_api_async(
     return response.json()
 
 
+"""批量调用默认并发上限，与异步客户端的 keepalive 连接数保持一致"""
+_BATCH_MAX_CONCURRENCY = HTTPX_MAX_KEEPALIVE
+
+async def call_api_batch_async(
+    requests_list: List[Dict[str, Any]],
+    max_concurrency: int = _BATCH_MAX_CONCURRENCY,
+    return_exceptions: bool = False,
+) -> List[Any]:
+    """
+    并发批量 API 调用 (HTTP/2 多路复用)
+    
+    Args:
+        requests_list: 每项包含 url、payload、headers，可选 timeout
+        max_concurrency: 同时在途的请求上限
+        return_exceptions: 为 True 时单个请求失败以异常对象返回，不影响其他请求
+    
+    Returns:
+        与 requests_list 顺序一致的 JSON 结果列表
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _call(req: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            return await call_api_async(
+                req["url"],
+                req["payload"],
+                req.get("headers", {}),
+                timeout=req.get("timeout", 30.0),
+            )
+
+    return await asyncio.gather(
+        *(_call(req) for req in requests_list),
+        return_exceptions=return_exceptions,
+    )
+
+
 """
 ========== 初始化 ==========
 """
 def init():
-    """初始化：DNS 预解析 + 预热连接"""
+    """
+    初始化：DNS 预解析 + 预热连接
+    含阻塞网络 I/O，导入模块时不会执行；由 FastAPI startup 事件经 simple.warmup_connection 在线程中调用
+    """
     print("[http_client] 初始化中...")
     
-    """执行 DNS 预解析"""
+    """执行 DNS 预解析，并让后续建连直接使用解析结果"""
     prefetch_api_hosts()
+    install_dns_cache_resolver()
     
-    """预热连接"""
-    if HTTPX_AVAILABLE:
-        try:
-            client = get_httpx_client()
-            """预热到火山引擎"""
-            client.head("https://ark.cn-beijing.volces.com", timeout=2)
-            print("[http_client] HTTP/2 连接已预热")
-        except:
-            pass
+    """预热连接：后台线程执行，最长 2s 的 HEAD 请求不阻塞启动"""
+    threading.Thread(target=_preheat_connection, name="http-preheat", daemon=True).start()
     
     print("[http_client] 初始化完成")
 
 
+_PREHEAT_URL = "https://ark.cn-beijing.volces.com"
+
+def _preheat_connection():
+    """预热到火山引擎（call_api 按主机取连接池，预热同一个池）"""
+    try:
+        get_host_client(_PREHEAT_URL).head(_PREHEAT_URL, timeout=2)
+        print("[http_client] HTTP/2 连接已预热")
+    except Exception:
+        pass
+
+
 def close():
     """关闭所有连接"""
     global _httpx_client, _async_client, _requests_session
@@ -288,13 +508,11 @@ def close():
     if _httpx_client:
         _httpx_client.close()
         _httpx_client = None
+
+    while _host_clients:
+        _, client = _host_clients.popitem()
+        client.close()
     
     if _requests_session:
         _requests_session.close()
         _requests_session = None
-
-
-"""模块加载时自动初始化 - 已禁用，改为在 startup 事件中异步初始化"""
-# 禁用自动初始化，避免启动时阻塞
-# if os.getenv("HTTP_CLIENT_AUTO_INIT", "1") == "1":
-#     init()
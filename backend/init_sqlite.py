@@ -10,7 +10,7 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from backend.database import init_db, engine, DATABASE_URL
+from backend.database import init_db, make_engine, DATABASE_URL
 
 def main():
     print("=" * 50)
@@ -39,7 +39,8 @@ def main():
     try:
         # 初始化数据库（创建所有表）
         print("\n正在创建数据库表...")
-        init_db()
+        # force=True：跳过 schema 指纹，总是补建缺失的表
+        init_db(bind=make_engine(pool=False), force=True)
         print("[成功] 数据库表创建成功！")
         
         # 验证数据库文件
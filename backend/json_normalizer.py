@@ -8,9 +8,54 @@
 3. 支持多种表达方式（中文/英文、嵌套/扁平）
 """
 
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 import re
 
+_CONTAINER_TYPES = (dict, list)
+"""经历字符串中括号（全角/半角）内的日期"""
+_DATE_PAREN_RE = re.compile(r'[\uff08\(]([^\uff09\)]+)[\uff09\)]')
+
+
+@lru_cache(maxsize=1024)
+def _key_forms(key: str) -> Tuple[str, str]:
+    """
+    字段名的小写形式和去掉分隔符的紧凑形式
+    同一批字段名在每个条目里反复出现，缓存后每个字段名只做一次 lower/replace
+    """
+    key_lower = key.lower()
+    return key_lower, key_lower.replace('_', '').replace('-', '').replace(' ', '')
+
+
+def _keyword_re(*keywords: str) -> "re.Pattern[str]":
+    """子串关键字合并为一条预编译正则，替代 any(k in key for k in ...)"""
+    return re.compile('|'.join(map(re.escape, keywords)))
+
+
+"""
+开源经历字段关键字（按匹配优先级）
+"""
+_OS_NAME_RE = _keyword_re('项目', 'project', '名称', 'name')
+_OS_ROLE_RE = _keyword_re('角色', 'role', '描述', 'description')
+_OS_REPO_RE = _keyword_re('repo', '仓库', 'url', 'link')
+_OS_DATE_RE = _keyword_re('时间', 'duration', 'period')
+_OS_ITEMS_RE = _keyword_re('贡献', 'contribution', 'item')
+
+"""
+工作/实习/教育经历字段名（去掉分隔符后精确匹配）
+"""
+_EXP_COMPANY_KEYS = frozenset({'公司', 'company', '单位', '公司名称', 'companyname'})
+_EXP_POSITION_KEYS = frozenset({'职位', 'position', '岗位', 'jobtitle'})
+_EXP_DURATION_KEYS = frozenset({'时间', 'duration', 'period', '工作时间'})
+_EXP_LOCATION_KEYS = frozenset({'地点', 'location', '地址'})
+_EXP_ACHIEVEMENTS_RE = _keyword_re('成就', '职责', 'achievement', 'responsibility')
+
+_EDU_TITLE_KEYS = frozenset({'学校', 'school', 'university', '院校', 'schoolname', 'universityname'})
+_EDU_SUBTITLE_KEYS = frozenset({'专业', 'major', '学科'})
+_EDU_DEGREE_KEYS = frozenset({'学历', 'degree', '学位'})
+_EDU_DATE_KEYS = frozenset({'时间', 'duration', 'date', '时间段', 'daterange'})
+_EDU_DETAILS_KEYS = frozenset({'描述', 'description', '详情', 'detail', '补充说明'})
+
 
 class ResumeNormalizer:
     """
@@ -62,6 +107,27 @@ class ResumeNormalizer:
                 r'获奖', r'荣誉', r'奖项', r'award', r'honor'
             ],
         }
+        """
+        每个语义类型的模式合并成一条预编译正则，按类型顺序匹配（保持原有优先级）
+        """
+        self._semantic_regexes = [
+            (semantic_type, re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE))
+            for semantic_type, patterns in self.semantic_patterns.items()
+        ]
+        """
+        字段名集合有限且高度重复，按实例缓存识别结果
+        """
+        self._identify_semantic_type = lru_cache(maxsize=1024)(self._match_semantic_type)
+        """
+        需要重塑结构的字段：按语义类型查表，合并完重复字段后每个字段只标准化一次
+        """
+        self._standardizers = {
+            'openSource': self._standardize_opensource,
+            'internships': self._standardize_experience_list,
+            'experience': self._standardize_experience_list,
+            'projects': self._standardize_projects,
+            'education': self._standardize_education,
+        }
     
     def normalize(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -79,7 +145,21 @@ class ResumeNormalizer:
         """
         第一步：递归遍历所有字段，识别语义
         """
-        self._extract_fields(data, normalized, contact_info)
+        collisions: Dict[str, List[Any]] = {}
+        self._extract_fields(data, normalized, contact_info, collisions)
+        
+        """
+        同一语义字段出现多次时，先收集再一次性合并，避免反复拼接字符串/列表
+        """
+        for semantic_type, values in collisions.items():
+            normalized[semantic_type] = self._merge_values(values)
+        
+        """
+        合并后的原始值再标准化结构（先标准化再合并会改变重复/类型不一致字段的结果）
+        """
+        for semantic_type, standardize in self._standardizers.items():
+            if semantic_type in normalized:
+                normalized[semantic_type] = standardize(normalized[semantic_type])
         
         """
         第二步：合并联系信息
@@ -88,9 +168,16 @@ class ResumeNormalizer:
             normalized['contact'] = contact_info
         
         """
-        第三步：标准化特定字段的结构
+        第三步：实习经历需要整体修正（合并孤立条目），只能在全部收集完后做
         """
-        normalized = self._standardize_structure(normalized)
+        if 'internships' in normalized:
+            try:
+                from backend.chunk_processor import _fix_internship_entries
+            except ImportError:
+                from chunk_processor import _fix_internship_entries
+            normalized['internships'] = _fix_internship_entries(
+                normalized['internships']
+            )
         
         return normalized
     
@@ -99,6 +186,7 @@ class ResumeNormalizer:
         data: Any, 
         normalized: Dict[str, Any], 
         contact_info: Dict[str, Any],
+        collisions: Dict[str, List[Any]],
         parent_key: str = ''
     ):
         """
@@ -125,19 +213,18 @@ class ResumeNormalizer:
                             """
                             如果是嵌套对象，继续提取
                             """
-                            self._extract_fields(value, normalized, contact_info, key)
+                            self._extract_fields(value, normalized, contact_info, collisions, key)
                     else:
                         """
-                        其他字段：直接映射
+                        其他字段：直接映射（重复出现时合并）
                         """
                         if semantic_type in normalized:
                             """
-                            字段已存在，合并
+                            字段已存在，记下待合并的值（normalize 结束前统一合并）
                             """
-                            normalized[semantic_type] = self._merge_values(
-                                normalized[semantic_type],
-                                value
-                            )
+                            collisions.setdefault(
+                                semantic_type, [normalized[semantic_type]]
+                            ).append(value)
                         else:
                             normalized[semantic_type] = value
                 else:
@@ -149,7 +236,7 @@ class ResumeNormalizer:
                         特殊处理：基本信息对象
                         """
                         if isinstance(value, dict):
-                            self._extract_fields(value, normalized, contact_info, key)
+                            self._extract_fields(value, normalized, contact_info, collisions, key)
                     else:
                         """
                         保持原样，但递归处理值
@@ -167,11 +254,11 @@ class ResumeNormalizer:
             """
             for item in data:
                 if isinstance(item, dict):
-                    self._extract_fields(item, normalized, contact_info, parent_key)
+                    self._extract_fields(item, normalized, contact_info, collisions, parent_key)
     
-    def _identify_semantic_type(self, field_name: str) -> Optional[str]:
+    def _match_semantic_type(self, field_name: str) -> Optional[str]:
         """
-        识别字段的语义类型
+        识别字段的语义类型（未缓存版本，经 _identify_semantic_type 调用）
         
         Args:
             field_name: 字段名
@@ -181,115 +268,63 @@ class ResumeNormalizer:
         """
         field_lower = field_name.lower().strip()
         
-        for semantic_type, patterns in self.semantic_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, field_lower, re.IGNORECASE):
-                    return semantic_type
+        for semantic_type, regex in self._semantic_regexes:
+            if regex.search(field_lower):
+                return semantic_type
         
         return None
     
-    def _merge_values(self, existing: Any, new: Any) -> Any:
+    def _merge_values(self, values: List[Any]) -> Any:
         """
-        合并两个值
+        按出现顺序合并同一字段的多个值：列表拼接、字典覆盖更新、字符串换行连接；
+        类型不同时保留新值，因此结果只取决于末尾连续同类型的那一段
         """
-        if isinstance(existing, list) and isinstance(new, list):
-            return existing + new
-        elif isinstance(existing, dict) and isinstance(new, dict):
-            merged = existing.copy()
-            merged.update(new)
-            return merged
-        elif isinstance(existing, str) and isinstance(new, str):
-            return f"{existing}\n{new}"
+        last = values[-1]
+        for kind in (list, dict, str):
+            if isinstance(last, kind):
+                break
         else:
-            """
-            类型不同，保留新值
-            """
-            return new
+            return last
+        
+        start = len(values) - 1
+        while start > 0 and isinstance(values[start - 1], kind):
+            start -= 1
+        run = values[start:]
+        if len(run) == 1:
+            return last
+        if kind is list:
+            return [item for value in run for item in value]
+        if kind is dict:
+            merged = {}
+            for value in run:
+                merged.update(value)
+            return merged
+        return '\n'.join(run)
     
     def _process_nested_dict(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         处理嵌套字典
+        不含嵌套容器的叶子字典直接共享原对象，不再逐键复制
         """
-        result = {}
-        for key, value in data.items():
-            if isinstance(value, dict):
-                result[key] = self._process_nested_dict(value)
-            elif isinstance(value, list):
-                result[key] = self._process_list(value)
-            else:
-                result[key] = value
-        return result
+        if not any(isinstance(value, _CONTAINER_TYPES) for value in data.values()):
+            return data
+        return {key: self._process_value(value) for key, value in data.items()}
     
     def _process_list(self, data: List[Any]) -> List[Any]:
         """
-        处理列表
+        处理列表（叶子列表同样直接共享）
         """
-        result = []
-        for item in data:
-            if isinstance(item, dict):
-                result.append(self._process_nested_dict(item))
-            elif isinstance(item, list):
-                result.append(self._process_list(item))
-            else:
-                result.append(item)
-        return result
+        if not any(isinstance(item, _CONTAINER_TYPES) for item in data):
+            return data
+        return [self._process_value(item) for item in data]
+    
+    def _process_value(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return self._process_nested_dict(value)
+        if isinstance(value, list):
+            return self._process_list(value)
+        return value
     
-    def _standardize_structure(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        标准化特定字段的结构
-        确保符合 LaTeX 模板的期望
-        """
-        standardized = data.copy()
-
-        """
-        标准化开源经历
-        """
-        if 'openSource' in standardized:
-            standardized['openSource'] = self._standardize_opensource(
-                standardized['openSource']
-            )
-
-        """
-        标准化实习经历
-        """
-        if 'internships' in standardized:
-            standardized['internships'] = self._standardize_experience_list(
-                standardized['internships']
-            )
-            try:
-                from backend.chunk_processor import _fix_internship_entries
-            except ImportError:
-                from chunk_processor import _fix_internship_entries
-            standardized['internships'] = _fix_internship_entries(
-                standardized['internships']
-            )
-
-        """
-        标准化工作经历
-        """
-        if 'experience' in standardized:
-            standardized['experience'] = self._standardize_experience_list(
-                standardized['experience']
-            )
-
-        """
-        标准化项目经验
-        """
-        if 'projects' in standardized:
-            standardized['projects'] = self._standardize_projects(
-                standardized['projects']
-            )
-
-        """
-        标准化教育经历
-        """
-        if 'education' in standardized:
-            standardized['education'] = self._standardize_education(
-                standardized['education']
-            )
-
-        return standardized
-
     def _standardize_opensource(self, data: Any) -> List[Dict[str, Any]]:
         """
         标准化开源经历
@@ -307,26 +342,26 @@ class ResumeNormalizer:
 
                 # 处理字段映射
                 for key, value in item.items():
-                    key_lower = key.lower()
+                    key_lower = _key_forms(key)[0]
 
                     # 项目名称映射
-                    if key_lower == 'title' or any(k in key_lower for k in ['项目', 'project', '名称', 'name']):
+                    if key_lower == 'title' or _OS_NAME_RE.search(key_lower):
                         standardized_item['name'] = value
                     # 角色映射
-                    elif key_lower == 'subtitle' or any(k in key_lower for k in ['角色', 'role', '描述', 'description']):
+                    elif key_lower == 'subtitle' or _OS_ROLE_RE.search(key_lower):
                         # 如果items为空，将subtitle作为description
                         if not item.get('items') and not item.get('description'):
                             standardized_item['description'] = value
                         else:
                             standardized_item['role'] = value
                     # 仓库链接映射
-                    elif key_lower == 'repourl' or any(k in key_lower for k in ['repo', '仓库', 'url', 'link']):
+                    elif key_lower == 'repourl' or _OS_REPO_RE.search(key_lower):
                         standardized_item['repo'] = value
                     # 时间映射
-                    elif key_lower == 'date' or any(k in key_lower for k in ['时间', 'duration', 'period']):
+                    elif key_lower == 'date' or _OS_DATE_RE.search(key_lower):
                         standardized_item['date'] = value
                     # 贡献列表：同时保留 items 数组和 description 文本
-                    elif key_lower == 'items' or any(k in key_lower for k in ['贡献', 'contribution', 'item']):
+                    elif key_lower == 'items' or _OS_ITEMS_RE.search(key_lower):
                         if isinstance(value, list):
                             # 保留原始 items 数组（供前端 join('\n') 使用）
                             standardized_item['items'] = value
@@ -368,8 +403,7 @@ class ResumeNormalizer:
                 提取标准字段
                 """
                 for key, value in item.items():
-                    key_lower = key.lower()
-                    key_compact = key_lower.replace('_', '').replace('-', '').replace(' ', '')
+                    key_lower, key_compact = _key_forms(key)
                     
                     # 保留 title/subtitle/date 字段（internships 格式）
                     if key_lower == 'title':
@@ -379,15 +413,15 @@ class ResumeNormalizer:
                     elif key_lower == 'date':
                         standardized_item['date'] = value
                     # 映射 company/position/duration（experience 格式）
-                    elif key_compact in ['公司', 'company', '单位', '公司名称', 'companyname']:
+                    elif key_compact in _EXP_COMPANY_KEYS:
                         standardized_item['company'] = value
-                    elif key_compact in ['职位', 'position', '岗位', 'jobtitle']:
+                    elif key_compact in _EXP_POSITION_KEYS:
                         standardized_item['position'] = value
-                    elif key_compact in ['时间', 'duration', 'period', '工作时间']:
+                    elif key_compact in _EXP_DURATION_KEYS:
                         standardized_item['duration'] = value
-                    elif key_compact in ['地点', 'location', '地址']:
+                    elif key_compact in _EXP_LOCATION_KEYS:
                         standardized_item['location'] = value
-                    elif any(k in key_lower for k in ['成就', '职责', 'achievement', 'responsibility']):
+                    elif _EXP_ACHIEVEMENTS_RE.search(key_lower):
                         if isinstance(value, list):
                             standardized_item['achievements'] = value
                         else:
@@ -446,23 +480,22 @@ class ResumeNormalizer:
                 standardized_item = {}
                 
                 for key, value in item.items():
-                    key_lower = key.lower()
-                    key_compact = key_lower.replace('_', '').replace('-', '').replace(' ', '')
+                    key_lower, key_compact = _key_forms(key)
 
                     # 处理 title 字段（学校名称），只接受明确字段，避免 schoolNameFontSize 被误判
-                    if key_lower == 'title' or key_compact in ['学校', 'school', 'university', '院校', 'schoolname', 'universityname']:
+                    if key_lower == 'title' or key_compact in _EDU_TITLE_KEYS:
                         standardized_item['title'] = value
                     # 处理 subtitle 字段（专业）
-                    elif key_lower == 'subtitle' or key_compact in ['专业', 'major', '学科']:
+                    elif key_lower == 'subtitle' or key_compact in _EDU_SUBTITLE_KEYS:
                         standardized_item['subtitle'] = value
                     # 处理 degree 字段（学位）
-                    elif key_lower == 'degree' or key_compact in ['学历', 'degree', '学位']:
+                    elif key_lower == 'degree' or key_compact in _EDU_DEGREE_KEYS:
                         standardized_item['degree'] = value
                     # 处理 date 字段（时间）
-                    elif key_lower == 'date' or key_compact in ['时间', 'duration', 'date', '时间段', 'daterange']:
+                    elif key_lower == 'date' or key_compact in _EDU_DATE_KEYS:
                         standardized_item['date'] = value
                     # 处理 details 字段
-                    elif key_lower == 'details' or key_compact in ['描述', 'description', '详情', 'detail', '补充说明']:
+                    elif key_lower == 'details' or key_compact in _EDU_DETAILS_KEYS:
                         standardized_item['details'] = value
                     else:
                         standardized_item[key] = value
@@ -486,8 +519,7 @@ class ResumeNormalizer:
         """
         尝试提取日期（括号内的内容）
         """
-        date_pattern = r'[\uff08\(]([^\uff09\)]+)[\uff09\)]'
-        date_match = re.search(date_pattern, text)
+        date_match = _DATE_PAREN_RE.search(text)
         
         if date_match:
             result['duration'] = date_match.group(1)
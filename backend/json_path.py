@@ -4,71 +4,75 @@ JSON Path 工具
 支持 a.b[0].c 形式的 JSON 路径操作。
 提供解析、读取、设置、删除等功能。
 """
-from typing import Any, Dict, List, Tuple, Union
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Union
 
+PathPart = Union[str, int]
+"""解析后的路径片段；parse_path 返回不可变元组，缓存结果可被多个调用方共享"""
+PathParts = Tuple[PathPart, ...]
 
-def parse_path(path: str) -> List[Union[str, int]]:
+"""查找未命中时的哨兵值（None 可能是合法的节点值）"""
+_MISSING = object()
+
+"""set_by_path 做同值短路比较的类型：相等判断廉价，且不会因类型不同而误判（True == 1）"""
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+@lru_cache(maxsize=1024)
+def parse_path(path: str) -> PathParts:
     """
-    将字符串路径解析为片段列表
+    将字符串路径解析为片段元组
     
     Args:
         path: JSON 路径字符串
     
     Returns:
-        解析后的路径片段列表
+        解析后的路径片段元组（结果会被缓存共享，不可修改）
     
     Examples:
         >>> parse_path("basic.name")
-        ['basic', 'name']
+        ('basic', 'name')
         >>> parse_path("education[0].school")
-        ['education', 0, 'school']
+        ('education', 0, 'school')
         >>> parse_path("experience[0].achievements[1]")
-        ['experience', 0, 'achievements', 1]
+        ('experience', 0, 'achievements', 1)
     """
+    return tuple(_parse_path_uncached(path))
+
+
+"""
+路径分词：[...] 为索引（内容去空白后需为整数），其余连续的非 '.'/'[' 字符为键；
+'.' 只作分隔不产生片段。孤立的 '[' 说明缺少闭合 ']'
+"""
+_PATH_TOKEN_RE = re.compile(r'\[([^\]]*)\]|([^.\[]+)|(\[)')
+
+
+def _parse_path_uncached(path: str) -> List[PathPart]:
+    """parse_path 的实际分词逻辑（同一批路径反复出现，由 parse_path 缓存结果）"""
     if not path or not path.strip():
         return []
     
-    parts: List[Union[str, int]] = []
-    buf = ""
-    i = 0
-    
-    while i < len(path):
-        ch = path[i]
-        
-        if ch == '.':
-            if buf:
-                parts.append(buf)
-                buf = ""
-            i += 1
-            continue
-        
-        if ch == '[':
-            if buf:
-                parts.append(buf)
-                buf = ""
-            j = path.find(']', i)
-            if j == -1:
-                raise ValueError(f"路径解析失败：缺少闭合 ']'，路径: {path}")
-            idx_str = path[i + 1:j].strip()
-            if not idx_str.lstrip('-').isdigit():
-                raise ValueError(f"索引需为整数，但收到: {idx_str}")
-            parts.append(int(idx_str))
-            i = j + 1
+    parts: List[PathPart] = []
+    for m in _PATH_TOKEN_RE.finditer(path):
+        key = m.group(2)
+        if key is not None:
+            parts.append(key)
             continue
-        
-        buf += ch
-        i += 1
-    
-    if buf:
-        parts.append(buf)
+        if m.group(3) is not None:
+            raise ValueError(f"路径解析失败：缺少闭合 ']'，路径: {path}")
+        idx_str = m.group(1).strip()
+        if not idx_str.lstrip('-').isdigit():
+            raise ValueError(f"索引需为整数，但收到: {idx_str}")
+        parts.append(int(idx_str))
     
     return parts
 
 
 def get_by_path(
     obj: Union[Dict, List], 
-    path: Union[str, List[Union[str, int]]]
-) -> Tuple[Any, Union[str, int], Any]:
+    path: Union[str, Sequence[PathPart]]
+) -> Tuple[Any, PathPart, Any]:
     """
     读取指定路径的值
     
@@ -94,6 +98,8 @@ def get_by_path(
     parent = None
     key = None
     
+    # 容器类型仍需显式校验（字符串/元组也支持下标），越界和缺键则直接取值、失败时再报错，
+    # 成功路径上省掉 len() 和 in 的二次查找
     for p in parts:
         parent = cur
         key = p
@@ -101,24 +107,25 @@ def get_by_path(
         if isinstance(p, int):
             if not isinstance(cur, list):
                 raise ValueError(f"期望列表类型，但实际是 {type(cur).__name__}")
-            if p < 0:
-                p = len(cur) + p  # 支持负索引
-            if p < 0 or p >= len(cur):
-                raise ValueError(f"列表索引越界: {p}，列表长度: {len(cur)}")
-            cur = cur[p]
+            try:
+                cur = cur[p]  # 原生支持负索引
+            except IndexError:
+                idx = p + len(cur) if p < 0 else p
+                raise ValueError(f"列表索引越界: {idx}，列表长度: {len(cur)}") from None
         else:
             if not isinstance(cur, dict):
                 raise ValueError(f"期望字典类型，但实际是 {type(cur).__name__}")
-            if p not in cur:
-                raise ValueError(f"字典键不存在: '{p}'")
-            cur = cur[p]
+            try:
+                cur = cur[p]
+            except KeyError:
+                raise ValueError(f"字典键不存在: '{p}'") from None
     
     return parent, key, cur
 
 
 def set_by_path(
     obj: Union[Dict, List], 
-    path: Union[str, List[Union[str, int]]], 
+    path: Union[str, Sequence[PathPart]], 
     value: Any
 ) -> Union[Dict, List]:
     """
@@ -143,33 +150,45 @@ def set_by_path(
     if not parts:
         raise ValueError("路径不能为空")
     
+    # 标量值与现有值相同时直接返回，跳过建节点与写入（重复渲染、无改动编辑很常见）
+    if isinstance(value, _SCALAR_TYPES):
+        current = _walk_path(obj, parts)
+        if current is value or (type(current) is type(value) and current == value):
+            return obj
+    
     # 遍历到倒数第二层，自动创建中间节点
     cur = obj
-    for i, p in enumerate(parts[:-1]):
-        next_part = parts[i + 1]
+    last = len(parts) - 1
+    for i in range(last):
+        p = parts[i]
+        # 下一段决定新建的中间节点类型
+        make_node = dict if isinstance(parts[i + 1], str) else list
         
         if isinstance(p, int):
             if not isinstance(cur, list):
                 raise ValueError(f"期望列表，但实际是 {type(cur).__name__}")
-            # 确保索引有效
-            while len(cur) <= p:
-                cur.append({} if isinstance(next_part, str) else [])
+            # 确保索引有效：一次性补齐，每个占位节点各自独立
+            need = p + 1 - len(cur)
+            if need > 0:
+                cur.extend([make_node() for _ in range(need)])
             cur = cur[p]
         else:
             if not isinstance(cur, dict):
                 raise ValueError(f"期望字典，但实际是 {type(cur).__name__}")
             # 自动创建中间节点
-            if p not in cur:
-                cur[p] = {} if isinstance(next_part, str) else []
-            cur = cur[p]
+            child = cur.get(p, _MISSING)
+            if child is _MISSING:
+                child = cur[p] = make_node()
+            cur = child
     
     # 设置最终值
-    final_key = parts[-1]
+    final_key = parts[last]
     if isinstance(final_key, int):
         if not isinstance(cur, list):
             raise ValueError(f"期望列表，但实际是 {type(cur).__name__}")
-        while len(cur) <= final_key:
-            cur.append(None)
+        need = final_key + 1 - len(cur)
+        if need > 0:
+            cur.extend([None] * need)
         cur[final_key] = value
     else:
         if not isinstance(cur, dict):
@@ -181,7 +200,7 @@ def set_by_path(
 
 def delete_by_path(
     obj: Union[Dict, List], 
-    path: Union[str, List[Union[str, int]]]
+    path: Union[str, Sequence[PathPart]]
 ) -> Any:
     """
     删除指定路径的值
@@ -216,9 +235,38 @@ def delete_by_path(
     return old_value
 
 
+def _walk_path(obj: Union[Dict, List], path: Union[str, Sequence[PathPart]]) -> Any:
+    """
+    与 get_by_path 相同的取值规则，但不存在时返回 _MISSING 而不抛异常，
+    探测大量可能不存在的路径时省掉构造错误信息和异常栈的开销
+    """
+    if isinstance(path, str):
+        try:
+            path = parse_path(path)
+        except ValueError:
+            return _MISSING
+    
+    cur = obj
+    for p in path:
+        if isinstance(p, int):
+            if not isinstance(cur, list):
+                return _MISSING
+            try:
+                cur = cur[p]
+            except IndexError:
+                return _MISSING
+        else:
+            if not isinstance(cur, dict):
+                return _MISSING
+            cur = cur.get(p, _MISSING)
+            if cur is _MISSING:
+                return _MISSING
+    return cur
+
+
 def exists_path(
     obj: Union[Dict, List], 
-    path: Union[str, List[Union[str, int]]]
+    path: Union[str, Sequence[PathPart]]
 ) -> bool:
     """
     检查路径是否存在
@@ -230,16 +278,12 @@ def exists_path(
     Returns:
         路径是否存在
     """
-    try:
-        get_by_path(obj, path)
-        return True
-    except ValueError:
-        return False
+    return _walk_path(obj, path) is not _MISSING
 
 
 def get_or_default(
     obj: Union[Dict, List], 
-    path: Union[str, List[Union[str, int]]],
+    path: Union[str, Sequence[PathPart]],
     default: Any = None
 ) -> Any:
     """
@@ -253,11 +297,43 @@ def get_or_default(
     Returns:
         路径对应的值或默认值
     """
-    try:
-        _, _, value = get_by_path(obj, path)
-        return value
-    except ValueError:
-        return default
+    value = _walk_path(obj, path)
+    return default if value is _MISSING else value
+
+
+def _child_paths(node: Union[Dict, List], prefix: str) -> Iterator[Tuple[str, Any]]:
+    """逐个产出子节点的 (路径, 值)"""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield (f"{prefix}.{key}" if prefix else key), value
+    else:
+        for i, value in enumerate(node):
+            yield f"{prefix}[{i}]", value
+
+
+def iter_paths(obj: Union[Dict, List], prefix: str = "") -> Iterator[str]:
+    """
+    按深度优先先序逐个产出对象中的所有路径（顺序与递归展开一致）
+    用显式栈保存各层的子节点迭代器，不递归、不构造每层的中间列表
+    
+    Args:
+        obj: 数据对象
+        prefix: 路径前缀
+    
+    Yields:
+        路径字符串
+    """
+    if not isinstance(obj, (dict, list)):
+        return
+    stack = [_child_paths(obj, prefix)]
+    while stack:
+        for path, value in stack[-1]:
+            yield path
+            if isinstance(value, (dict, list)):
+                stack.append(_child_paths(value, path))
+                break
+        else:
+            stack.pop()
 
 
 def list_paths(obj: Union[Dict, List], prefix: str = "") -> List[str]:
@@ -271,23 +347,7 @@ def list_paths(obj: Union[Dict, List], prefix: str = "") -> List[str]:
     Returns:
         所有路径的列表
     """
-    paths = []
-    
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            current_path = f"{prefix}.{key}" if prefix else key
-            paths.append(current_path)
-            if isinstance(value, (dict, list)):
-                paths.extend(list_paths(value, current_path))
-    
-    elif isinstance(obj, list):
-        for i, value in enumerate(obj):
-            current_path = f"{prefix}[{i}]"
-            paths.append(current_path)
-            if isinstance(value, (dict, list)):
-                paths.extend(list_paths(value, current_path))
-    
-    return paths
+    return list(iter_paths(obj, prefix))
 
 
 # 简历数据结构的常用路径映射
@@ -314,6 +374,18 @@ RESUME_PATH_ALIASES = {
 }
 
 
+"""
+别名前缀预编译为一条正则（长别名优先，后面必须是结尾、'.' 或 '['），
+并预先解析每个别名对应的路径片段
+"""
+_ALIAS_RE = re.compile(
+    '^(' + '|'.join(map(re.escape, sorted(RESUME_PATH_ALIASES, key=len, reverse=True))) + r')(?=$|[.\[])'
+)
+_ALIAS_PARTS: Dict[str, PathParts] = {
+    alias: parse_path(real_path) for alias, real_path in RESUME_PATH_ALIASES.items()
+}
+
+
 def resolve_alias(path: str) -> str:
     """
     解析路径别名
@@ -324,13 +396,25 @@ def resolve_alias(path: str) -> str:
     Returns:
         解析后的实际路径
     """
-    # 检查是否是完整别名
-    if path in RESUME_PATH_ALIASES:
-        return RESUME_PATH_ALIASES[path]
+    m = _ALIAS_RE.match(path)
+    if m is None:
+        return path
+    return RESUME_PATH_ALIASES[m.group(1)] + path[m.end():]
+
+
+def resolve_alias_parsed(path: str) -> PathParts:
+    """
+    解析路径别名并直接返回路径片段，可直接传给 get_by_path / set_by_path
     
-    # 检查路径开头是否是别名
-    for alias, real_path in RESUME_PATH_ALIASES.items():
-        if path.startswith(alias + ".") or path.startswith(alias + "["):
-            return path.replace(alias, real_path, 1)
+    Args:
+        path: 路径（可能包含别名）
     
-    return path
+    Returns:
+        解析后的路径片段元组
+    """
+    m = _ALIAS_RE.match(path)
+    if m is None:
+        return parse_path(path)
+    tail = path[m.end():]
+    parts = _ALIAS_PARTS[m.group(1)]
+    return parts + parse_path(tail) if tail else parts
@@ -2,17 +2,47 @@
 LaTeX 直接编译模块
 使用 slager 原版样式编译用户上传的 LaTeX 文件
 """
+import hashlib
+import re
 import subprocess
 import tempfile
 import shutil
+import threading
+from collections import OrderedDict
+from itertools import islice
 from pathlib import Path
 from typing import Optional
 from io import BytesIO
 
 try:
-    from .latex_utils import resolve_xelatex_executable, subprocess_env_with_xelatex_bin
+    from .latex_utils import (
+        LATEX_TEMPLATE_DIR,
+        resolve_xelatex_executable,
+        stage_latex_template,
+        subprocess_env_with_xelatex_bin,
+    )
 except ImportError:
-    from latex_utils import resolve_xelatex_executable, subprocess_env_with_xelatex_bin
+    from latex_utils import (
+        LATEX_TEMPLATE_DIR,
+        resolve_xelatex_executable,
+        stage_latex_template,
+        subprocess_env_with_xelatex_bin,
+    )
+
+
+"""
+编译结果缓存（按源码哈希，LRU）
+xelatex 每次冷启动都要加载格式和字体，无法常驻复用：一个 TeX 进程只能排版一篇文档，
+XeTeX 也不能把 fontspec 加载的字体 dump 进预编译格式（resume.cls 在类文件里就加载了字体）。
+编辑器预览会反复提交相同源码，直接复用结果可以完全省掉这部分开销
+"""
+_RAW_PDF_CACHE_MAX_SIZE = 32
+_raw_pdf_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_raw_pdf_cache_lock = threading.Lock()
+
+"""xelatex 输出中的关键错误行；直接在未解码的字节输出上扫描"""
+_LATEX_ERROR_LINE_RE = re.compile(rb'(?m)^.*(?:!|Error|error|Undefined).*$')
+_LATEX_ERROR_MAX_LINES = 20
 
 
 def compile_latex_raw(latex_content: str) -> BytesIO:
@@ -26,13 +56,28 @@ def compile_latex_raw(latex_content: str) -> BytesIO:
     返回:
         PDF 文件的 BytesIO 对象
     """
+    cache_key = hashlib.sha256(latex_content.encode('utf-8')).hexdigest()
+    with _raw_pdf_cache_lock:
+        pdf_bytes = _raw_pdf_cache.get(cache_key)
+        if pdf_bytes is not None:
+            _raw_pdf_cache.move_to_end(cache_key)
+    if pdf_bytes is not None:
+        print(f"[LaTeX 编译] 缓存命中，PDF 大小: {len(pdf_bytes)} 字节")
+        return BytesIO(pdf_bytes)
+
+    pdf_bytes = _compile_latex_raw_uncached(latex_content)
+    with _raw_pdf_cache_lock:
+        _raw_pdf_cache[cache_key] = pdf_bytes
+        _raw_pdf_cache.move_to_end(cache_key)
+        while len(_raw_pdf_cache) > _RAW_PDF_CACHE_MAX_SIZE:
+            _raw_pdf_cache.popitem(last=False)
+    return BytesIO(pdf_bytes)
+
+
+def _compile_latex_raw_uncached(latex_content: str) -> bytes:
+    """调用 xelatex 编译，返回 PDF 字节"""
     # 获取 slager 原版模板目录
-    current_dir = Path(__file__).resolve().parent
-    root_dir = current_dir.parent
-    template_dir = root_dir / "latex-resume-template"
-    
-    if not template_dir.exists():
-        raise RuntimeError("latex-resume-template 模板目录不存在")
+    template_dir = LATEX_TEMPLATE_DIR
     
     if not template_dir.exists():
         raise RuntimeError(f"LaTeX 模板目录不存在: {template_dir}")
@@ -41,21 +86,8 @@ def compile_latex_raw(latex_content: str) -> BytesIO:
     temp_dir = tempfile.mkdtemp()
     
     try:
-        # 复制所有模板文件
-        template_files = [
-            'resume.cls', 'fontawesome.sty', 'linespacing_fix.sty',
-            'zh_CN-Adobefonts_external.sty', 'zh_CN-Adobefonts_internal.sty'
-        ]
-        for file_name in template_files:
-            src_file = template_dir / file_name
-            if src_file.exists():
-                dest_file = Path(temp_dir) / file_name
-                shutil.copy2(src_file, dest_file)
-        
-        # 复制字体目录
-        fonts_dir = template_dir / 'fonts'
-        if fonts_dir.exists():
-            shutil.copytree(fonts_dir, Path(temp_dir) / 'fonts', dirs_exist_ok=True)
+        # 链接模板文件和字体目录
+        stage_latex_template(template_dir, temp_dir)
         
         # 写入 LaTeX 文件
         tex_file = Path(temp_dir) / 'resume.tex'
@@ -93,22 +125,22 @@ LaTeX (XeLaTeX) 未安装。请运行以下命令安装：
             compile_cmd,
             cwd=temp_dir,
             capture_output=True,
-            text=True,
             timeout=180,
             env=_latex_env,
         )
         
         if result.returncode != 0:
-            # 提取有用的错误信息
-            error_lines = []
-            for line in result.stdout.split('\n'):
-                if '!' in line or 'Error' in line or 'error' in line or 'Undefined' in line:
-                    error_lines.append(line)
-            # 如果找到关键错误行，使用它们；否则使用最后500字符
+            # 输出按字节接收，只有失败时才解码
+            stdout = result.stdout or b''
+            # 提取有用的错误信息（最多20行关键错误）
+            error_lines = [
+                m.group() for m in islice(_LATEX_ERROR_LINE_RE.finditer(stdout), _LATEX_ERROR_MAX_LINES)
+            ]
+            # 如果找到关键错误行，使用它们；否则使用最后1000字节
             if error_lines:
-                error_msg = '\n'.join(error_lines[:20])  # 最多20行关键错误
+                error_msg = b'\n'.join(error_lines).decode('utf-8', errors='replace')
             else:
-                error_msg = result.stdout[-1000:] if len(result.stdout) > 1000 else result.stdout
+                error_msg = stdout[-1000:].decode('utf-8', errors='replace')
             print(f"[LaTeX 编译] 错误: {error_msg}")
             raise RuntimeError(f"LaTeX 编译失败: {error_msg}")
         
@@ -119,10 +151,7 @@ LaTeX (XeLaTeX) 未安装。请运行以下命令安装：
         
         pdf_bytes = pdf_file.read_bytes()
         print(f"[LaTeX 编译] 成功，PDF 大小: {len(pdf_bytes)} 字节")
-        
-        pdf_io = BytesIO(pdf_bytes)
-        pdf_io.seek(0)
-        return pdf_io
+        return pdf_bytes
         
     finally:
         # 清理临时目录
@@ -10,14 +10,23 @@ import shutil
 import time
 import hashlib
 import json
+import threading
 import urllib.request
 import urllib.parse
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, List
 from io import BytesIO
 from datetime import date
 
-from .latex_utils import escape_latex, normalize_resume_data, resolve_xelatex_executable, subprocess_env_with_xelatex_bin
+from .latex_utils import (
+    LATEX_TEMPLATE_DIR,
+    escape_latex,
+    normalize_resume_data,
+    resolve_xelatex_executable,
+    stage_latex_template,
+    subprocess_env_with_xelatex_bin,
+)
 from .latex_sections import SECTION_GENERATORS, DEFAULT_SECTION_ORDER, generate_section_custom
 from .company_logos import download_logos_to_dir
 from .school_logos import download_school_logos_to_dir, is_school_logo_latex_supported
@@ -178,6 +187,22 @@ def _summarize_latex_error(error_msg: str, max_chars: int = 2000) -> str:
     return tail[:max_chars]
 
 
+"""
+交叉引用变化时 xelatex 在日志中留下的重编译提示。
+hyperref 书签的 "Rerun to get outlines right" 不算：新临时目录首遍必然出现，
+按它重编译等于每次都跑两遍，而单页简历不依赖 PDF 书签
+"""
+_LATEX_RERUN_MARKERS = (b"Rerun to get cross-references", b"Rerun LaTeX")
+
+
+def _latex_log_requests_rerun(log_file: Path) -> bool:
+    try:
+        log_bytes = log_file.read_bytes()
+    except OSError:
+        return False
+    return any(marker in log_bytes for marker in _LATEX_RERUN_MARKERS)
+
+
 def _download_user_photo_to_dir(photo_url: str, temp_dir: str) -> str | None:
     """
     下载用户照片到临时目录，固定命名为 photo.<ext>
@@ -262,6 +287,7 @@ def json_to_latex(resume_data: Dict[str, Any], section_order: List[str] = None)
     """
     将简历 JSON 转换为 LaTeX 代码
     支持中文和英文字段名，支持自定义 section 顺序
+    预览时常常反复提交相同内容，结果按内容缓存
     
     参数:
         resume_data: 简历数据字典（中文或英文字段名）
@@ -270,6 +296,62 @@ def json_to_latex(resume_data: Dict[str, Any], section_order: List[str] = None)
     返回:
         LaTeX 代码字符串
     """
+    cache_key = _get_cache_key(resume_data, section_order)
+    latex = _cache_get(_latex_cache, cache_key)
+    if latex is None:
+        latex = _json_to_latex_uncached(resume_data, section_order)
+        _cache_put(_latex_cache, cache_key, latex, _LATEX_CACHE_MAX_SIZE)
+    return latex
+
+
+# 文档头部中与设置无关的固定行，模块加载时构建一次
+_LATEX_HEADER_LINES = (
+    r"% !TEX TS-program = xelatex",
+    r"% !TEX encoding = UTF-8 Unicode",
+    r'% !Mode:: "TeX:UTF-8"',
+    "",
+)
+_LATEX_PREAMBLE_LINES = (
+    # 使用中文字体配置
+    r"\usepackage{zh_CN-Adobefonts_external}",
+    r"\usepackage{linespacing_fix}",
+    r"\usepackage{cite}",
+    r"\usepackage{graphicx}",
+    r"\graphicspath{{logos/}}",
+    # 确保中文字体正确加载和 Unicode 支持
+    r'\XeTeXlinebreaklocale "zh"',
+    r"\XeTeXlinebreakskip = 0pt plus 1pt",
+    # 强制使用 Unicode 编码
+    r'\XeTeXinputencoding "utf8"',
+    r"\pdfstringdefDisableCommands{",
+    r"  \def\raisebox#1#2{#2}",
+    r"  \def\includegraphics#1#2{}",
+    r"  \def\fontsize#1#2{}",
+    r"  \def\selectfont{}",
+    r"  \def\hspace#1{}",
+    r"  \def\normalsize{}",
+    r"  \def\textendash{-}",
+    r"}",
+    "",
+)
+_LATEX_BEGIN_DOCUMENT_LINES = (
+    "",
+    r"\begin{document}",
+    r"\pagenumbering{gobble}",
+    "",
+)
+_LATEX_FONT_SIZES = (9, 10, 11, 12)
+_LATEX_MARGIN_MAP = {
+    'tight': '0.25in',
+    'compact': '0.3in',
+    'standard': '0.4in',
+    'relaxed': '0.5in',
+    'wide': '0.6in',
+}
+
+
+def _json_to_latex_uncached(resume_data: Dict[str, Any], section_order: List[str] = None) -> str:
+    """json_to_latex 的实际转换逻辑"""
     resume_data = _sanitize_resume_for_latex(resume_data)
 
     """标准化 JSON：先尝试通用方法，失败则降级到固定映射"""
@@ -279,11 +361,6 @@ def json_to_latex(resume_data: Dict[str, Any], section_order: List[str] = None)
     except Exception:
         resume_data = normalize_resume_data(resume_data)
     
-    """获取 LaTeX 模板目录路径"""
-    current_dir = Path(__file__).resolve().parent
-    root_dir = current_dir.parent
-    latex_template_dir = root_dir / "latex-resume-template"
-    
     """构建 LaTeX 文档"""
     latex_content = []
     
@@ -292,19 +369,12 @@ def json_to_latex(resume_data: Dict[str, Any], section_order: List[str] = None)
     
     # 字体大小设置 (9, 10, 11, 12)
     font_size = global_settings.get('latexFontSize', 11)
-    if font_size not in [9, 10, 11, 12]:
+    if font_size not in _LATEX_FONT_SIZES:
         font_size = 11
     
     # 页面边距设置
     margin_setting = global_settings.get('latexMargin', 'standard')
-    margin_map = {
-        'tight': '0.25in',
-        'compact': '0.3in',
-        'standard': '0.4in',
-        'relaxed': '0.5in',
-        'wide': '0.6in',
-    }
-    margin = margin_map.get(margin_setting, '0.4in')
+    margin = _LATEX_MARGIN_MAP.get(margin_setting, '0.4in')
     
     # 行间距设置 - 默认 1.0 与原始模板保持一致
     line_spacing = global_settings.get('latexLineSpacing', 1.0)
@@ -317,47 +387,22 @@ def json_to_latex(resume_data: Dict[str, Any], section_order: List[str] = None)
     header_bottom_gap_px = _safe_float(global_settings.get('latexHeaderBottomGapPx'), 0.0, -80.0, 80.0)
     
     """文档头部"""
-    latex_content.append(r"% !TEX TS-program = xelatex")
-    latex_content.append(r"% !TEX encoding = UTF-8 Unicode")
-    latex_content.append(r'% !Mode:: "TeX:UTF-8"')
-    latex_content.append("")
+    append = latex_content.append
+    latex_content.extend(_LATEX_HEADER_LINES)
     # 使用动态字体大小
-    latex_content.append(f"\\documentclass[{font_size}pt]{{resume}}")
-    """使用中文字体配置"""
-    latex_content.append(r"\usepackage{zh_CN-Adobefonts_external}")
-    latex_content.append(r"\usepackage{linespacing_fix}")
-    latex_content.append(r"\usepackage{cite}")
-    latex_content.append(r"\usepackage{graphicx}")
-    latex_content.append(r"\graphicspath{{logos/}}")
-    """确保中文字体正确加载和 Unicode 支持"""
-    latex_content.append(r'\XeTeXlinebreaklocale "zh"')
-    latex_content.append(r"\XeTeXlinebreakskip = 0pt plus 1pt")
-    """强制使用 Unicode 编码"""
-    latex_content.append(r'\XeTeXinputencoding "utf8"')
-    latex_content.append(r"\pdfstringdefDisableCommands{")
-    latex_content.append(r"  \def\raisebox#1#2{#2}")
-    latex_content.append(r"  \def\includegraphics#1#2{}")
-    latex_content.append(r"  \def\fontsize#1#2{}")
-    latex_content.append(r"  \def\selectfont{}")
-    latex_content.append(r"  \def\hspace#1{}")
-    latex_content.append(r"  \def\normalsize{}")
-    latex_content.append(r"  \def\textendash{-}")
-    latex_content.append(r"}")
-    latex_content.append("")
+    append(f"\\documentclass[{font_size}pt]{{resume}}")
+    latex_content.extend(_LATEX_PREAMBLE_LINES)
     # 只有当用户明确设置了非默认值时才覆盖（保持与原始模板一致）
     # 原始模板默认: 11pt 字体, 0.4in 边距, 无 linespread 设置
     if margin_setting != 'standard':
-        latex_content.append(f"\\geometry{{a4paper,left={margin},right={margin},top={margin},bottom={margin},nohead}}")
+        append(f"\\geometry{{a4paper,left={margin},right={margin},top={margin},bottom={margin},nohead}}")
     if line_spacing != 1.0:
-        latex_content.append(f"\\linespread{{{line_spacing}}}")
+        append(f"\\linespread{{{line_spacing}}}")
     
-    latex_content.append("")
-    latex_content.append(r"\begin{document}")
-    latex_content.append(r"\pagenumbering{gobble}")
-    latex_content.append("")
+    latex_content.extend(_LATEX_BEGIN_DOCUMENT_LINES)
 
     if abs(header_top_gap_px) > 0.01:
-        latex_content.append(f"\\vspace*{{{_px_to_pt(header_top_gap_px):.2f}pt}}")
+        append(f"\\vspace*{{{_px_to_pt(header_top_gap_px):.2f}pt}}")
 
     """姓名/联系信息"""
     name = resume_data.get('name') or '姓名'
@@ -420,21 +465,21 @@ def json_to_latex(resume_data: Dict[str, Any], section_order: List[str] = None)
         photo_height_cm = _safe_float(resume_data.get("photoHeightCm"), 3.0, 1.2, 8.0)
         # 右对齐锚点：在图片后追加空白才能改变右边界；x 正值代表向右偏移（与前端输入一致）。
         x_shift_cm = -photo_offset_x
-        latex_content.append(
+        append(
             f"\\noindent\\makebox[\\textwidth][r]{{\\raisebox{{{photo_offset_y:.2f}cm}}[0pt][0pt]{{\\includegraphics[width={photo_width_cm:.2f}cm,height={photo_height_cm:.2f}cm,keepaspectratio]{{photo}}}}\\hspace*{{{x_shift_cm:.2f}cm}}}}"
         )
         # 覆盖浮层不应拉开标题区高度
-        latex_content.append(r"\vspace{-1.1\baselineskip}")
+        append(r"\vspace{-1.1\baselineskip}")
 
-    latex_content.append(f"\\name{{{escape_latex(name)}}}")
-    latex_content.append("")
+    append(f"\\name{{{escape_latex(name)}}}")
+    append("")
     # 姓名与联系信息间距调节：保留有照片时的默认压缩，再叠加用户设置
     if resume_data.get("photo"):
-        latex_content.append(r"\vspace{-0.8ex}")
+        append(r"\vspace{-0.8ex}")
     if abs(header_name_contact_gap_px) > 0.01:
-        latex_content.append(f"\\vspace{{{_px_to_pt(header_name_contact_gap_px):.2f}pt}}")
+        append(f"\\vspace{{{_px_to_pt(header_name_contact_gap_px):.2f}pt}}")
     """contactInfo 格式: {phone}{email}{role}{location}{status}"""
-    latex_content.append(f"\\contactInfo{{{phone}}}{{{email}}}{{{role}}}{{{location}}}{{{employement_status}}}")
+    append(f"\\contactInfo{{{phone}}}{{{email}}}{{{role}}}{{{location}}}{{{employement_status}}}")
     if blog:
         # 博客/GitHub 三档：icon（默认，复用开源经历的 \faGithub）/ text（博客：前缀）/ none（仅 URL）
         blog_mode = _field_mode('blog')
@@ -444,30 +489,36 @@ def json_to_latex(resume_data: Dict[str, Any], section_order: List[str] = None)
             blog_prefix = ''
         else:
             blog_prefix = r'\faGithub\hspace{0.3em}'
-        latex_content.append(f"\\blogLine{{{blog_prefix}}}{{{blog}}}")
+        append(f"\\blogLine{{{blog_prefix}}}{{{blog}}}")
     if abs(header_bottom_gap_px) > 0.01:
-        latex_content.append(f"\\vspace{{{_px_to_pt(header_bottom_gap_px):.2f}pt}}")
-    latex_content.append("")
+        append(f"\\vspace{{{_px_to_pt(header_bottom_gap_px):.2f}pt}}")
+    append("")
     
     """获取自定义模块标题"""
     section_titles = resume_data.get('sectionTitles') or {}
     
     """按顺序生成各 section"""
     order = section_order if section_order else DEFAULT_SECTION_ORDER
+    extend = latex_content.extend
     for section_id in order:
         generator = SECTION_GENERATORS.get(section_id)
         if generator:
-            latex_content.extend(generator(resume_data, section_titles))
+            extend(generator(resume_data, section_titles))
         elif isinstance(section_id, str) and section_id.startswith('custom_'):
-            latex_content.extend(generate_section_custom(resume_data, section_id, section_titles))
+            extend(generate_section_custom(resume_data, section_id, section_titles))
     
     """文档结尾"""
-    latex_content.append(r"\end{document}")
+    append(r"\end{document}")
     
     return "\n".join(latex_content)
 
 
-def compile_latex_to_pdf(latex_content: str, template_dir: Path, resume_data: Dict[str, Any] = None) -> BytesIO:
+def compile_latex_to_pdf(
+    latex_content: str,
+    template_dir: Path,
+    resume_data: Dict[str, Any] = None,
+    max_passes: int = 1,
+) -> BytesIO:
     """
     编译 LaTeX 代码为 PDF（简化版本）
 
@@ -475,6 +526,8 @@ def compile_latex_to_pdf(latex_content: str, template_dir: Path, resume_data: Di
         latex_content: LaTeX 代码字符串
         template_dir: LaTeX 模板目录（包含 resume.cls 等文件）
         resume_data: 简历数据（用于下载 Logo 等资源）
+        max_passes: 最多编译遍数，默认只编译一次；调用方传入更大值时，
+            只有日志提示交叉引用变化才会继续编译下一遍
 
     返回:
         PDF 文件的 BytesIO 对象
@@ -483,23 +536,9 @@ def compile_latex_to_pdf(latex_content: str, template_dir: Path, resume_data: Di
     temp_dir = tempfile.mkdtemp()
 
     try:
-        # 复制所有必要的模板文件
-        template_files = [
-            'resume.cls', 'fontawesome.sty', 'linespacing_fix.sty',
-            'zh_CN-Adobefonts_external.sty', 'zh_CN-Adobefonts_internal.sty'
-        ]
-        for file_name in template_files:
-            src_file = template_dir / file_name
-            if src_file.exists():
-                dest_file = Path(temp_dir) / file_name
-                shutil.copy2(src_file, dest_file)
-            else:
-                print(f"[警告] 文件不存在: {file_name}")
-
-        # 复制字体目录（如果存在）
-        fonts_dir = template_dir / 'fonts'
-        if fonts_dir.exists():
-            shutil.copytree(fonts_dir, Path(temp_dir) / 'fonts', dirs_exist_ok=True)
+        # 链接模板文件和字体目录
+        for file_name in stage_latex_template(template_dir, temp_dir):
+            print(f"[警告] 文件不存在: {file_name}")
 
         # 下载公司 Logo 到临时目录
         local_photo = None
@@ -570,40 +609,43 @@ LaTeX (XeLaTeX) 未安装。请运行以下命令安装：
         compile_cmd = [
             xelatex_path,
             '-interaction=nonstopmode',
+            '-halt-on-error',
             '-output-directory', temp_dir,
             str(tex_file)
         ]
 
-        # 只编译一次；Windows MiKTeX 首次运行可能按需装包，给足时间
+        # 默认只编译一次；Windows MiKTeX 首次运行可能按需装包，给足时间
         _latex_env = subprocess_env_with_xelatex_bin(xelatex_path)
-        result = subprocess.run(
-            compile_cmd,
-            cwd=temp_dir,
-            capture_output=True,
-            text=True,
-            timeout=180,
-            env=_latex_env,
-        )
+        log_file = Path(temp_dir) / 'resume.log'
+        for compile_pass in range(1, max(1, max_passes) + 1):
+            result = subprocess.run(
+                compile_cmd,
+                cwd=temp_dir,
+                capture_output=True,
+                timeout=180,
+                env=_latex_env,
+            )
 
-        if result.returncode != 0:
-            error_msg = result.stderr or result.stdout
-            error_summary = _summarize_latex_error(error_msg)
-            print(f"LaTeX 编译失败: {error_summary}")
-            raise RuntimeError(f"LaTeX 编译失败: {error_summary}")
+            # 输出按字节接收，只有失败时才解码（成功时数 MB 的日志输出直接丢弃）
+            if result.returncode != 0:
+                error_msg = (result.stderr or result.stdout or b"").decode("utf-8", errors="replace")
+                error_summary = _summarize_latex_error(error_msg)
+                print(f"LaTeX 编译失败: {error_summary}")
+                raise RuntimeError(f"LaTeX 编译失败: {error_summary}")
+
+            if compile_pass >= max_passes or not _latex_log_requests_rerun(log_file):
+                break
 
         """读取生成的 PDF"""
         pdf_file = Path(temp_dir) / 'resume.pdf'
         if not pdf_file.exists():
             raise RuntimeError("PDF 文件未生成")
 
-        # 读取 PDF
+        # 读取 PDF：BytesIO 直接共享 bytes 缓冲区（getvalue 也不复制），新建时位置已在开头
         pdf_bytes = pdf_file.read_bytes()
         print(f"PDF 生成成功，大小: {len(pdf_bytes)} 字节")
 
-        pdf_io = BytesIO(pdf_bytes)
-        pdf_io.seek(0)
-
-        return pdf_io
+        return BytesIO(pdf_bytes)
 
     finally:
         """清理临时目录"""
@@ -611,17 +653,41 @@ LaTeX (XeLaTeX) 未安装。请运行以下命令安装：
 
 
 """
-PDF 缓存（内存缓存，最多保留 50 个）
+LaTeX 源码 / PDF 缓存（内存 LRU，最多保留 32 / 50 个）
+渲染接口在线程池中执行，读写缓存需要加锁
 """
-_pdf_cache: Dict[str, bytes] = {}
-_pdf_cache_order: List[str] = []
+_latex_cache: "OrderedDict[str, str]" = OrderedDict()
+_LATEX_CACHE_MAX_SIZE = 32
+_pdf_cache: "OrderedDict[str, bytes]" = OrderedDict()
 _PDF_CACHE_MAX_SIZE = 50
+_cache_lock = threading.Lock()
 
 
 def _get_cache_key(resume_data: Dict[str, Any], section_order: List[str] = None) -> str:
-    """生成缓存键"""
-    content = json.dumps(resume_data, sort_keys=True, ensure_ascii=False) + str(section_order or [])
-    return hashlib.md5(content.encode()).hexdigest()
+    """生成缓存键（带上当天日期：年龄等内容按当天计算）"""
+    content = json.dumps(
+        [resume_data, section_order or [], date.today().isoformat()],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+def _cache_get(cache: "OrderedDict[str, Any]", key: str) -> Any:
+    with _cache_lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+
+def _cache_put(cache: "OrderedDict[str, Any]", key: str, value: Any, max_size: int) -> None:
+    with _cache_lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_size:
+            cache.popitem(last=False)
 
 
 def render_pdf_from_resume_latex(resume_data: Dict[str, Any], section_order: List[str] = None) -> BytesIO:
@@ -641,15 +707,14 @@ def render_pdf_from_resume_latex(resume_data: Dict[str, Any], section_order: Lis
     
     """检查缓存"""
     cache_key = _get_cache_key(resume_data, section_order)
-    if cache_key in _pdf_cache:
+    cached_pdf = _cache_get(_pdf_cache, cache_key)
+    if cached_pdf is not None:
         cache_time = time.time() - total_start
         print(f"[性能] 缓存命中! 耗时: {cache_time*1000:.0f}ms")
-        return BytesIO(_pdf_cache[cache_key])
+        return BytesIO(cached_pdf)
     
     """获取模板目录"""
-    current_dir = Path(__file__).resolve().parent
-    root_dir = current_dir.parent
-    template_dir = root_dir / "latex-resume-template"
+    template_dir = LATEX_TEMPLATE_DIR
     
     if not template_dir.exists():
         raise RuntimeError(f"LaTeX 模板目录不存在: {template_dir}")
@@ -667,13 +732,7 @@ def render_pdf_from_resume_latex(resume_data: Dict[str, Any], section_order: Lis
     print(f"[性能] LaTeX 编译 PDF: {compile_time*1000:.0f}ms")
     
     """写入缓存"""
-    pdf_bytes = pdf_io.getvalue()
-    if len(_pdf_cache) >= _PDF_CACHE_MAX_SIZE:
-        """删除最旧的缓存"""
-        oldest_key = _pdf_cache_order.pop(0)
-        _pdf_cache.pop(oldest_key, None)
-    _pdf_cache[cache_key] = pdf_bytes
-    _pdf_cache_order.append(cache_key)
+    _cache_put(_pdf_cache, cache_key, pdf_io.getvalue(), _PDF_CACHE_MAX_SIZE)
     print(f"[性能] 已缓存 PDF (缓存数: {len(_pdf_cache)})")
     
     total_time = time.time() - total_start
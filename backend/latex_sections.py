@@ -510,17 +510,16 @@ def generate_section_skills(resume_data: Dict[str, Any], section_titles: Dict[st
         skill_items = []
         for s in skills:
             if isinstance(s, str):
-                if s.strip():
-                    if ':' in s or '：' in s:
-                        parts = s.replace('：', ':').split(':', 1)
-                        category = parts[0].strip()
-                        details = parts[1].strip() if len(parts) > 1 else ''
-                        if category and details:
-                            skill_items.append(f"  \\item \\textbf{{{escape_latex(category)}:}} {escape_latex(details)}")
-                        else:
-                            skill_items.append(f"  \\item {escape_latex(s.strip())}")
+                text = s.strip()
+                if text:
+                    # 统一全角冒号后一次切分出 类别:详情
+                    category, sep, details = text.replace('：', ':').partition(':')
+                    category = category.strip()
+                    details = details.strip()
+                    if sep and category and details:
+                        skill_items.append(f"  \\item \\textbf{{{escape_latex(category)}:}} {escape_latex(details)}")
                     else:
-                        skill_items.append(f"  \\item {escape_latex(s.strip())}")
+                        skill_items.append(f"  \\item {escape_latex(text)}")
             elif isinstance(s, dict):
                 category = escape_latex(s.get('category') or '').strip()
                 details = s.get('details') or ''
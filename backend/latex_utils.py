@@ -5,8 +5,14 @@ LaTeX 工具函数模块
 import os
 import re
 import shutil
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+
+_HTML_BLOCK_TAG_RE = re.compile(r'<\s*(?:br|div|p)\s*/?\s*>', re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
 
 
 def strip_html_tags(text: str) -> str:
@@ -14,65 +20,151 @@ def strip_html_tags(text: str) -> str:
     if not text:
         return text
     # 将 <br>, <br/>, <div>, </div> 等块级标签替换为空格（避免文字粘连）
-    text = re.sub(r'<\s*(?:br|div|p)\s*/?\s*>', ' ', text, flags=re.IGNORECASE)
+    text = _HTML_BLOCK_TAG_RE.sub(' ', text)
     # 移除所有剩余 HTML 标签
-    text = re.sub(r'<[^>]+>', '', text)
+    text = _HTML_TAG_RE.sub('', text)
     # 合并多余空格
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WHITESPACE_RE.sub(' ', text).strip()
     return text
 
 
+r"""
+LaTeX 特殊字符转义表：str.translate 一次扫描完成全部替换，
+替换结果不会被再次转义（逐个 replace 会把 \textbackslash{} 的花括号又转成 \{\}）
+"""
+_LATEX_ESCAPE_TABLE = str.maketrans({
+    '\\': r'\textbackslash{}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '^': r'\textasciicircum{}',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '\n': ' ',  # LaTeX 命令参数不能跨行
+    '\r': ' ',
+})
+_MD_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+"""加粗占位符 __BOLD_i__ 经过转义后的形式"""
+_BOLD_PLACEHOLDER_RE = re.compile(r'\\_\\_BOLD\\_(\d+)\\_\\_')
+
+
+"""
+公司名、技能分类等短字段在一份简历里会被反复转义，按内容缓存；
+长文本（描述段落）几乎不重复，不进缓存以限制内存
+"""
+_ESCAPE_CACHE_MAX_LEN = 512
+
+
 def escape_latex(text: str) -> str:
     """
     转义 LaTeX 特殊字符，并处理 Markdown 加粗语法
     """
     if not isinstance(text, str):
         text = str(text)
-    
+    if not text:
+        # 空字符串是最常见的输入，连缓存的哈希查找也省掉
+        return ''
+    if len(text) <= _ESCAPE_CACHE_MAX_LEN:
+        return _escape_latex_cached(text)
+    return _escape_latex_impl(text)
+
+
+def clear_escape_latex_cache() -> None:
+    """清空 escape_latex 缓存"""
+    _escape_latex_cached.cache_clear()
+
+
+def _escape_latex_impl(text: str) -> str:
+    """escape_latex 的实际实现（短字符串经 _escape_latex_cached 缓存）"""
     """先清理 HTML 标签（来自富文本编辑器的残留）"""
     text = strip_html_tags(text)
     
     """先处理 **text** -> \textbf{text} (在转义之前)"""
-    bold_pattern = re.compile(r'\*\*(.+?)\*\*')
     bold_matches = []
     
     def save_bold(match):
         bold_matches.append(match.group(1))
         return f'__BOLD_{len(bold_matches)-1}__'
     
-    text = bold_pattern.sub(save_bold, text)
-    
-    """移除换行符（LaTeX 命令参数不能跨行）"""
-    text = text.replace('\n', ' ').replace('\r', ' ')
-    
-    """LaTeX 特殊字符转义"""
-    replacements = {
-        '\\': r'\textbackslash{}',
-        '&': r'\&',
-        '%': r'\%',
-        '$': r'\$',
-        '#': r'\#',
-        '^': r'\textasciicircum{}',
-        '_': r'\_',
-        '{': r'\{',
-        '}': r'\}',
-        '~': r'\textasciitilde{}',
-    }
+    text = _MD_BOLD_RE.sub(save_bold, text)
     
-    result = text
-    for char, replacement in replacements.items():
-        result = result.replace(char, replacement)
+    """LaTeX 特殊字符转义（同时把换行替换为空格）"""
+    result = text.translate(_LATEX_ESCAPE_TABLE)
     
-    """恢复加粗文本（转义后的内容需要再次转义）"""
-    for i, bold_text in enumerate(bold_matches):
-        escaped_bold = bold_text
-        for char, replacement in replacements.items():
-            escaped_bold = escaped_bold.replace(char, replacement)
-        result = result.replace(f'\\_\\_BOLD\\_{i}\\_\\_', f'\\textbf{{{escaped_bold}}}')
+    """恢复加粗文本（加粗内容同样需要转义）"""
+    if bold_matches:
+        def restore_bold(match):
+            i = int(match.group(1))
+            if i >= len(bold_matches):
+                return match.group(0)  # 用户原文中恰好出现的占位符样式文本
+            return f'\\textbf{{{bold_matches[i].translate(_LATEX_ESCAPE_TABLE)}}}'
+        
+        result = _BOLD_PLACEHOLDER_RE.sub(restore_bold, result)
     
     return result
 
 
+_escape_latex_cached = lru_cache(maxsize=2048)(_escape_latex_impl)
+
+
+"""字段名映射表：中文 -> 英文"""
+_FIELD_MAPPING = {
+    '姓名': 'name',
+    '联系方式': 'phone',
+    '邮箱': 'email',
+    '电话': 'phone',
+    '手机': 'phone',
+    '地址': 'location',
+    '所在地': 'location',
+    '求职方向': 'summary',
+    '个人简介': 'summary',
+    '自我评价': 'summary',
+    '实习经历': 'internships',
+    '工作经历': 'experience',
+    '项目经验': 'projects',
+    '项目经历': 'projects',
+    '项目': 'projects',
+    '开源经历': 'opensource',
+    '开源贡献': 'opensource',
+    '开源': 'opensource',
+    '专业技能': 'skills',
+    '技能': 'skills',
+    '教育经历': 'education',
+    '教育': 'education',
+    '获奖荣誉': 'awards',
+    '荣誉': 'awards',
+    '证书': 'certifications',
+    '资格证书': 'certifications',
+    '论文': 'publications',
+    '论文发表': 'publications',
+    '竞赛经历': 'competitions',
+    '竞赛': 'competitions',
+}
+
+"""项目/经历项的字段映射"""
+_ITEM_FIELD_MAPPING = {
+    '公司': 'company',
+    '职位': 'position',
+    '时间': 'duration',
+    '地点': 'location',
+    '项目名称': 'name',
+    '角色': 'role',
+    '技术栈': 'stack',
+    '亮点': 'highlights',
+    '描述': 'description',
+    '职责': 'achievements',
+    '成就': 'achievements',
+}
+
+"""条目内的键先查项目映射、再查顶层映射：合并成一张表，每个键只查一次"""
+_MERGED_ITEM_MAPPING = {**_FIELD_MAPPING, **_ITEM_FIELD_MAPPING}
+
+_CONTACT_FIELDS = frozenset(('phone', 'email', 'location'))
+
+
 def normalize_resume_data(data: Dict[str, Any]) -> Dict[str, Any]:
     """
     标准化简历数据字段名
@@ -84,59 +176,25 @@ def normalize_resume_data(data: Dict[str, Any]) -> Dict[str, Any]:
     返回:
         标准化后的简历数据（英文字段名）
     """
-    """字段名映射表：中文 -> 英文"""
-    field_mapping = {
-        '姓名': 'name',
-        '联系方式': 'phone',
-        '邮箱': 'email',
-        '电话': 'phone',
-        '手机': 'phone',
-        '地址': 'location',
-        '所在地': 'location',
-        '求职方向': 'summary',
-        '个人简介': 'summary',
-        '自我评价': 'summary',
-        '实习经历': 'internships',
-        '工作经历': 'experience',
-        '项目经验': 'projects',
-        '项目经历': 'projects',
-        '项目': 'projects',
-        '开源经历': 'opensource',
-        '开源贡献': 'opensource',
-        '开源': 'opensource',
-        '专业技能': 'skills',
-        '技能': 'skills',
-        '教育经历': 'education',
-        '教育': 'education',
-        '获奖荣誉': 'awards',
-        '荣誉': 'awards',
-        '证书': 'certifications',
-        '资格证书': 'certifications',
-        '论文': 'publications',
-        '论文发表': 'publications',
-        '竞赛经历': 'competitions',
-        '竞赛': 'competitions',
-    }
-    
     normalized = {}
     contact_info = {}
     
     for key, value in data.items():
         """如果是中文字段名，转换为英文"""
-        english_key = field_mapping.get(key, key)
+        english_key = _FIELD_MAPPING.get(key, key)
         
         """特殊处理：联系信息字段"""
-        if english_key in ['phone', 'email', 'location']:
+        if english_key in _CONTACT_FIELDS:
             contact_info[english_key] = value
         else:
             """处理嵌套结构"""
             if isinstance(value, list):
                 normalized[english_key] = [
-                    normalize_item(item, field_mapping) if isinstance(item, dict) else item 
+                    normalize_item(item) if isinstance(item, dict) else item 
                     for item in value
                 ]
             elif isinstance(value, dict) and key != 'contact':
-                normalized[english_key] = normalize_item(value, field_mapping)
+                normalized[english_key] = normalize_item(value)
             else:
                 normalized[english_key] = value
     
@@ -156,40 +214,40 @@ def normalize_resume_data(data: Dict[str, Any]) -> Dict[str, Any]:
     return normalized
 
 
-def normalize_item(item: Dict[str, Any], field_mapping: Dict[str, str]) -> Dict[str, Any]:
+def normalize_item(item: Dict[str, Any], field_mapping: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     """
-    标准化单个项目的字段名
+    标准化单个项目的字段名（含嵌套的字典与列表中的字典）
+    用显式栈逐层处理：先建好空的目标字典占位，再把 (源, 目标) 压栈，
+    不产生递归调用，输出键顺序与逐层递归一致；输入数据不会被修改
     """
-    """项目/经历项的字段映射"""
-    item_field_mapping = {
-        '公司': 'company',
-        '职位': 'position',
-        '时间': 'duration',
-        '地点': 'location',
-        '项目名称': 'name',
-        '角色': 'role',
-        '技术栈': 'stack',
-        '亮点': 'highlights',
-        '描述': 'description',
-        '职责': 'achievements',
-        '成就': 'achievements',
-    }
+    if field_mapping is None or field_mapping is _FIELD_MAPPING:
+        mapping = _MERGED_ITEM_MAPPING
+    else:
+        mapping = {**field_mapping, **_ITEM_FIELD_MAPPING}
+    map_key = mapping.get
     
-    normalized_item = {}
-    for k, v in item.items():
-        english_key = item_field_mapping.get(k, field_mapping.get(k, k))
-        """递归处理嵌套结构"""
-        if isinstance(v, dict):
-            normalized_item[english_key] = normalize_item(v, field_mapping)
-        elif isinstance(v, list):
-            normalized_item[english_key] = [
-                normalize_item(sub, field_mapping) if isinstance(sub, dict) else sub 
-                for sub in v
-            ]
-        else:
-            normalized_item[english_key] = v
+    root = {}
+    stack = [(item, root)]
+    while stack:
+        src, dst = stack.pop()
+        for k, v in src.items():
+            english_key = map_key(k, k)
+            if isinstance(v, dict):
+                child = dst[english_key] = {}
+                stack.append((v, child))
+            elif isinstance(v, list):
+                items = []
+                for sub in v:
+                    if isinstance(sub, dict):
+                        child = {}
+                        stack.append((sub, child))
+                        sub = child
+                    items.append(sub)
+                dst[english_key] = items
+            else:
+                dst[english_key] = v
     
-    return normalized_item
+    return root
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -242,6 +300,61 @@ def resolve_xelatex_executable() -> Optional[str]:
     return None
 
 
+"""LaTeX 模板目录（仓库根目录下），导入时解析一次，避免每次渲染都做 realpath"""
+LATEX_TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "latex-resume-template"
+
+"""编译目录需要的模板文件（fonts/ 由 .sty 中的相对路径 Path = fonts/ 引用）"""
+LATEX_TEMPLATE_FILES = (
+    'resume.cls', 'fontawesome.sty', 'linespacing_fix.sty',
+    'zh_CN-Adobefonts_external.sty', 'zh_CN-Adobefonts_internal.sty',
+)
+
+
+def _link_or_copy(src: Path, dest: Path) -> None:
+    try:
+        os.symlink(src, dest, target_is_directory=src.is_dir())
+    except OSError:
+        # Windows 未开启开发者模式时无权创建符号链接，回退为复制
+        if src.is_dir():
+            shutil.copytree(src, dest, dirs_exist_ok=True)
+        else:
+            shutil.copy2(src, dest)
+
+
+@lru_cache(maxsize=8)
+def _template_sources(template_dir: Path) -> Tuple[Tuple[Tuple[str, Path], ...], Tuple[str, ...]]:
+    """
+    解析模板目录中需要链接的源路径，返回 ((目标名, 源路径), ...) 与缺失文件名。
+    模板目录只读且不变，每个进程只需 stat/realpath 一次
+    """
+    sources = []
+    missing = []
+    for file_name in LATEX_TEMPLATE_FILES:
+        src_file = template_dir / file_name
+        if src_file.exists():
+            sources.append((file_name, src_file.resolve()))
+        else:
+            missing.append(file_name)
+
+    fonts_dir = template_dir / 'fonts'
+    if fonts_dir.exists():
+        sources.append(('fonts', fonts_dir.resolve()))
+    return tuple(sources), tuple(missing)
+
+
+def stage_latex_template(template_dir: Path, work_dir: str) -> List[str]:
+    """
+    把模板文件放进编译临时目录，返回缺失的文件名。
+    模板目录只读且不变，用符号链接代替复制，省掉每次编译复制约 44MB 字体；
+    清理临时目录时 rmtree 只删除链接本身，不会影响模板目录。
+    """
+    work_path = Path(work_dir)
+    sources, missing = _template_sources(Path(template_dir))
+    for name, src in sources:
+        _link_or_copy(src, work_path / name)
+    return list(missing)
+
+
 def subprocess_env_with_xelatex_bin(xelatex_path: str) -> dict:
     """返回在 PATH 最前面插入 xelatex 所在目录的环境变量字典，
     确保同目录的 kpsewhich 等工具也能被子进程找到。"""
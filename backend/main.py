@@ -10,6 +10,7 @@ FastAPI 后端入口
 
 启动命令：uvicorn backend.main:app --reload --port 9000
 """
+import asyncio
 import os
 import sys
 import importlib
@@ -263,7 +264,8 @@ async def startup_event():
             simple.DEEPSEEK_API_KEY = deepseek_key
             logger.info("[配置] 已从环境变量加载 DASHSCOPE_API_KEY")
         
-        simple.warmup_connection()
+        # DNS 解析和预热请求是阻塞 I/O，放到线程里执行，不卡住事件循环
+        await asyncio.to_thread(simple.warmup_connection)
         logger.info("[启动优化] HTTP 连接已预热")
     except Exception as e:
         logger.warning(f"[启动优化] 连接预热失败: {e}")
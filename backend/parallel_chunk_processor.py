@@ -193,7 +193,6 @@ class ParallelChunkProcessor:
             )
 
             elapsed = time.time() - start_time
-            print(f"[并行处理] 第 {chunk_index+1}/{total_chunks} 块完成，耗时: {elapsed:.2f}秒", file=sys.stderr, flush=True)
             logger.info(f"第 {chunk_index+1}/{total_chunks} 块完成，耗时: {elapsed:.2f}秒")
 
             return {
@@ -243,10 +242,6 @@ class ParallelChunkProcessor:
         Returns:
             解析结果列表
         """
-        print("========== [并行处理] 开始并行处理 ==========", file=sys.stderr, flush=True)
-        print(f"[并行处理] 分块数量: {len(chunks)}", file=sys.stderr, flush=True)
-        print(f"[并行处理] 并发数: {self.max_concurrent}", file=sys.stderr, flush=True)
-        print(f"[并行处理] 预计轮次: {(len(chunks) + self.max_concurrent - 1) // self.max_concurrent}", file=sys.stderr, flush=True)
         logger.info("========== 开始并行处理 ==========")
         logger.info(f"分块数量: {len(chunks)}")
         logger.info(f"并发数: {self.max_concurrent}")
@@ -278,10 +273,6 @@ class ParallelChunkProcessor:
         failed = [r for r in results if isinstance(r, dict) and not r.get('success')]
         exceptions = [r for r in results if not isinstance(r, dict)]
 
-        print("========== [并行处理] 并行处理完成 ==========", file=sys.stderr, flush=True)
-        print(f"[并行处理] 总耗时: {total_time:.2f}秒", file=sys.stderr, flush=True)
-        print(f"[并行处理] 成功: {len(successful)}/{len(chunks)}", file=sys.stderr, flush=True)
-        print(f"[并行处理] 失败: {len(failed)}/{len(chunks)}", file=sys.stderr, flush=True)
         logger.info("========== 并行处理完成 ==========")
         logger.info(f"总耗时: {total_time:.2f}秒")
         logger.info(f"成功: {len(successful)}/{len(chunks)}")
@@ -412,13 +403,13 @@ async def parse_resume_text_parallel(text: str, provider: str,
         return result
 
     # 长文本使用并行分块处理
-    print(f"[parse_resume_text_parallel] 文本长度: {len(text)}, 阈值: {chunk_threshold}, 需要分块", file=sys.stderr, flush=True)
+    logger.debug(f"文本长度: {len(text)}, 阈值: {chunk_threshold}, 需要分块")
     processor = ParallelChunkProcessor(provider=provider, max_concurrent=max_concurrent)
     try:
         # 分块
-        print(f"[parse_resume_text_parallel] 开始分块，max_chunk_size: {max_chunk_size}", file=sys.stderr, flush=True)
+        logger.debug(f"开始分块，max_chunk_size: {max_chunk_size}")
         chunks = split_resume_text(text, max_chunk_size=max_chunk_size)
-        print(f"[parse_resume_text_parallel] 分块完成，共 {len(chunks)} 块", file=sys.stderr, flush=True)
+        logger.debug(f"分块完成，共 {len(chunks)} 块")
 
         # 并行处理
         chunk_results = await processor.process_chunks_parallel(
@@ -426,7 +417,7 @@ async def parse_resume_text_parallel(text: str, provider: str,
         )
 
         # 合并结果
-        print(f"[parse_resume_text_parallel] 开始合并 {len(chunk_results)} 个分块结果", file=sys.stderr, flush=True)
+        logger.debug(f"开始合并 {len(chunk_results)} 个分块结果")
         
         # 检查是否有成功的结果
         if not chunk_results:
@@ -435,7 +426,6 @@ async def parse_resume_text_parallel(text: str, provider: str,
             raise Exception(error_msg)
         
         final_result = merge_resume_chunks(chunk_results)
-        print(f"[parse_resume_text_parallel] 合并完成", file=sys.stderr, flush=True)
         logger.info("分块合并完成")
 
         return final_result
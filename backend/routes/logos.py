@@ -11,7 +11,7 @@ import mimetypes
 from pathlib import Path
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from middleware.auth import AppUser, require_admin_only
 # User(users) 已退役(2026-07-17 身份统一),身份用 middleware.auth.AppUser
 
@@ -46,8 +46,8 @@ async def get_logos():
     """获取所有可用的公司 Logo 列表（含 COS URL）。异常时始终返回 200 + 空列表，避免 500。"""
     try:
         m = _import_logos()
-        logos = await asyncio.to_thread(m.get_all_logos_with_urls)
-        return JSONResponse(status_code=200, content={"logos": logos})
+        body = await asyncio.to_thread(m.get_all_logos_json_bytes)
+        return Response(content=body, status_code=200, media_type="application/json")
     except Exception as e:
         module_file = ""
         logo_dir = ""
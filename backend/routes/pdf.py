@@ -36,8 +36,11 @@ logger = logging.getLogger("backend")
 
 
 def _resolve_template_dir() -> Path:
-    current_dir = Path(__file__).resolve().parent
-    return current_dir.parents[1] / "latex-resume-template"
+    try:
+        from backend.latex_utils import LATEX_TEMPLATE_DIR
+    except ImportError:
+        from latex_utils import LATEX_TEMPLATE_DIR
+    return LATEX_TEMPLATE_DIR
 
 
 def _prepare_latex_content(resume_data, section_order):
@@ -323,7 +326,8 @@ async def compile_latex(
         render_time = time.time() - start_time
         print(f"[LaTeX 编译] 完成，耗时: {render_time:.2f}秒, user_id={current_user.id}")
 
-        return StreamingResponse(pdf_io, media_type='application/pdf', headers={
+        # 整块发送：直接迭代 BytesIO 会按 b'\n' 把二进制 PDF 切成大量碎片
+        return StreamingResponse(iter([pdf_io.getvalue()]), media_type='application/pdf', headers={
             'Content-Disposition': 'inline; filename="resume.pdf"',
             'X-Render-Time': str(render_time)
         })
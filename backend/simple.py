@@ -96,7 +96,7 @@ try:
     # 优先使用 backend 包形式
     from backend.http_client import (
         get_httpx_client, get_requests_session, 
-        call_api, init as http_init, prefetch_api_hosts
+        call_api, init as http_init
     )
     _use_http2_client = True
     print("[simple] 使用 HTTP/2 高性能客户端")
@@ -105,7 +105,7 @@ except ImportError:
         # 兼容脚本直接运行的顶层导入
         from http_client import (
             get_httpx_client, get_requests_session, 
-            call_api, init as http_init, prefetch_api_hosts
+            call_api, init as http_init
         )
         _use_http2_client = True
         print("[simple] 使用 HTTP/2 高性能客户端")
@@ -156,8 +156,8 @@ def warmup_connection():
     """使用新的 http_client 预热"""
     if _use_http2_client:
         try:
-            """执行 DNS 预解析"""
-            prefetch_api_hosts()
+            """DNS 预解析 + 解析结果接管建连 + 预热 HTTP/2 连接"""
+            http_init()
             _connection_warmed = True
             return
         except:
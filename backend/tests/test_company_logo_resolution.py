@@ -1,3 +1,4 @@
+import json
 import os
 import sys
 import tempfile
@@ -37,6 +38,22 @@ def test_get_all_logos_prefers_local_in_non_production(monkeypatch):
     assert logos == local
 
 
+def test_get_all_logos_json_bytes_reuses_serialized_body(monkeypatch):
+    cos = [{"key": "tencent", "name": "腾讯", "url": "https://cos.example.com/tencent.png", "keywords": ["腾讯"]}]
+
+    monkeypatch.setattr(company_logos, "get_all_logos_with_urls", lambda: cos)
+    company_logos.clear_cache()
+
+    first = company_logos.get_all_logos_json_bytes()
+    second = company_logos.get_all_logos_json_bytes()
+
+    assert first is second
+    assert json.loads(first) == {"logos": cos}
+
+    company_logos.clear_cache()
+    assert company_logos.get_all_logos_json_bytes() is not first
+
+
 def test_get_logo_cos_url_uses_company_logo_prefix():
     company_logos.clear_cache()
     company_logos._cos_cache = []  # type: ignore[attr-defined]
@@ -65,6 +82,65 @@ def test_scan_cos_logos_deduplicates_root_objects_when_company_logo_exists(monke
     assert all("/company_logo/" in item["url"] for item in logos)
 
 
+def test_list_cos_logo_keys_paginates_without_next_marker(monkeypatch):
+    pages = {
+        "": {
+            "Contents": [{"Key": "company_logo/腾讯.png"}, {"Key": "company_logo/美团.png"}],
+            "IsTruncated": "true",
+        },
+        "company_logo/美团.png": {
+            "Contents": [{"Key": "company_logo/百度.png"}],
+            "IsTruncated": "false",
+        },
+    }
+    markers = []
+
+    class _Client:
+        def list_objects(self, **kwargs):
+            markers.append(kwargs["Marker"])
+            assert kwargs["Delimiter"] == "/"
+            return pages[kwargs["Marker"]]
+
+    import backend.core.cos_client as cos_client
+
+    monkeypatch.setattr(cos_client, "build_cos_s3_client", lambda: (_Client(), "bucket"))
+
+    keys = company_logos._list_cos_logo_keys()
+
+    assert markers == ["", "company_logo/美团.png"]
+    assert keys == sorted(["company_logo/腾讯.png", "company_logo/美团.png", "company_logo/百度.png"])
+
+
+def test_scan_cos_logos_single_flight_under_concurrency(monkeypatch):
+    import threading
+    import time
+
+    calls = []
+
+    def _slow_list():
+        calls.append(1)
+        time.sleep(0.05)
+        return ["company_logo/腾讯.png"]
+
+    monkeypatch.setenv("COS_SECRET_ID", "x")
+    monkeypatch.setenv("COS_SECRET_KEY", "y")
+    monkeypatch.setattr(company_logos, "_list_cos_logo_keys", _slow_list)
+    company_logos.clear_cache()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(company_logos._scan_cos_logos()))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+
 def test_download_logos_falls_back_to_local_when_cos_download_fails(monkeypatch):
     with tempfile.TemporaryDirectory() as tmp:
       local_src = Path(tmp) / "腾讯.png"
@@ -76,7 +152,7 @@ def test_download_logos_falls_back_to_local_when_cos_download_fails(monkeypatch)
       def _raise(*args, **kwargs):
           raise RuntimeError("cos down")
 
-      monkeypatch.setattr(company_logos.urllib.request, "urlretrieve", _raise)
+      monkeypatch.setattr(company_logos, "_download_url_to_path", _raise)
 
       logo_map = company_logos.download_logos_to_dir([{"logo": "tencent"}], tmp)
       out = Path(tmp) / "logos" / "logo_0.png"
@@ -86,6 +162,94 @@ def test_download_logos_falls_back_to_local_when_cos_download_fails(monkeypatch)
       assert out.read_bytes() == b"fake-logo"
 
 
+def test_download_logos_fetches_each_internship_from_cos(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+      monkeypatch.setattr(company_logos, "get_all_logos_with_urls", lambda: [])
+      monkeypatch.setattr(company_logos, "get_logo_cos_url", lambda key: f"https://cos.example.com/{key}.png")
+      monkeypatch.setattr(company_logos, "get_logo_local_path", lambda key: None)
+
+      def _fake_download(url, local_path, timeout=15.0):
+          local_path.write_bytes(url.encode("utf-8"))
+
+      monkeypatch.setattr(company_logos, "_download_url_to_path", _fake_download)
+
+      internships = [{"logo": "tencent"}, {"title": "无 logo"}, {"logo": "bytedance"}]
+      logo_map = company_logos.download_logos_to_dir(internships, tmp)
+
+      assert logo_map == {0: "logo_0.png", 2: "logo_2.png"}
+      assert (Path(tmp) / "logos" / "logo_2.png").read_bytes() == b"https://cos.example.com/bytedance.png"
+
+
+def test_download_logos_fetches_shared_key_once(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+      calls = []
+      monkeypatch.setattr(company_logos, "get_all_logos_with_urls", lambda: [])
+      monkeypatch.setattr(company_logos, "get_logo_cos_url", lambda key: f"https://cos.example.com/{key}.png")
+      monkeypatch.setattr(company_logos, "get_logo_local_path", lambda key: None)
+
+      def _fake_download(url, local_path, timeout=15.0):
+          calls.append(url)
+          local_path.write_bytes(b"tencent-logo")
+
+      monkeypatch.setattr(company_logos, "_download_url_to_path", _fake_download)
+
+      internships = [{"logo": "tencent"}, {"logo": "tencent"}, {"logo": "tencent"}]
+      logo_map = company_logos.download_logos_to_dir(internships, tmp)
+
+      assert calls == ["https://cos.example.com/tencent.png"]
+      assert logo_map == {0: "logo_0.png", 1: "logo_1.png", 2: "logo_2.png"}
+      assert (Path(tmp) / "logos" / "logo_2.png").read_bytes() == b"tencent-logo"
+
+
+def test_download_url_reuses_etag_cache(monkeypatch):
+    calls = []
+
+    def _fake_head(url, timeout):
+        calls.append("HEAD")
+        return "v1"
+
+    def _fake_stream(url, local_path, timeout):
+        calls.append("GET")
+        local_path.write_bytes(b"logo-bytes")
+
+    with tempfile.TemporaryDirectory() as tmp:
+      monkeypatch.setattr(company_logos, "LOGO_CACHE_DIR", Path(tmp) / "cache")
+      monkeypatch.setattr(company_logos, "_head_etag", _fake_head)
+      monkeypatch.setattr(company_logos, "_stream_url_to_path", _fake_stream)
+
+      company_logos._download_url_to_path("https://cos.example.com/tencent.png", Path(tmp) / "a.png")
+      company_logos._download_url_to_path("https://cos.example.com/tencent.png", Path(tmp) / "b.png")
+
+      assert calls == ["HEAD", "GET", "HEAD"]
+      assert (Path(tmp) / "b.png").read_bytes() == b"logo-bytes"
+
+
+def test_stream_url_to_path_writes_body_and_raises_on_http_error(monkeypatch):
+    import httpx
+
+    payload = b"\x89PNG" + b"x" * (200 * 1024)
+
+    def handler(request):
+        if request.url.path.endswith("missing.png"):
+            return httpx.Response(404)
+        return httpx.Response(200, stream=httpx.ByteStream(payload))
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(company_logos, "_LOGO_HTTP", client)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "logo.png"
+        company_logos._stream_url_to_path("https://cos.example.com/logo.png", target, 5.0)
+        assert target.read_bytes() == payload
+
+        try:
+            company_logos._stream_url_to_path("https://cos.example.com/missing.png", Path(tmp) / "m.png", 5.0)
+        except RuntimeError as exc:
+            assert "404" in str(exc)
+        else:
+            raise AssertionError("expected RuntimeError")
+
+
 def test_sanitize_resume_removes_missing_company_logos():
     resume = {
         "internships": [
@@ -106,3 +270,96 @@ def test_sanitize_resume_removes_missing_company_logos():
     assert "logo" not in sanitized["internships"][0]
     assert "logoSize" not in sanitized["internships"][0]
     assert sanitized["education"][0]["logo"] == "北京大学"
+
+
+class _SyncClient:
+    def __init__(self, fail_keys=()):
+        self.fail_keys = set(fail_keys)
+
+    def get_object(self, Bucket, Key):
+        if Key in self.fail_keys:
+            raise OSError("boom")
+
+        class _Body:
+            def get_stream_to_file(self, path):
+                with open(path, "wb") as f:
+                    f.write(Key.encode("utf-8"))
+
+        return {"Body": _Body()}
+
+
+def _setup_sync(monkeypatch, tmp_path, client, keys):
+    import backend.core.cos_client as cos_client
+
+    logo_dir = tmp_path / "logo"
+    logo_dir.mkdir()
+    (logo_dir / "旧公司.png").write_bytes(b"old")
+    (logo_dir / "腾讯.png").write_bytes(b"old")
+    monkeypatch.setattr(company_logos, "LOCAL_LOGO_DIR", logo_dir)
+    monkeypatch.setattr(cos_client, "build_cos_s3_client", lambda: (client, "bucket"))
+    monkeypatch.setattr(company_logos, "_list_cos_logo_keys", keys)
+    return logo_dir
+
+
+def test_run_logo_sync_keeps_local_files_when_a_download_fails(monkeypatch, tmp_path):
+    keys = ["company_logo/腾讯.png", "company_logo/美团.png"]
+    logo_dir = _setup_sync(monkeypatch, tmp_path, _SyncClient({"company_logo/美团.png"}), lambda: keys)
+
+    count, failed = company_logos.run_logo_sync(force=True)
+
+    assert failed == ["company_logo/美团.png"]
+    assert (logo_dir / "旧公司.png").read_bytes() == b"old"
+    assert (logo_dir / "腾讯.png").read_bytes() == "company_logo/腾讯.png".encode("utf-8")
+    assert sorted(p.name for p in logo_dir.iterdir()) == ["旧公司.png", "腾讯.png"]
+    assert count == 2
+
+
+def test_run_logo_sync_prunes_stale_files_after_full_success(monkeypatch, tmp_path):
+    keys = ["company_logo/腾讯.png", "company_logo/美团.png"]
+    logo_dir = _setup_sync(monkeypatch, tmp_path, _SyncClient(), lambda: keys)
+
+    count, failed = company_logos.run_logo_sync(force=True)
+
+    assert (count, failed) == (2, [])
+    assert sorted(p.name for p in logo_dir.iterdir()) == ["美团.png", "腾讯.png"]
+
+
+def test_run_logo_sync_falls_back_to_known_logos_when_listing_fails(monkeypatch, tmp_path):
+    def _fail():
+        raise OSError("list failed")
+
+    logo_dir = _setup_sync(monkeypatch, tmp_path, _SyncClient(), _fail)
+
+    count, failed = company_logos.run_logo_sync(force=True)
+
+    assert failed == []
+    assert {p.name for p in logo_dir.iterdir()} == set(company_logos.KNOWN_LOGO_META)
+    assert count == len(company_logos.KNOWN_LOGO_META)
+
+
+def test_scan_cos_logos_caches_fallback_briefly_when_cos_fails(monkeypatch):
+    calls = []
+
+    def _failing_list():
+        calls.append(1)
+        raise OSError("COS down")
+
+    monkeypatch.setenv("COS_SECRET_ID", "x")
+    monkeypatch.setenv("COS_SECRET_KEY", "y")
+    monkeypatch.setattr(company_logos, "_list_cos_logo_keys", _failing_list)
+    company_logos.clear_cache()
+
+    first = company_logos._scan_cos_logos()
+    second = company_logos._scan_cos_logos()
+
+    assert len(calls) == 1
+    assert first == second == list(company_logos._FALLBACK_LOGOS)
+
+    # 负缓存过期后重新尝试 COS
+    now = company_logos.time.time()
+    monkeypatch.setattr(
+        company_logos.time, "time", lambda: now + company_logos._COS_FAILURE_CACHE_TTL + 1
+    )
+    company_logos._scan_cos_logos()
+    assert len(calls) == 2
+    company_logos.clear_cache()
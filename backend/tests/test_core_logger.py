@@ -0,0 +1,45 @@
+from datetime import datetime
+
+from backend.core import logger as core_logger
+from backend.core.logger import _sanitize_text_payload, _sensitive_extra_keys
+
+
+def test_sanitize_redacts_username_case_insensitively():
+    assert _sanitize_text_payload("login USER=alice, ok") == "login USER=[REDACTED], ok"
+    assert _sanitize_text_payload("reddit_username=bob x") == "reddit_username=[REDACTED] x"
+
+
+def test_sanitize_redacts_body_until_comma():
+    message = "comment_body=hello world, author_name=carol"
+    assert _sanitize_text_payload(message) == "comment_body=[REDACTED], author_name=[REDACTED]"
+
+
+def test_sanitize_returns_message_without_assignments_unchanged():
+    message = "[分块优化] 原始分块数: 3, 优化后: 2"
+    assert _sanitize_text_payload(message) is message
+
+
+def test_sensitive_extra_keys_matches_case_insensitively():
+    keys = frozenset({"name", "request_id", "Username", "body"})
+    assert set(_sensitive_extra_keys(keys)) == {"Username", "body"}
+    assert _sensitive_extra_keys(frozenset({"name", "flow_id"})) == ()
+
+
+def test_today_refreshes_after_expiry(monkeypatch):
+    monkeypatch.setattr(core_logger, "_day_stamp", "2000-01-01")
+    monkeypatch.setattr(core_logger, "_day_stamp_expires_at", 0.0)
+
+    assert core_logger._today() == datetime.now().strftime("%Y-%m-%d")
+    assert core_logger._day_stamp_expires_at > 0
+
+
+def test_write_debug_log_appends_entries_through_cached_handle(tmp_path, monkeypatch):
+    monkeypatch.setattr(core_logger, "_log_dir", tmp_path)
+
+    core_logger.write_debug_log("backend", "first", "dump.log")
+    core_logger.write_debug_log("backend", "second", "dump.log")
+
+    text = (tmp_path / "backend" / "dump.log").read_text(encoding="utf-8")
+    assert text.count("=" * 60) == 4
+    assert text.index("first") < text.index("second")
+    core_logger._close_debug_handles()
@@ -0,0 +1,48 @@
+"""init_db schema 指纹：指纹一致且库存在时跳过 create_all，库被重建后重新建表。"""
+
+from sqlalchemy import create_engine, inspect
+
+import backend.database as database
+import backend.models  # noqa: F401  注册全部 ORM 表
+
+
+def test_init_db_skips_create_all_when_schema_hash_matches(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, "SCHEMA_HASH_FILE", tmp_path / ".schema.hash")
+    db_file = tmp_path / "resume.db"
+    engine = create_engine(f"sqlite:///{db_file}")
+
+    database.init_db(bind=engine)
+    assert database.SCHEMA_HASH_FILE.read_text(encoding="utf-8") == database._schema_hash(engine)
+    tables = set(database.Base.metadata.tables)
+    assert tables <= set(inspect(engine).get_table_names())
+
+    calls = []
+    original = database.Base.metadata.create_all
+    monkeypatch.setattr(database.Base.metadata, "create_all", lambda *a, **kw: calls.append(kw) or original(*a, **kw))
+    database.init_db(bind=engine)
+    assert calls == []
+
+    # 库文件被删掉重建：探测表不存在，必须重新建表
+    engine.dispose()
+    db_file.unlink()
+    engine = create_engine(f"sqlite:///{db_file}")
+    database.init_db(bind=engine)
+    assert len(calls) == 1
+    assert tables <= set(inspect(engine).get_table_names())
+
+
+def test_prefer_mysqlclient_only_when_enabled_and_importable(monkeypatch):
+    import sys
+    import types
+
+    url = "mysql+pymysql://root@db:3306/resume_db"
+    monkeypatch.delenv("DB_USE_MYSQLCLIENT", raising=False)
+    assert database._prefer_mysqlclient(url) == url
+
+    monkeypatch.setenv("DB_USE_MYSQLCLIENT", "1")
+    monkeypatch.setitem(sys.modules, "MySQLdb", None)  # 模拟驱动未安装
+    assert database._prefer_mysqlclient(url) == url
+
+    monkeypatch.setitem(sys.modules, "MySQLdb", types.ModuleType("MySQLdb"))
+    assert database._prefer_mysqlclient(url) == "mysql+mysqldb://root@db:3306/resume_db"
+    assert database._prefer_mysqlclient("sqlite:///x.db") == "sqlite:///x.db"
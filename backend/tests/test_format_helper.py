@@ -0,0 +1,53 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from backend.format_helper import _header_line_indices, _match_section, try_smart_parse
+
+
+def test_match_section_keeps_header_priority():
+    assert _match_section("张三 13800000000") is None
+    assert _match_section("实习经历")[0] == "internships"
+    # 条目内编号不是段落标题，继续匹配后面的标题
+    assert _match_section("实习经历二") is None
+    assert _match_section("实习经历一 / 项目经验")[0] == "projects"
+    # 同一行命中多个标题时按原有优先级（实习 > 项目 > 开源 > 技能 > 教育）
+    assert _match_section("教育背景与实习经历")[0] == "internships"
+    assert _match_section("开源贡献")[0] == "openSource"
+
+
+def test_try_smart_parse_dispatches_sections():
+    text = "\n".join([
+        "张三",
+        "电话：13800000000 邮箱：a@b.com",
+        "专业技能",
+        "后端：Python、Go",
+        "教育背景",
+        "北京大学 计算机 本科 2018.09-2022.06",
+    ])
+    result, _ = try_smart_parse(text)
+    assert result["name"] == "张三"
+    assert result["education"][0]["title"] == "北京大学 计算机 本科"
+    assert result["skills"] == [{"category": "后端", "details": "Python、Go"}]
+
+
+def test_header_line_indices_maps_matches_to_lines():
+    text = "张三\n实习经历\n字节跳动\n\n项目经验 / 项目经历\n专业技能"
+    assert _header_line_indices(text) == [1, 4, 5]
+    assert _header_line_indices("没有标题") == []
+
+
+def test_format_resume_text_skips_json_layers_for_plain_text(monkeypatch):
+    import backend.format_helper as format_helper
+
+    def _fail(_text):
+        raise AssertionError("JSON layers should be skipped for plain text")
+
+    monkeypatch.setattr(format_helper, "try_json_repair", _fail)
+    monkeypatch.setattr(format_helper, "try_regex_extract", _fail)
+    result = format_helper.format_resume_text("张三\n电话：13800000000\n专业技能\n后端：Python", use_ai=False)
+    assert result["method"] == "smart"
+
+    monkeypatch.undo()
+    assert format_helper.format_resume_text('{"name": "张三"}', use_ai=False)["method"] == "json-repair"
@@ -0,0 +1,57 @@
+"""html_to_latex 解析后端一致性：lxml target 与 html.parser 回退输出必须完全一致。"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import pytest
+
+import backend.html_to_latex as html_to_latex_module
+from backend.html_to_latex import html_to_latex
+
+
+CASES = [
+    "<p>这是一段<strong>加粗</strong>文字</p>",
+    "<ul><li><p>a &amp; b</p><ul><li>嵌套</li></ul></li></ul>",
+    "前置文字<ul><li>x</li></ul>",
+    "<p>a<br>b</p>",
+    '<p><a href="https://x.com/a_b#c">link</a> <a>无链接</a></p>',
+    "<h2>标题</h2><p>x</p><!-- 注释 --><p>y</p>",
+    "**bold** and *it*\n- one\n- two",
+]
+
+
+def test_fallback_parser_handles_formatting(monkeypatch):
+    monkeypatch.setattr(html_to_latex_module, "_lxml_etree", None)
+    assert html_to_latex("<p>支持<em>斜体</em>和<u>下划线</u> 50%</p>") == r"支持\textit{斜体}和\underline{下划线} 50\%"
+    assert html_to_latex('<p><a href="https://x.com/a_b">链接</a></p>') == r"\href{https://x.com/a\_b}{\textit{\uline{链接}}}"
+
+
+@pytest.mark.parametrize("html", CASES)
+def test_lxml_matches_html_parser(monkeypatch, html):
+    pytest.importorskip("lxml")
+    via_lxml = html_to_latex(html)
+    monkeypatch.setattr(html_to_latex_module, "_lxml_etree", None)
+    assert html_to_latex(html) == via_lxml
+
+
+def test_escape_latex_single_pass():
+    from backend.html_to_latex import escape_latex
+
+    assert escape_latex("") == ""
+    assert escape_latex("a & b_c {d} ~^ $5 #1 50%") == r"a \& b\_c \{d\} \textasciitilde{}\textasciicircum{} \$5 \#1 50\%"
+    # 反斜杠替换结果里的花括号不能被再次转义
+    assert escape_latex("C:\\dir") == r"C:\textbackslash{}dir"
+
+
+def test_html_to_latex_items_splits_outer_items_in_one_parse():
+    from backend.html_to_latex import html_to_latex_items
+
+    html = "<ul><li><p>负责 <strong>A</strong> &amp; B</p></li><li>二<ul><li>子项</li></ul></li><li><p></p></li></ul>"
+    items = html_to_latex_items(html)
+    assert items[0] == r"负责 \textbf{A} \& B"
+    assert items[1].startswith("二") and r"\item 子项" in items[1]
+    assert len(items) == 2
+
+    assert html_to_latex_items("<p>段一</p><p></p><p>段<em>二</em></p>") == ["段一", r"段\textit{二}"]
+    assert html_to_latex_items("plain") == []
@@ -0,0 +1,285 @@
+import asyncio
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import backend.http_client as http_client
+
+
+def test_lazy_clients_are_created_once_under_concurrency(monkeypatch):
+    monkeypatch.setattr(http_client, "_httpx_client", None)
+    monkeypatch.setattr(http_client, "_requests_session", None)
+    created = []
+    real_client = http_client.httpx.Client
+
+    def _slow_client(*args, **kwargs):
+        created.append(1)
+        threading.Event().wait(0.01)  # 放大首次创建的竞争窗口
+        return real_client(*args, **kwargs)
+
+    monkeypatch.setattr(http_client.httpx, "Client", _slow_client)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            clients = list(pool.map(lambda _: http_client.get_httpx_client(), range(16)))
+            sessions = list(pool.map(lambda _: http_client.get_requests_session(), range(16)))
+        assert len(created) == 1
+        assert all(c is clients[0] for c in clients)
+        assert all(s is sessions[0] for s in sessions)
+        assert "https://" in sessions[0].adapters
+    finally:
+        http_client.close()
+
+
+def test_prefetch_api_hosts_resolves_hosts_concurrently(monkeypatch):
+    barrier = threading.Barrier(len(http_client.API_HOSTS), timeout=2)
+    resolved = []
+
+    def _fake_prefetch(host):
+        barrier.wait()  # 串行解析时这里会超时
+        resolved.append(host)
+        return "127.0.0.1"
+
+    monkeypatch.setattr(http_client, "dns_prefetch", _fake_prefetch)
+    http_client.prefetch_api_hosts()
+    assert sorted(resolved) == sorted(http_client.API_HOSTS)
+
+
+def test_dns_prefetch_expires_entries_and_negative_caches_failures(monkeypatch):
+    monkeypatch.setattr(http_client, "_dns_cache", {})
+    now = [1000.0]
+    calls = []
+
+    def _fake_getaddrinfo(host, *args):
+        calls.append(host)
+        if host == "bad.example":
+            raise OSError("no such host")
+        return [(None, None, None, "", ("10.0.0.%d" % len(calls), 443))]
+
+    monkeypatch.setattr(http_client.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(http_client, "_original_getaddrinfo", _fake_getaddrinfo)
+
+    assert http_client.dns_prefetch("api.example") == "10.0.0.1"
+    assert http_client.dns_prefetch("api.example") == "10.0.0.1"
+    assert calls == ["api.example"]
+
+    now[0] += http_client._DNS_TTL + 1
+    assert http_client.dns_prefetch("api.example") == "10.0.0.2"
+
+    assert http_client.dns_prefetch("bad.example") is None
+    assert http_client.dns_prefetch("bad.example") is None
+    assert calls.count("bad.example") == 1
+    now[0] += http_client._DNS_NEGATIVE_TTL + 1
+    http_client.dns_prefetch("bad.example")
+    assert calls.count("bad.example") == 2
+
+
+def test_cached_getaddrinfo_serves_prefetched_api_hosts_only(monkeypatch):
+    host = http_client.API_HOSTS[0]
+    stream = http_client.socket.SOCK_STREAM
+    infos = [
+        (http_client.socket.AF_INET, stream, 6, "", ("10.1.2.3", 443)),
+        (http_client.socket.AF_INET, stream, 6, "", ("10.1.2.4", 443)),
+    ]
+    monkeypatch.setattr(
+        http_client, "_dns_cache", {(host, 443, 0, stream, 0, 0): (infos, http_client.time.monotonic() + 60)}
+    )
+    delegated = []
+    monkeypatch.setattr(http_client, "_original_getaddrinfo", lambda *args: delegated.append(args[0]) or [])
+
+    # 返回完整地址列表，create_connection 仍可逐个尝试
+    assert http_client._cached_getaddrinfo(host, 443, 0, stream) == infos
+    assert delegated == []
+
+    http_client._cached_getaddrinfo("example.com", 443)
+    assert delegated == ["example.com"]
+
+    http_client.install_dns_cache_resolver()
+    try:
+        assert http_client.socket.getaddrinfo is http_client._cached_getaddrinfo
+    finally:
+        http_client.uninstall_dns_cache_resolver()
+    assert http_client.socket.getaddrinfo is not http_client._cached_getaddrinfo
+
+
+def test_cached_getaddrinfo_refreshes_expired_entries(monkeypatch):
+    host = http_client.API_HOSTS[0]
+    now = [1000.0]
+    calls = []
+
+    def _resolve(*args):
+        calls.append(args)
+        return [(http_client.socket.AF_INET, args[3], 6, "", ("10.3.0.%d" % len(calls), args[1]))]
+
+    monkeypatch.setattr(http_client, "_dns_cache", {})
+    monkeypatch.setattr(http_client.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(http_client, "_original_getaddrinfo", _resolve)
+
+    first = http_client._cached_getaddrinfo(host, 443, 0, http_client.socket.SOCK_STREAM)
+    assert http_client._cached_getaddrinfo(host, 443, 0, http_client.socket.SOCK_STREAM) == first
+    assert len(calls) == 1
+
+    now[0] += http_client._DNS_TTL + 1
+    refreshed = http_client._cached_getaddrinfo(host, 443, 0, http_client.socket.SOCK_STREAM)
+    assert refreshed[0][4] == ("10.3.0.2", 443)
+    assert len(calls) == 2
+
+
+def test_call_api_batch_async_caps_concurrency_and_keeps_order(monkeypatch):
+    in_flight = [0, 0]  # 当前并发数, 峰值
+
+    async def _handler(request):
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight[1], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        if request.url.path == "/fail":
+            return http_client.httpx.Response(500)
+        return http_client.httpx.Response(200, json={"path": request.url.path})
+
+    client = http_client.httpx.AsyncClient(transport=http_client.httpx.MockTransport(_handler))
+    monkeypatch.setattr(http_client, "_async_client", client)
+    reqs = [{"url": f"https://api.example/{i}", "payload": {}} for i in range(6)]
+    reqs.append({"url": "https://api.example/fail", "payload": {}})
+
+    async def _run():
+        try:
+            return await http_client.call_api_batch_async(reqs, max_concurrency=2, return_exceptions=True)
+        finally:
+            await client.aclose()
+
+    results = asyncio.run(_run())
+    assert [r["path"] for r in results[:6]] == [f"/{i}" for i in range(6)]
+    assert isinstance(results[6], http_client.httpx.HTTPStatusError)
+    assert in_flight[1] == 2
+
+
+def test_host_clients_are_isolated_per_netloc(monkeypatch):
+    monkeypatch.setattr(http_client, "_host_clients", {})
+    try:
+        a1 = http_client.get_host_client("https://a.example/v1/chat")
+        a2 = http_client.get_host_client("https://a.example/v2/other")
+        b = http_client.get_host_client("https://b.example/v1/chat")
+        assert a1 is a2
+        assert a1 is not b
+    finally:
+        http_client.close()
+    assert http_client._host_clients == {}
+
+
+def test_iter_sse_lines_handles_split_lines_and_multibyte_chars():
+    payload = 'data: {"content": "简历"}\r\n\r\ndata: [DONE]'.encode("utf-8")
+    chunks = [payload[i:i + 5] for i in range(0, len(payload), 5)]
+    assert list(http_client._iter_sse_lines(chunks)) == [
+        'data: {"content": "简历"}',
+        "data: [DONE]",
+    ]
+
+
+def test_call_api_and_stream_share_the_host_httpx_pool(monkeypatch):
+    seen = []
+
+    def _handler(request):
+        seen.append(request.url.path)
+        if request.url.path == "/stream":
+            return http_client.httpx.Response(200, content=b"data: 1\n\ndata: [DONE]\n")
+        return http_client.httpx.Response(200, json={"ok": True})
+
+    client = http_client.httpx.Client(transport=http_client.httpx.MockTransport(_handler))
+    monkeypatch.setattr(http_client, "_host_clients", {"api.example": client})
+    try:
+        assert http_client.call_api("https://api.example/chat", {}, {}) == {"ok": True}
+        assert list(http_client.call_api_stream("https://api.example/stream", {}, {})) == [
+            "data: 1",
+            "data: [DONE]",
+        ]
+        assert seen == ["/chat", "/stream"]
+    finally:
+        http_client.close()
+
+
+def test_call_api_retries_overload_responses_honouring_retry_after(monkeypatch):
+    responses = [
+        http_client.httpx.Response(429, headers={"Retry-After": "3"}),
+        http_client.httpx.Response(503),
+        http_client.httpx.Response(200, json={"ok": True}),
+    ]
+    sleeps = []
+    client = http_client.httpx.Client(transport=http_client.httpx.MockTransport(lambda request: responses.pop(0)))
+    monkeypatch.setattr(http_client, "_host_clients", {"api.example": client})
+    monkeypatch.setattr(http_client.time, "sleep", sleeps.append)
+    try:
+        assert http_client.call_api("https://api.example/chat", {}, {}) == {"ok": True}
+    finally:
+        http_client.close()
+    assert sleeps == [3.0, http_client._RETRY_BASE_DELAY * 2]
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        http_client.httpx.Response(500),
+        http_client.httpx.Response(504),
+        http_client.httpx.Response(429, headers={"Retry-After": "120"}),
+    ],
+)
+def test_call_api_does_not_retry_possibly_processed_or_long_waits(monkeypatch, response):
+    calls = []
+
+    def _handler(request):
+        calls.append(1)
+        return response
+
+    client = http_client.httpx.Client(transport=http_client.httpx.MockTransport(_handler))
+    monkeypatch.setattr(http_client, "_host_clients", {"api.example": client})
+    monkeypatch.setattr(http_client.time, "sleep", lambda seconds: None)
+    try:
+        with pytest.raises(http_client.httpx.HTTPStatusError):
+            http_client.call_api("https://api.example/chat", {}, {})
+    finally:
+        http_client.close()
+    assert calls == [1]
+
+
+def test_call_api_async_does_not_retry_client_errors(monkeypatch):
+    calls = []
+
+    def _handler(request):
+        calls.append(1)
+        return http_client.httpx.Response(400)
+
+    client = http_client.httpx.AsyncClient(transport=http_client.httpx.MockTransport(_handler))
+    monkeypatch.setattr(http_client, "_async_client", client)
+
+    async def _run():
+        try:
+            await http_client.call_api_async("https://api.example/chat", {}, {})
+        finally:
+            await client.aclose()
+
+    with pytest.raises(http_client.httpx.HTTPStatusError):
+        asyncio.run(_run())
+    assert calls == [1]
+
+
+def test_init_preheats_in_background_without_blocking(monkeypatch):
+    release = threading.Event()
+    preheated = threading.Event()
+
+    def _slow_preheat():
+        release.wait(2)
+        preheated.set()
+
+    monkeypatch.setattr(http_client, "prefetch_api_hosts", lambda: None)
+    monkeypatch.setattr(http_client, "_preheat_connection", _slow_preheat)
+    try:
+        http_client.init()
+        assert not preheated.is_set()
+        release.set()
+        assert preheated.wait(2)
+    finally:
+        http_client.uninstall_dns_cache_resolver()
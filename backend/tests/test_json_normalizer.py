@@ -0,0 +1,108 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from backend.json_normalizer import ResumeNormalizer, normalize_resume_json
+
+
+def test_unmapped_nested_values_share_leaf_containers():
+    leaf = {"a": 1, "b": "x"}
+    tags = ["python", "go"]
+    data = {"extra": {"leaf": leaf, "tags": tags, "n": 3}}
+
+    result = ResumeNormalizer().normalize(data)
+
+    assert result["extra"] == {"leaf": leaf, "tags": tags, "n": 3}
+    assert result["extra"] is not data["extra"]
+    assert result["extra"]["leaf"] is leaf
+    assert result["extra"]["tags"] is tags
+
+
+def test_normalize_maps_contact_and_sections():
+    result = normalize_resume_json({
+        "基本信息": {"姓名": "张三", "电话": "123", "邮箱": "a@b.c"},
+        "工作经历": [{"公司": "腾讯", "职位": "后端", "时间": "2024"}],
+        "教育经历": [{"学校": "清华", "专业": "CS"}],
+    })
+
+    assert result["name"] == "张三"
+    assert result["contact"] == {"phone": "123", "email": "a@b.c"}
+    assert result["experience"] == [{"company": "腾讯", "position": "后端", "duration": "2024"}]
+    assert result["education"] == [{"title": "清华", "subtitle": "CS"}]
+
+
+def test_parse_experience_string_extracts_parenthesised_dates():
+    normalizer = ResumeNormalizer()
+
+    assert normalizer._parse_experience_string("腾讯 - 后端实习生（2024.06 - 2024.10）") == {
+        "duration": "2024.06 - 2024.10",
+        "company": "腾讯",
+        "position": "后端实习生",
+    }
+    assert normalizer._parse_experience_string("字节跳动 (2023)") == {
+        "duration": "2023",
+        "title": "字节跳动",
+    }
+
+
+def test_standardize_opensource_maps_keyword_fields():
+    result = ResumeNormalizer()._standardize_opensource([{
+        "title": "Resume-Agent",
+        "角色": "维护者",
+        "仓库地址": "https://example.com/repo",
+        "period": "2024",
+        "items": ["修复 bug", "新增功能"],
+        "stars": 10,
+    }])
+
+    assert result == [{
+        "name": "Resume-Agent",
+        "role": "维护者",
+        "repo": "https://example.com/repo",
+        "date": "2024",
+        "items": ["修复 bug", "新增功能"],
+        "description": "修复 bug\n新增功能",
+        "stars": 10,
+    }]
+
+
+def test_repeated_sections_are_merged_before_standardizing():
+    result = normalize_resume_json({
+        "工作经历": [{"公司": "腾讯", "职位": "后端"}],
+        "work": [{"company": "字节", "position": "前端"}],
+        "项目经验": {"简历助手": "LLM 简历解析"},
+    })
+
+    assert result["experience"] == [
+        {"company": "腾讯", "position": "后端"},
+        {"company": "字节", "position": "前端"},
+    ]
+    assert result["projects"] == [{"name": "简历助手", "description": "LLM 简历解析"}]
+
+
+def test_repeated_sections_with_mismatched_types_keep_the_newer_value():
+    repo = [{"name": "repo", "items": "desc"}]
+    expected = normalize_resume_json({"openSource": repo})["openSource"]
+
+    assert normalize_resume_json({"开源": "abc", "openSource": repo})["openSource"] == expected
+    assert normalize_resume_json({"开源": {}, "openSource": repo})["openSource"] == expected
+    # 同为字符串时先换行拼接，再作为一个项目标准化
+    projects = normalize_resume_json({"项目经验": "甲", "projects": "乙"})["projects"]
+    assert projects == [{"description": "甲\n乙"}]
+
+
+def test_merge_values_folds_collisions_in_order():
+    normalizer = ResumeNormalizer()
+
+    assert normalizer._merge_values(["a", "b", "c"]) == "a\nb\nc"
+    assert normalizer._merge_values([[1], [2, 3]]) == [1, 2, 3]
+    assert normalizer._merge_values([{"a": 1}, {"a": 2, "b": 3}]) == {"a": 2, "b": 3}
+    # 类型不同时保留新值，之后再与同类型的值合并
+    assert normalizer._merge_values(["a", [1], [2]]) == [1, 2]
+    assert normalizer._merge_values([[1], "b"]) == "b"
+
+
+def test_normalize_joins_repeated_string_fields():
+    result = normalize_resume_json({"简介": "第一段", "summary": "第二段", "profile": "第三段"})
+    assert result["summary"] == "第一段\n第二段\n第三段"
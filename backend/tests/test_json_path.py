@@ -0,0 +1,129 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from backend import json_path
+from backend.agent.utils import json_path as agent_json_path
+
+
+@pytest.mark.parametrize("module", [json_path, agent_json_path])
+def test_parse_path_returns_cached_tuples(module):
+    module.parse_path.cache_clear()
+
+    parts = module.parse_path("experience[0].achievements[-1]")
+
+    assert parts == ("experience", 0, "achievements", -1)
+    assert module.parse_path("experience[0].achievements[-1]") is parts
+    assert module.parse_path.cache_info().hits == 1
+    assert module.parse_path("") == ()
+    with pytest.raises(ValueError):
+        module.parse_path("education[x]")
+
+
+@pytest.mark.parametrize("module", [json_path, agent_json_path])
+def test_path_helpers_accept_parsed_tuples(module):
+    data = {"basic": {"name": "张三"}, "education": []}
+
+    module.set_by_path(data, module.parse_path("education[0].school"), "清华")
+    assert data["education"] == [{"school": "清华"}]
+    assert module.get_by_path(data, module.parse_path("basic.name"))[2] == "张三"
+    assert module.delete_by_path(data, ("basic", "name")) == "张三"
+    assert not module.exists_path(data, "basic.name")
+
+
+def test_resolve_alias_matches_whole_prefix_segments():
+    assert json_path.resolve_alias("姓名") == "basic.name"
+    assert json_path.resolve_alias("工作经历[0].company") == "workExperience[0].company"
+    assert json_path.resolve_alias("教育.school") == "education.school"
+    assert json_path.resolve_alias("names") == "names"
+    assert json_path.resolve_alias("basic.name") == "basic.name"
+
+    assert json_path.resolve_alias_parsed("项目[1].name") == ("projects", 1, "name")
+    assert json_path.resolve_alias_parsed("email") == ("basic", "email")
+    assert json_path.resolve_alias_parsed("basic.title") == ("basic", "title")
+
+
+def test_get_by_path_errors_keep_their_messages():
+    data = {"education": [{"school": "清华"}], "name": "张三"}
+
+    assert json_path.get_by_path(data, "education[-1].school") == (data["education"][0], "school", "清华")
+    with pytest.raises(ValueError, match="列表索引越界: -1，列表长度: 1"):
+        json_path.get_by_path(data, "education[-2]")
+    with pytest.raises(ValueError, match="列表索引越界: 3"):
+        json_path.get_by_path(data, "education[3]")
+    with pytest.raises(ValueError, match="字典键不存在: 'major'"):
+        json_path.get_by_path(data, "education[0].major")
+    with pytest.raises(ValueError, match="期望列表类型"):
+        json_path.get_by_path(data, "name[0]")
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("basic.name", "张三"),
+        ("basic.nickname", "默认"),
+        ("education[-1].school", "清华"),
+        ("education[1]", "默认"),
+        ("basic[0]", "默认"),
+        ("education.school", "默认"),
+        ("basic.title", None),
+        ("education[x]", "默认"),
+        ("", {"basic": {"name": "张三", "title": None}, "education": [{"school": "清华"}]}),
+    ],
+)
+def test_exists_and_get_or_default_agree_with_get_by_path(path, expected):
+    data = {"basic": {"name": "张三", "title": None}, "education": [{"school": "清华"}]}
+
+    assert json_path.get_or_default(data, path, "默认") == expected
+    try:
+        json_path.get_by_path(data, path)
+        found = True
+    except ValueError:
+        found = False
+    assert json_path.exists_path(data, path) is found
+
+
+def test_list_paths_is_depth_first_preorder():
+    data = {"basic": {"name": "张三"}, "skills": ["Python", {"name": "Go"}], "age": 1}
+
+    assert json_path.list_paths(data) == [
+        "basic",
+        "basic.name",
+        "skills",
+        "skills[0]",
+        "skills[1]",
+        "skills[1].name",
+        "age",
+    ]
+    assert next(json_path.iter_paths(data, "resume")) == "resume.basic"
+    assert json_path.list_paths("scalar") == []
+
+
+def test_set_by_path_pads_lists_with_independent_nodes():
+    data = {}
+    json_path.set_by_path(data, "items[2].name", "c")
+    assert data == {"items": [{}, {}, {"name": "c"}]}
+    assert data["items"][0] is not data["items"][1]
+
+    json_path.set_by_path(data, "tags[1]", "x")
+    assert data["tags"] == [None, "x"]
+
+    json_path.set_by_path(data, "grid[1][0]", 5)
+    assert data["grid"] == [[], [5]]
+
+
+def test_set_by_path_skips_identical_scalar_updates():
+    data = {"basic": {"name": "张三", "flag": True}}
+    assert json_path.set_by_path(data, "basic.name", "张三") is data
+    assert data == {"basic": {"name": "张三", "flag": True}}
+
+    # 类型不同的“相等”值仍然写入
+    json_path.set_by_path(data, "basic.flag", 1)
+    assert data["basic"]["flag"] == 1 and type(data["basic"]["flag"]) is int
+
+    # None 写入不存在的路径时仍会创建节点
+    json_path.set_by_path(data, "extra.note", None)
+    assert data["extra"] == {"note": None}
@@ -0,0 +1,87 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import backend.latex_generator as latex_generator
+
+
+def _fake_xelatex(monkeypatch, log_texts):
+    calls = []
+
+    def _run(cmd, cwd, **kwargs):
+        calls.append(cmd)
+        work = Path(cwd)
+        (work / "resume.log").write_text(log_texts[len(calls) - 1], encoding="utf-8")
+        (work / "resume.pdf").write_bytes(b"%PDF-1.5")
+        assert "text" not in kwargs
+        return subprocess.CompletedProcess(cmd, 0, stdout=b"", stderr=b"")
+
+    monkeypatch.setattr(latex_generator, "resolve_xelatex_executable", lambda: "/usr/bin/xelatex")
+    monkeypatch.setattr(latex_generator.subprocess, "run", _run)
+    return calls
+
+
+_CROSSREF_RERUN = "LaTeX Warning: Label(s) may have changed. Rerun to get cross-references right."
+_OUTLINE_RERUN = "Package rerunfilecheck Warning: File `resume.out' has changed.\nRerun to get outlines right"
+
+
+def test_compile_runs_once_by_default(monkeypatch, tmp_path):
+    calls = _fake_xelatex(monkeypatch, [_CROSSREF_RERUN, "done"])
+
+    pdf = latex_generator.compile_latex_to_pdf("\\documentclass{article}", tmp_path)
+
+    assert pdf.getvalue() == b"%PDF-1.5"
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(
+    "log_texts, expected_passes",
+    [
+        (["Output written on resume.pdf"], 1),
+        ([_OUTLINE_RERUN], 1),
+        ([_CROSSREF_RERUN, "done"], 2),
+    ],
+)
+def test_compile_reruns_only_for_cross_references(monkeypatch, tmp_path, log_texts, expected_passes):
+    calls = _fake_xelatex(monkeypatch, log_texts)
+
+    pdf = latex_generator.compile_latex_to_pdf("\\documentclass{article}", tmp_path, max_passes=2)
+
+    assert pdf.getvalue() == b"%PDF-1.5"
+    assert len(calls) == expected_passes
+    assert "-halt-on-error" in calls[0]
+
+
+def test_json_to_latex_reuses_source_for_identical_input(monkeypatch):
+    rendered = []
+
+    def _fake_render(resume_data, section_order=None):
+        rendered.append(resume_data["name"])
+        return f"latex:{resume_data['name']}"
+
+    monkeypatch.setattr(latex_generator, "_json_to_latex_uncached", _fake_render)
+    monkeypatch.setattr(latex_generator, "_latex_cache", latex_generator.OrderedDict())
+
+    assert latex_generator.json_to_latex({"name": "张三"}) == "latex:张三"
+    assert latex_generator.json_to_latex({"name": "张三"}) == "latex:张三"
+    assert latex_generator.json_to_latex({"name": "张三"}, ["education"]) == "latex:张三"
+    assert latex_generator.json_to_latex({"name": "李四"}) == "latex:李四"
+    assert rendered == ["张三", "张三", "李四"]
+
+
+def test_compile_failure_decodes_output_for_the_error(monkeypatch, tmp_path):
+    def _run(cmd, cwd, **kwargs):
+        return subprocess.CompletedProcess(
+            cmd, 1, stdout="! Undefined control sequence.\n\\foo 简历".encode("utf-8"), stderr=b""
+        )
+
+    monkeypatch.setattr(latex_generator, "resolve_xelatex_executable", lambda: "/usr/bin/xelatex")
+    monkeypatch.setattr(latex_generator.subprocess, "run", _run)
+
+    with pytest.raises(RuntimeError, match="LaTeX 编译失败"):
+        latex_generator.compile_latex_to_pdf("\\documentclass{article}", tmp_path)
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import backend.latex_compiler as latex_compiler
+
+
+def test_compile_latex_raw_reuses_pdf_for_identical_source(monkeypatch):
+    compiled = []
+
+    def _fake_compile(source):
+        compiled.append(source)
+        return f"%PDF {len(compiled)}".encode()
+
+    monkeypatch.setattr(latex_compiler, "_compile_latex_raw_uncached", _fake_compile)
+    monkeypatch.setattr(latex_compiler, "_raw_pdf_cache", latex_compiler.OrderedDict())
+    monkeypatch.setattr(latex_compiler, "_RAW_PDF_CACHE_MAX_SIZE", 2)
+
+    assert latex_compiler.compile_latex_raw("a").getvalue() == b"%PDF 1"
+    assert latex_compiler.compile_latex_raw("a").getvalue() == b"%PDF 1"
+    latex_compiler.compile_latex_raw("b")
+    latex_compiler.compile_latex_raw("a")  # 刷新 a，淘汰 b
+    latex_compiler.compile_latex_raw("c")
+    latex_compiler.compile_latex_raw("b")
+
+    assert compiled == ["a", "b", "c", "b"]
+
+
+def test_compile_failure_reports_key_error_lines(monkeypatch):
+    output = "This is XeTeX\n! Undefined control sequence.\nl.5 \\foo\nLaTeX Error: 简历\nok\n".encode("utf-8")
+
+    def _run(cmd, cwd, **kwargs):
+        return subprocess.CompletedProcess(cmd, 1, stdout=output, stderr=b"")
+
+    monkeypatch.setattr(latex_compiler, "resolve_xelatex_executable", lambda: "/usr/bin/xelatex")
+    monkeypatch.setattr(latex_compiler.subprocess, "run", _run)
+
+    with pytest.raises(RuntimeError) as exc_info:
+        latex_compiler._compile_latex_raw_uncached("\\documentclass{article}")
+
+    assert str(exc_info.value) == "LaTeX 编译失败: ! Undefined control sequence.\nLaTeX Error: 简历"
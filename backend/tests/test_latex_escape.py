@@ -0,0 +1,31 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from backend import latex_utils
+from backend.latex_utils import escape_latex
+
+
+def test_escape_latex_single_pass_does_not_reescape_replacements():
+    assert escape_latex("a\\b") == r"a\textbackslash{}b"
+    assert escape_latex("x^2 ~ y") == r"x\textasciicircum{}2 \textasciitilde{} y"
+    assert escape_latex("50% & $10 #1 a_b {c}") == r"50\% \& \$10 \#1 a\_b \{c\}"
+
+
+def test_escape_latex_bold_markdown_and_html():
+    assert escape_latex("<p>负责 **C#_核心**</p>\n模块") == r"负责 \textbf{C\#\_核心} 模块"
+    assert escape_latex("保留 __BOLD_0__ 文本") == r"保留 \_\_BOLD\_0\_\_ 文本"
+    assert escape_latex(42) == "42"
+
+
+def test_escape_latex_caches_short_strings_only():
+    latex_utils.clear_escape_latex_cache()
+
+    escape_latex("字节跳动 & Co")
+    escape_latex("字节跳动 & Co")
+    escape_latex("长" * (latex_utils._ESCAPE_CACHE_MAX_LEN + 1))
+    assert escape_latex("") == ""
+
+    info = latex_utils._escape_latex_cached.cache_info()
+    assert (info.hits, info.currsize) == (1, 1)
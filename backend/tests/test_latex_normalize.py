@@ -0,0 +1,49 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from backend.latex_utils import normalize_item, normalize_resume_data
+
+
+def test_normalize_resume_data_maps_nested_keys():
+    data = {
+        "姓名": "张三",
+        "电话": "123",
+        "实习经历": [
+            {"公司": "字节跳动", "时间": "2024", "亮点": [{"描述": "优化"}, "文本"], "其他": {"地点": "北京"}},
+        ],
+    }
+
+    result = normalize_resume_data(data)
+
+    assert result == {
+        "name": "张三",
+        "internships": [
+            {
+                "company": "字节跳动",
+                "duration": "2024",
+                "highlights": [{"description": "优化"}, "文本"],
+                "其他": {"location": "北京"},
+            }
+        ],
+        "contact": {"phone": "123"},
+    }
+    assert list(result["internships"][0]) == ["company", "duration", "highlights", "其他"]
+    # 输入不被修改
+    assert data["实习经历"][0]["亮点"][0] == {"描述": "优化"}
+
+
+def test_normalize_item_prefers_item_mapping_and_handles_deep_nesting():
+    deep = leaf = {}
+    for _ in range(3000):
+        leaf["项目"] = {}
+        leaf = leaf["项目"]
+
+    result = normalize_item({"地点": "上海", "嵌套": deep}, {"地点": "where", "项目": "projects"})
+
+    assert result["location"] == "上海"
+    node = result["嵌套"]
+    for _ in range(3000):
+        node = node["projects"]
+    assert node == {}
@@ -0,0 +1,44 @@
+import os
+import shutil
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from backend.latex_utils import LATEX_TEMPLATE_FILES, _template_sources, stage_latex_template
+
+
+def test_stage_latex_template_links_files_and_fonts(tmp_path):
+    template_dir = tmp_path / "template"
+    (template_dir / "fonts" / "Main").mkdir(parents=True)
+    (template_dir / "fonts" / "Main" / "font.otf").write_bytes(b"font")
+    for name in LATEX_TEMPLATE_FILES[:-1]:
+        (template_dir / name).write_text(name, encoding="utf-8")
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+
+    missing = stage_latex_template(template_dir, str(work_dir))
+
+    assert missing == [LATEX_TEMPLATE_FILES[-1]]
+    assert (work_dir / "resume.cls").read_text(encoding="utf-8") == "resume.cls"
+    assert (work_dir / "fonts" / "Main" / "font.otf").read_bytes() == b"font"
+
+    # 清理编译目录不能波及模板目录
+    shutil.rmtree(work_dir)
+    assert (template_dir / "fonts" / "Main" / "font.otf").exists()
+    assert (template_dir / "resume.cls").exists()
+
+
+def test_stage_latex_template_resolves_template_once(tmp_path):
+    template_dir = tmp_path / "template"
+    template_dir.mkdir()
+    (template_dir / "resume.cls").write_text("cls", encoding="utf-8")
+    _template_sources.cache_clear()
+
+    for job in ("a", "b"):
+        work_dir = tmp_path / job
+        work_dir.mkdir()
+        stage_latex_template(template_dir, str(work_dir))
+        assert (work_dir / "resume.cls").read_text(encoding="utf-8") == "cls"
+
+    info = _template_sources.cache_info()
+    assert (info.hits, info.misses) == (1, 1)